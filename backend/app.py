@@ -15,18 +15,67 @@ Architecture:
 - Docker containerization with AWS ECS deployment
 """
 
+import base64
+import bisect
+import codecs
+import csv
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import math
+import multiprocessing
 import os
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import timedelta, datetime
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import jwt
 from functools import wraps
+from types import SimpleNamespace
 
-from flask import Flask, jsonify, request, abort
+import click
+
+from flask import Flask, g, has_request_context, jsonify, request, abort, make_response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import case, delete, event, exists, func, insert, inspect, literal, or_, select, text, true, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.exceptions import ServiceUnavailable
 from werkzeug.security import generate_password_hash, check_password_hash
 
+try:
+    import brotli  # Optional: enables Content-Encoding: br
+except ImportError:
+    brotli = None
+
+try:
+    import numpy as np  # Optional: enables the columnar filter engine
+except ImportError:
+    np = None
+
+try:
+    import orjson  # Optional: faster JSON encoding (see OrjsonJSONProvider)
+except ImportError:
+    orjson = None
+
+try:
+    import prometheus_client  # Optional: enables the /metrics endpoint
+    from prometheus_client import multiprocess as prometheus_multiprocess
+except ImportError:
+    prometheus_client = None
+
 # ---------------------------------------------------------------------------
 # App & Database Configuration
 # ---------------------------------------------------------------------------
@@ -52,12 +101,188 @@ else:
 app = Flask(__name__)
 app.config["SQLALCHEMY_DATABASE_URI"] = database_url
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False  # Disable event system for performance
+# Connection pool settings; pool_pre_ping/pool_recycle drop connections closed by the server or a proxy
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # Seconds
+}
+if not database_url.startswith("sqlite"):
+    # Queue pool sizing (per worker process)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"].update({
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),  # Seconds to wait for a connection
+    })
 app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "super-secret-change-me")
 app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=6)  # Token expiration time
+app.config["RECIPE_CACHE_SIZE"] = int(os.getenv("RECIPE_CACHE_SIZE", "10000"))  # Decoded recipes kept in memory
+app.config["JWT_CACHE_SIZE"] = int(os.getenv("JWT_CACHE_SIZE", "10000"))  # Verified tokens kept in memory
+# Password hashing runs in a process pool (0 workers hashes inline in the request thread)
+app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+app.config["PASSWORD_SALT_LENGTH"] = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+app.config["PASSWORD_HASH_QUEUE_MAX"] = int(
+    os.getenv("PASSWORD_HASH_QUEUE_MAX", str(4 * app.config["PASSWORD_HASH_WORKERS"] or 64))
+)  # Pending hashes before failing fast with 503
+app.config["PASSWORD_HASH_RETRY_AFTER"] = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))  # Seconds
+app.config["PAGE_SIZE_DEFAULT"] = int(os.getenv("PAGE_SIZE_DEFAULT", "20"))  # List endpoint page size
+app.config["PAGE_SIZE_MAX"] = int(os.getenv("PAGE_SIZE_MAX", "100"))  # Upper bound for ?limit=
+app.config["HTTP_CACHE_MAX_AGE"] = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))  # Seconds before revalidation
+app.config["COMPRESS_MIN_SIZE"] = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # Smaller bodies sent as-is
+app.config["IMPORT_BATCH_SIZE"] = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))  # Rows per bulk INSERT
+app.config["IMPORT_BATCH_MAX"] = int(os.getenv("IMPORT_BATCH_MAX", "5000"))  # Upper bound for ?batch_size=
+app.config["FAVORITES_BATCH_MAX"] = int(os.getenv("FAVORITES_BATCH_MAX", "1000"))  # recipe_ids per batch request
+# Recommendations (see build_recommendations)
+app.config["RECOMMENDATION_TOP_K"] = int(os.getenv("RECOMMENDATION_TOP_K", "20"))  # Neighbors stored per recipe
+app.config["RECOMMENDATION_LIMIT"] = int(os.getenv("RECOMMENDATION_LIMIT", "100"))  # Ranked recipes per user
+app.config["RECOMMENDATION_SEED_FAVORITES"] = int(os.getenv("RECOMMENDATION_SEED_FAVORITES", "50"))  # Latest favorites used
+app.config["RECOMMENDATION_COLLAB_WEIGHT"] = float(os.getenv("RECOMMENDATION_COLLAB_WEIGHT", "0.7"))  # vs content
+app.config["RECOMMENDATION_CANDIDATES_PER_FEATURE"] = int(
+    os.getenv("RECOMMENDATION_CANDIDATES_PER_FEATURE", "50")
+)  # Content candidates drawn from each shared feature
+app.config["RECOMMENDATION_MAX_USER_ITEMS"] = int(os.getenv("RECOMMENDATION_MAX_USER_ITEMS", "500"))  # Per user
+# Slow-query log: statements slower than the threshold are logged with their plan (-1 disables, 0 logs all)
+app.config["SLOW_QUERY_THRESHOLD_MS"] = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+app.config["SLOW_QUERY_LOG_SIZE"] = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))  # Entries kept for the admin endpoint
+app.config["SLOW_QUERY_EXPLAIN"] = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+app.config["SLOW_QUERY_EXPLAIN_INTERVAL"] = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "60"))  # Seconds per statement
+app.config["SLOW_QUERY_LOG_PARAMETERS"] = (
+    os.getenv("SLOW_QUERY_LOG_PARAMETERS", "false").lower() in ("1", "true", "yes")
+)  # Bound values may hold emails, password hashes and tokens; redacted unless enabled
+app.config["SLOW_QUERY_ENDPOINT"] = (
+    os.getenv("SLOW_QUERY_ENDPOINT", "false").lower() in ("1", "true", "yes")
+)  # Serve /api/v1/admin/slow-queries (the log is written either way)
+# Filters the planner must keep in the application layer, e.g. "ingredients,cuisine"
+app.config["FILTER_PUSHDOWN_DISABLED"] = {
+    name.strip() for name in os.getenv("FILTER_PUSHDOWN_DISABLED", "").split(",") if name.strip()
+}
+app.config["JSON_PROVIDER"] = os.getenv("JSON_PROVIDER", "orjson")  # "orjson" (when installed) or "stdlib"
+# Facet counts: cooking time bucket upper bounds (minutes) and values returned per facet
+app.config["FACET_TIME_BUCKETS"] = sorted(
+    int(edge) for edge in os.getenv("FACET_TIME_BUCKETS", "15,30,45,60,90,120").split(",") if edge.strip()
+)
+app.config["FACET_VALUES_MAX"] = int(os.getenv("FACET_VALUES_MAX", "100"))  # Most frequent values first
+app.config["SEARCH_FUZZY_MIN_HITS"] = int(os.getenv("SEARCH_FUZZY_MIN_HITS", "5"))  # Fewer exact hits: typo-tolerant (0: off)
+app.config["AUTOCOMPLETE_LIMIT_MAX"] = int(os.getenv("AUTOCOMPLETE_LIMIT_MAX", "20"))  # Completions per prefix
+app.config["AUTOCOMPLETE_CACHE_SIZE"] = int(os.getenv("AUTOCOMPLETE_CACHE_SIZE", "10000"))  # Prefixes kept in memory
+app.config["CATALOG_CHANGES_KEEP"] = int(os.getenv("CATALOG_CHANGES_KEEP", "10000"))  # Logged writes kept for other workers
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider encoding with orjson.
+    
+    Keys are sorted, separators compact and dates written as HTTP dates, as
+    with the default provider, but the bytes are not always the same:
+    non-ASCII characters are written as UTF-8 instead of escape sequences,
+    float exponents without "+" or zero padding (1e16, not 1e+16), NaN and
+    Infinity as null, and integers outside 64 bits raise TypeError. Calls with
+    options orjson does not support fall back to the stdlib encoder.
+    """
+
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def _encode(self, obj: Any, indent: bool = False) -> bytes:
+        option = self.OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.pop("indent", None)
+        if kwargs.pop("separators", (",", ":")) != (",", ":") or kwargs or indent not in (None, 2):
+            return super().dumps(obj, indent=indent, **kwargs)
+        return self._encode(obj, indent=indent is not None).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s) if not kwargs else super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent=indent) + b"\n", mimetype=self.mimetype)
+
+
+if orjson is not None and app.config["JSON_PROVIDER"] == "orjson":
+    app.json = OrjsonJSONProvider(app)
 
 # Initialize Flask extensions
 db = SQLAlchemy(app)
 
+
+class VerifiedTokenCache:
+    """
+    Bounded cache of verified JWT payloads, keyed by the SHA-256 digest of the token.
+
+    Each entry expires at the token's exp claim, so a cached token is never
+    accepted after it would have failed verification. Hot clients skip the
+    HMAC check entirely; the least recently used entries are evicted when full.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()  # digest -> (exp, payload)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the payload of a previously verified, unexpired token, or None."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """Remember a verified payload until its exp claim (tokens without exp are not cached)."""
+        exp = payload.get("exp")
+        if self.maxsize <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            key = self._key(token)
+            self._entries[key] = (exp, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after rotating JWT_SECRET_KEY)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Shared per-process cache of verified tokens
+token_cache = VerifiedTokenCache(app.config["JWT_CACHE_SIZE"])
+
 # Custom JWT utility functions (replacing Flask-JWT-Extended)
 def create_access_token(identity):
     """Create a JWT access token with user identity."""
@@ -69,9 +294,13 @@ def create_access_token(identity):
     return jwt.encode(payload, app.config["JWT_SECRET_KEY"], algorithm='HS256')
 
 def decode_token(token):
-    """Decode and validate a JWT token."""
+    """Decode and validate a JWT token, skipping verification for tokens in token_cache."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, app.config["JWT_SECRET_KEY"], algorithms=['HS256'])
+        token_cache.put(token, payload)
         return payload
     except jwt.ExpiredSignatureError:
         return None
@@ -79,8 +308,16 @@ def decode_token(token):
         return None
 
 def get_jwt_identity():
-    """Get the current user identity from JWT token."""
+    """Get the current user identity from JWT token (memoized on flask.g per request)."""
     auth_header = request.headers.get('Authorization')
+    memo = g.get("jwt_identity")
+    if memo is None or memo[0] != auth_header:
+        # Keyed by header in case the app context outlives the request
+        memo = g.jwt_identity = (auth_header, _identity_from_header(auth_header))
+    return memo[1]
+
+def _identity_from_header(auth_header):
+    """Decode an Authorization header value into a user identity."""
     if not auth_header:
         return None
     
@@ -113,6 +350,248 @@ CORS(app,
      expose_headers=["Content-Type", "Authorization"]
 )
 
+# ---------------------------------------------------------------------------
+# Decoded Recipe Cache
+# ---------------------------------------------------------------------------
+
+class RecipeDictCache:
+    """
+    Bounded LRU cache of decoded recipe dicts, keyed by recipe id plus row version.
+
+    A cached entry is only served for the exact version it was decoded from, so
+    rows updated by another worker process are never served stale. Replayed
+    writes additionally invalidate entries (see sync_catalog) to free memory
+    early. Hit/miss/eviction counters are exposed for sizing.
+
+    Each entry can also hold the recipe's encoded JSON (see Recipe.cached_json),
+    so list responses are assembled from pre-encoded fragments.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # id -> (version, dict, json bytes or None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.json_hits = 0
+        self.json_misses = 0
+
+    def get(self, recipe_id: int, version: int) -> Optional[Dict[str, Any]]:
+        """Return the cached dict for this recipe version, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(recipe_id)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(recipe_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, recipe_id: int, version: int, data: Dict[str, Any]) -> None:
+        """Store a decoded dict, evicting the least recently used entries when full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[recipe_id] = (version, data, None)
+            self._entries.move_to_end(recipe_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_json(self, recipe_id: int, version: int) -> Optional[bytes]:
+        """Return the encoded JSON of this recipe version, or None if not encoded yet."""
+        with self._lock:
+            entry = self._entries.get(recipe_id)
+            if entry is None or entry[0] != version or entry[2] is None:
+                self.json_misses += 1
+                return None
+            self._entries.move_to_end(recipe_id)
+            self.json_hits += 1
+            return entry[2]
+
+    def put_json(self, recipe_id: int, version: int, encoded: bytes) -> None:
+        """Attach the encoded JSON to the cached dict of the same recipe version."""
+        with self._lock:
+            entry = self._entries.get(recipe_id)
+            if entry is not None and entry[0] == version:
+                self._entries[recipe_id] = (version, entry[1], encoded)
+
+    def invalidate(self, recipe_id: int) -> None:
+        """Drop the entry for a recipe that has been updated or deleted."""
+        with self._lock:
+            self._entries.pop(recipe_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry (bulk deletes and re-initialization)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "json_hits": self.json_hits,
+                "json_misses": self.json_misses,
+            }
+
+
+# Shared per-process cache instance
+recipe_cache = RecipeDictCache(app.config["RECIPE_CACHE_SIZE"])
+
+
+# ---------------------------------------------------------------------------
+# Password Hashing Pool
+# ---------------------------------------------------------------------------
+
+class PasswordHasher:
+    """
+    Runs CPU-bound password hashing and verification in a bounded process pool.
+
+    Request threads wait on the result without holding the GIL, so other
+    requests served by the same worker keep making progress. At most
+    queue_max operations may be pending; beyond that requests fail fast with
+    503 and Retry-After instead of queueing unboundedly.
+    
+    The pool is created on first use and starts its processes from a
+    forkserver (spawn where unavailable): forking a worker that already runs
+    request threads could copy a lock held by another thread into the child.
+    A pool broken by a dead process (e.g. OOM-killed) is replaced and the
+    operation retried once; if the new pool breaks too, the request gets 503.
+    """
+
+    def __init__(self, method: str, salt_length: int, workers: int, queue_max: int, retry_after: int = 1):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.queue_max = queue_max
+        self.retry_after = retry_after
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._method_tag: Optional[str] = None
+        self.rejected = 0
+        self.broken = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next operation starts a fresh one."""
+        with self._lock:
+            self.broken += 1
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn in the pool (or inline without workers) and wait for its result."""
+        if self.workers <= 0:
+            return fn(*args, **kwargs)
+        with self._lock:
+            if self._pending >= self.queue_max:
+                self.rejected += 1
+                raise ServiceUnavailable(
+                    description="Password hashing capacity exceeded, retry later",
+                    retry_after=self.retry_after,
+                )
+            self._pending += 1
+        try:
+            for _ in range(2):
+                pool = self._get_pool()
+                try:
+                    return pool.submit(fn, *args, **kwargs).result()
+                except BrokenProcessPool:
+                    # Hashing and verification are idempotent, so retrying is safe
+                    self._discard(pool)
+            raise ServiceUnavailable(
+                description="Password hashing is unavailable, retry later",
+                retry_after=self.retry_after,
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured method and salt length."""
+        return self._run(generate_password_hash, password, method=self.method, salt_length=self.salt_length)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        """Check a password against a stored hash (any method Werkzeug understands)."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether a stored hash was produced with different parameters than the configured ones."""
+        if self._method_tag is None:
+            # Werkzeug fills in defaults (e.g. "pbkdf2" -> "pbkdf2:sha256:600000"),
+            # so compare against the prefix of a real hash
+            self._method_tag = self.hash("").split("$", 1)[0]
+        return password_hash.split("$", 1)[0] != self._method_tag
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; a new pool is created on next use."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def reset_after_fork(self) -> None:
+        """Forget a pool and lock inherited from the parent process, without touching them."""
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pending = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool sizing counters."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "queue_max": self.queue_max,
+                "rejected": self.rejected,
+                "broken": self.broken,
+            }
+
+
+# Shared per-process hashing pool
+password_hasher = PasswordHasher(
+    app.config["PASSWORD_HASH_METHOD"],
+    app.config["PASSWORD_SALT_LENGTH"],
+    app.config["PASSWORD_HASH_WORKERS"],
+    app.config["PASSWORD_HASH_QUEUE_MAX"],
+    app.config["PASSWORD_HASH_RETRY_AFTER"],
+)
+
+
+def reset_after_fork() -> None:
+    """
+    Drop connection pools and worker pools inherited from the parent process.
+
+    Runs in every forked child (gunicorn workers with preload_app), so
+    database connections are never shared between processes. dispose(close=False) leaves the parent's connections open.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    password_hasher.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_after_fork)
+
+
 # ---------------------------------------------------------------------------
 # Database Models
 # ---------------------------------------------------------------------------
@@ -136,12 +615,32 @@ class User(db.Model):
 
     @staticmethod
     def create_password_hash(password: str) -> str:
-        """Create a secure hash of the password using Werkzeug's PBKDF2."""
-        return generate_password_hash(password)
+        """Create a secure hash of the password (PASSWORD_HASH_METHOD, PBKDF2 by default) in the hashing pool."""
+        return password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        """Verify password against stored hash."""
-        return check_password_hash(self.password_hash, password)
+        """
+        Verify password against stored hash in the hashing pool. Hashes made
+        with outdated parameters are transparently upgraded (caller commits).
+        """
+        if not password_hasher.verify(self.password_hash, password):
+            return False
+        if password_hasher.needs_rehash(self.password_hash):
+            self.password_hash = password_hasher.hash(password)
+        return True
+
+
+def new_recipe_version(previous: Optional[int] = None) -> int:
+    """
+    Random positive 31-bit row version, different from previous.
+    
+    Versions are never sequential, so a recipe id reused after a delete (SQLite
+    does that) never matches a cache entry left by the deleted recipe.
+    """
+    while True:
+        version = int.from_bytes(os.urandom(4), "big") >> 1
+        if version and version != previous:
+            return version
 
 
 class Recipe(db.Model):
@@ -152,6 +651,8 @@ class Recipe(db.Model):
     - JSON fields (tools, ingredients, taste) stored as TEXT for database portability
     - Supports both SQL-level and application-level filtering
     - All fields nullable except name for flexible recipe creation
+    - version is a random value replaced by SQLAlchemy on every UPDATE (optimistic
+      concurrency) and keys the decoded recipe cache
     """
     __tablename__ = "recipes"
 
@@ -172,25 +673,100 @@ class Recipe(db.Model):
     ingredients = db.Column(db.Text, nullable=True)  # JSON: ["chicken", "flour", "eggs"]
     taste = db.Column(db.Text, nullable=True)        # JSON: ["sweet", "spicy", "savory"]
 
+    # Row version for cache keys (optimistic versioning, regenerated on UPDATE)
+    version = db.Column(db.Integer, nullable=False, default=lambda: new_recipe_version(), server_default="1")
+
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": new_recipe_version}
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert recipe to dictionary format for JSON serialization.
         Automatically parses JSON fields into Python lists.
+
+        Decoded dicts are served from recipe_cache keyed by (id, version), so
+        hot recipes are only decoded once per version per process.
+        """
+        if self.id is None:
+            return self.serialize(self)
+        return self.cached_dict(self)
+
+    @staticmethod
+    def cached_dict(row: Any) -> Dict[str, Any]:
+        """Serialized dict for a Recipe or any row with id, version and the serialized columns, via recipe_cache."""
+        cached = recipe_cache.get(row.id, row.version)
+        if cached is None:
+            cached = Recipe.serialize(row)
+            recipe_cache.put(row.id, row.version, cached)
+        return dict(cached)
+
+    @staticmethod
+    def cached_json(row: Any) -> bytes:
+        """Compact encoded JSON of Recipe.cached_dict(row), via recipe_cache (see encode_recipe_page)."""
+        encoded = recipe_cache.get_json(row.id, row.version)
+        if encoded is None:
+            encoded = app.json.dumps(Recipe.cached_dict(row), separators=(",", ":")).encode()
+            recipe_cache.put_json(row.id, row.version, encoded)
+        return encoded
+
+    @staticmethod
+    def serialize(row: Any) -> Dict[str, Any]:
+        """
+        Build the serialized dict from a Recipe or any row with the same columns,
+        parsing the JSON-encoded array fields. Bypasses the cache.
         """
         return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "image_url": self.image_url,
-            "time": self.time,
-            "tools": json.loads(self.tools) if self.tools else [],
-            "ingredients": json.loads(self.ingredients) if self.ingredients else [],
-            "taste": json.loads(self.taste) if self.taste else [],
-            "cuisine": self.cuisine,
-            "difficulty": self.difficulty,
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "image_url": row.image_url,
+            "time": row.time,
+            "tools": json.loads(row.tools) if row.tools else [],
+            "ingredients": json.loads(row.ingredients) if row.ingredients else [],
+            "taste": json.loads(row.taste) if row.taste else [],
+            "cuisine": row.cuisine,
+            "difficulty": row.difficulty,
         }
 
 
+class RecipeRecord:
+    """
+    Read-only recipe row for list endpoints (see load_recipe_records).
+    
+    Carries the same attributes as Recipe, so the filter strategies and the
+    serializer accept either, but is a plain __slots__ object built from a
+    Core select: no identity map entry, attribute instrumentation or session
+    state, and a fraction of the memory of an ORM instance.
+    """
+
+    __slots__ = ("id", "name", "description", "image_url", "time", "cuisine", "difficulty",
+                 "tools", "ingredients", "taste", "version")
+
+    def __init__(self, id, name, description, image_url, time, cuisine, difficulty, tools, ingredients, taste,
+                 version):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.image_url = image_url
+        self.time = time
+        self.cuisine = cuisine
+        self.difficulty = difficulty
+        self.tools = tools
+        self.ingredients = ingredients
+        self.taste = taste
+        self.version = version
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same as Recipe.to_dict."""
+        return Recipe.cached_dict(self)
+
+
+# Recipe columns selected into RecipeRecord, in constructor order
+RECIPE_RECORD_COLUMNS = [getattr(Recipe, name) for name in RecipeRecord.__slots__]
+
+# Rows accepted by the filter strategies and the serializer
+RecipeRow = Union[Recipe, RecipeRecord]
+
+
 class Favorite(db.Model):
     """
     Many-to-many relationship between Users and Recipes.
@@ -212,206 +788,2996 @@ class Favorite(db.Model):
     )
 
 
-# ---------------------------------------------------------------------------
-# Strategy Pattern for Advanced Recipe Filtering
-# ---------------------------------------------------------------------------
-
-class FilterStrategy:
+class Term(db.Model):
     """
-    Abstract base class for the Strategy Pattern implementation.
+    Normalized vocabulary of tools, ingredients and taste profiles.
     
-    Each concrete strategy handles validation and filtering for specific recipe attributes.
-    This pattern allows for:
-    - Easy addition of new filter types
-    - Complex validation logic per filter
-    - Consistent interface across all filters
+    Design Notes:
+    - kind is the Recipe column the term comes from ("tools", "ingredients", "taste")
+    - name is stored lowercased, matching the Strategy Pattern comparison rules
     """
+    __tablename__ = "terms"
 
-    def __init__(self, value: Any):
-        """Initialize strategy with filter value and validate it."""
-        self.value = value
-        self.validate()
-
-    def validate(self) -> None:
-        """
-        Validate the input value for this filter type.
-        Should raise ValueError for invalid inputs.
-        Must be implemented by concrete strategies.
-        """
-        raise NotImplementedError
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    name = db.Column(db.String(255), nullable=False)
 
-    def apply(self, recipe: Recipe) -> bool:
-        """
-        Apply filter logic to a recipe.
-        Returns True if recipe passes the filter, False otherwise.
-        Must be implemented by concrete strategies.
-        """
-        raise NotImplementedError
+    __table_args__ = (
+        db.UniqueConstraint("kind", "name", name="unique_term_kind_name"),
+    )
 
 
-class TimeFilterStrategy(FilterStrategy):
-    """Filter recipes by maximum cooking time in minutes."""
+class RecipeTerm(db.Model):
+    """
+    Association between recipes and their normalized terms.
     
-    def validate(self):
-        if not str(self.value).isdigit() or int(self.value) <= 0:
-            raise ValueError("Time must be a positive integer")
-        self.max_time = int(self.value)
+    Mirrors the JSON-encoded Recipe columns so the filter endpoint can express
+    tools/ingredients/taste predicates as indexed EXISTS subqueries. The JSON
+    columns remain the source for serialization.
+    """
+    __tablename__ = "recipe_terms"
 
-    def apply(self, recipe: Recipe) -> bool:
-        """Recipe passes if cooking time is within the specified maximum."""
-        return recipe.time is not None and recipe.time <= self.max_time
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    term_id = db.Column(db.Integer, db.ForeignKey("terms.id", ondelete="CASCADE"), primary_key=True)
 
+    # Term -> recipes lookups (the primary key covers recipe -> terms)
+    __table_args__ = (
+        db.Index("ix_recipe_terms_term_recipe", "term_id", "recipe_id"),
+    )
 
-class CuisineFilterStrategy(FilterStrategy):
-    """Filter recipes by cuisine type using case-insensitive partial matching."""
+
+class RecipeNeighbor(db.Model):
+    """
+    Precomputed top-K most similar recipes of each recipe (see build_recommendations).
     
-    def validate(self):
-        if not str(self.value).strip():
-            raise ValueError("Cuisine must be non-empty")
-        self.cuisine = str(self.value).lower()
+    score blends favorites co-occurrence with content similarity; rebuilt
+    offline, so serving a user's recommendations is a lookup of the neighbors
+    of their favorites.
+    """
+    __tablename__ = "recipe_neighbors"
 
-    def apply(self, recipe: Recipe) -> bool:
-        """Recipe passes if cuisine contains the filter value (case-insensitive)."""
-        return self.cuisine in (recipe.cuisine or "").lower()
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    neighbor_id = db.Column(db.Integer, db.ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+
+    # Neighbor -> recipe lookups when a recipe is deleted
+    __table_args__ = (
+        db.Index("ix_recipe_neighbors_neighbor", "neighbor_id"),
+    )
 
 
-class IngredientFilterStrategy(FilterStrategy):
-    """
-    Filter recipes by ingredients using comma-separated list.
-    Supports partial matching (e.g., "chick" matches "chicken").
+class RecipeNeighborStaging(db.Model):
     """
+    Neighbor rows written by a running build_recommendations, swapped into
+    recipe_neighbors in one transaction once complete.
     
-    def validate(self):
-        if not str(self.value).strip():
-            raise ValueError("Ingredients must be non-empty")
-        # Parse comma-separated ingredients and clean whitespace
-        self.ingredients = [i.strip().lower() for i in str(self.value).split(",") if i.strip()]
+    build_id tells concurrent builds apart; no foreign keys, recipes deleted
+    during the build are dropped at the swap.
+    """
+    __tablename__ = "recipe_neighbors_staging"
 
-    def apply(self, recipe: Recipe) -> bool:
-        """Recipe passes if ANY filter ingredient is found in ANY recipe ingredient."""
-        recipe_ingredients = [i.lower() for i in (json.loads(recipe.ingredients) if recipe.ingredients else [])]
-        # Check if any filter ingredient is a substring of any recipe ingredient
-        return any(any(ing in r_ingredient for r_ingredient in recipe_ingredients) for ing in self.ingredients)
+    build_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    recipe_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    neighbor_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    score = db.Column(db.Float, nullable=False)
 
 
-class ToolsFilterStrategy(FilterStrategy):
-    """Filter recipes by required cooking tools using exact matching."""
+class RecipePopularity(db.Model):
+    """
+    Favorite count per recipe, the ranking for anonymous users.
     
-    def validate(self):
-        if not str(self.value).strip():
-            raise ValueError("Tools must be non-empty")
-        self.tools = [t.strip().lower() for t in str(self.value).split(",") if t.strip()]
+    Kept up to date incrementally by the favorites endpoints and resynchronized
+    from the favorites table by build_recommendations.
+    """
+    __tablename__ = "recipe_popularity"
 
-    def apply(self, recipe: Recipe) -> bool:
-        """Recipe passes if it contains ALL the required tools."""
-        recipe_tools = [t.lower() for t in (json.loads(recipe.tools) if recipe.tools else [])]
-        return any(tool in recipe_tools for tool in self.tools)
+    recipe_id = db.Column(db.Integer, db.ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    favorite_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_recipe_popularity_count", "favorite_count", "recipe_id"),
+    )
 
 
-class TasteFilterStrategy(FilterStrategy):
-    """Filter recipes by taste profile using comma-separated list."""
+class CatalogState(db.Model):
+    """
+    Catalog and favorites versions shared by every worker process (a single row, id 1).
     
-    def validate(self):
-        if not str(self.value).strip():
-            raise ValueError("Taste must be non-empty")
-        self.tastes = [t.strip().lower() for t in str(self.value).split(",") if t.strip()]
+    Design Notes:
+    - Writers bump the counters in the same transaction as their change (see
+      log_catalog_change), so the row lock also orders concurrent writers
+    - epoch is random per created row: a re-created table never repeats versions
+    - catalog and favorites version the ETags; changes numbers the catalog_changes log
+    """
+    __tablename__ = "catalog_state"
 
-    def apply(self, recipe: Recipe) -> bool:
-        """Recipe passes if it has ANY of the specified taste profiles."""
-        recipe_tastes = [t.lower() for t in (json.loads(recipe.taste) if recipe.taste else [])]
-        return any(taste in recipe_tastes for taste in self.tastes)
+    id = db.Column(db.Integer, primary_key=True)
+    epoch = db.Column(db.String(16), nullable=False)
+    catalog = db.Column(db.Integer, nullable=False, default=0)
+    favorites = db.Column(db.Integer, nullable=False, default=0)
+    changes = db.Column(db.Integer, nullable=False, default=0)
 
 
-class DifficultyFilterStrategy(FilterStrategy):
-    """Filter recipes by difficulty level using case-insensitive partial matching."""
+class CatalogChange(db.Model):
+    """
+    Log of committed recipe and favorites writes (see sync_catalog).
     
-    def validate(self):
-        if not str(self.value).strip():
-            raise ValueError("Difficulty must be non-empty")
-        self.diff = str(self.value).lower()
+    Every process replays the entries newer than the last one it applied onto
+    its in-memory indexes; only the latest CATALOG_CHANGES_KEEP entries are kept.
+    """
+    __tablename__ = "catalog_changes"
 
-    def apply(self, recipe: Recipe) -> bool:
-        """Recipe passes if difficulty contains the filter value (case-insensitive)."""
-        return self.diff in (recipe.difficulty or "").lower()
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)  # catalog_state.changes of the write
+    kind = db.Column(db.String(20), nullable=False)  # "recipes" or "favorites"
+    recipe_ids = db.Column(db.Text, nullable=True)  # JSON: [1, 2, 3]; NULL for every recipe
 
 
-class FilterEngine:
+# ---------------------------------------------------------------------------
+# Normalized Term Maintenance
+# ---------------------------------------------------------------------------
+
+TERM_FIELDS = ("tools", "ingredients", "taste")
+
+
+def insert_ignore(model):
     """
-    Main engine that orchestrates the Strategy Pattern filtering system.
-    
-    Two-Layer Filtering Architecture:
-    1. Database Layer: SQL filters for performance (time, cuisine, difficulty)
-    2. Application Layer: Strategy Pattern for complex logic (tools, ingredients, taste)
-    
-    This engine handles the application layer filtering.
+    Dialect-specific INSERT ... ON CONFLICT DO NOTHING for the given model.
+    Supported on both PostgreSQL and SQLite.
+    """
+    dialect_insert = postgresql_insert if db.engine.dialect.name == "postgresql" else sqlite_insert
+    return dialect_insert(model).on_conflict_do_nothing()
+
+
+def sync_recipe_terms(recipes: Iterable[Any]) -> None:
     """
+    Rewrite the recipe_terms rows of the given recipes from their JSON columns.
     
-    # Registry mapping filter names to their strategy classes
-    STRATEGIES = {
-        "time": TimeFilterStrategy,
-        "cuisine": CuisineFilterStrategy,
-        "ingredients": IngredientFilterStrategy,
-        "tools": ToolsFilterStrategy,
-        "taste": TasteFilterStrategy,
-        "difficulty": DifficultyFilterStrategy,
-    }
+    Accepts Recipe instances or any rows exposing id/tools/ingredients/taste.
+    Runs in the caller's transaction; the caller commits.
+    """
+    links: Dict[int, List[tuple]] = {}
+    wanted: Set[tuple] = set()
+    for recipe in recipes:
+        pairs = [
+            (field, term)
+            for field in TERM_FIELDS
+            for term in _decode_terms(getattr(recipe, field))
+        ]
+        links[recipe.id] = pairs
+        wanted.update(pairs)
+    if not links:
+        return
 
-    def __init__(self, criteria: Dict[str, Any]):
-        """
-        Initialize filter engine with criteria dictionary.
-        Gracefully handles invalid filters by skipping them.
-        """
-        self.strategies: List[FilterStrategy] = []
+    # Get-or-create the vocabulary, tolerating concurrent writers
+    if wanted:
+        db.session.execute(insert_ignore(Term), [{"kind": k, "name": n} for k, n in wanted])
+    term_ids: Dict[tuple, int] = {}
+    for field in TERM_FIELDS:
+        names = [n for k, n in wanted if k == field]
+        if names:
+            rows = db.session.execute(
+                select(Term.id, Term.name).where(Term.kind == field, Term.name.in_(names))
+            )
+            term_ids.update({(field, name): term_id for term_id, name in rows})
+
+    db.session.execute(RecipeTerm.__table__.delete().where(RecipeTerm.recipe_id.in_(list(links))))
+    rows = [
+        {"recipe_id": recipe_id, "term_id": term_ids[pair]}
+        for recipe_id, pairs in links.items()
+        for pair in pairs
+    ]
+    if rows:
+        db.session.execute(RecipeTerm.__table__.insert(), rows)
+
+
+def backfill_recipe_terms(batch_size: int = 1000) -> int:
+    """
+    Populate recipe_terms from the JSON columns for recipes that have no links yet.
+    Processes the table in id-ordered batches and commits after each batch.
+    Returns the number of recipes processed.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        batch = db.session.execute(
+            select(Recipe.id, Recipe.tools, Recipe.ingredients, Recipe.taste)
+            .where(Recipe.id > last_id)
+            .where(~exists().where(RecipeTerm.recipe_id == Recipe.id))
+            .order_by(Recipe.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return processed
+        sync_recipe_terms(batch)
+        db.session.commit()
+        processed += len(batch)
+        last_id = batch[-1].id
+
+
+def recipe_has_term(field: str, condition) -> Any:
+    """
+    EXISTS subquery matching recipes that have a term of the given kind
+    satisfying condition (an expression on Term.name).
+    """
+    return exists().where(
+        RecipeTerm.recipe_id == Recipe.id,
+        RecipeTerm.term_id == Term.id,
+        Term.kind == field,
+        condition,
+    )
+
+
+# ---------------------------------------------------------------------------
+# In-Memory Inverted Index for JSON Array Fields
+# ---------------------------------------------------------------------------
+
+def _decode_terms(raw: Optional[str]) -> Set[str]:
+    """Parse a JSON-encoded array column into a set of lowercased terms."""
+    if not raw:
+        return set()
+    return {str(term).lower() for term in json.loads(raw)}
+
+
+def _trigrams(term: str) -> Set[str]:
+    """Split a term into its overlapping character trigrams."""
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class RecipeTermIndex:
+    """
+    Per-process inverted index over the JSON array columns (tools, ingredients, taste).
+
+    Design Notes:
+    - Each lowercased term maps to a posting list (set of recipe ids)
+    - Ingredient terms are also indexed by character trigrams, so partial matching
+      ("chick" -> "chicken") is resolved against the term dictionary, not the recipes
+    - Built lazily from the database on first use, then maintained incrementally
+      by sync_catalog(), which replays the recipe writes of every worker process
+    """
+
+    FIELDS = ("tools", "ingredients", "taste")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all postings; the index is rebuilt from the database on next use."""
+        with self._lock:
+            self.built = False
+            self.postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.FIELDS}
+            self.ingredient_trigrams: Dict[str, Set[str]] = {}
+            self.recipe_terms: Dict[int, Dict[str, Set[str]]] = {}
+
+    def ensure_built(self) -> None:
+        """Build the index from the recipes table if it has not been built yet."""
+        if self.built:
+            return
+        with self._lock:
+            if self.built:
+                return
+            rows = db.session.query(
+                Recipe.id, Recipe.tools, Recipe.ingredients, Recipe.taste
+            ).yield_per(1000)
+            for recipe_id, tools, ingredients, taste in rows:
+                self._add(recipe_id, {
+                    "tools": _decode_terms(tools),
+                    "ingredients": _decode_terms(ingredients),
+                    "taste": _decode_terms(taste),
+                })
+            self.built = True
+
+    def add(self, recipe: Recipe) -> None:
+        """Index (or re-index) a recipe after it has been created or updated."""
+        with self._lock:
+            if not self.built:
+                return  # Picked up by the lazy build instead
+            self._remove(recipe.id)
+            self._add(recipe.id, {field: _decode_terms(getattr(recipe, field)) for field in self.FIELDS})
+
+    def remove(self, recipe_id: int) -> None:
+        """Drop a deleted recipe from every posting list."""
+        with self._lock:
+            self._remove(recipe_id)
+
+    def contains(self, recipe_id: int) -> bool:
+        """Whether the recipe is known to this process's index."""
+        return recipe_id in self.recipe_terms
+
+    def lookup(self, field: str, terms: Iterable[str]) -> Set[int]:
+        """Union of the posting lists for exact (lowercased) term matches."""
+        with self._lock:
+            postings = self.postings[field]
+            result: Set[int] = set()
+            for term in terms:
+                result |= postings.get(term, set())
+            return result
+
+    def lookup_partial(self, fragments: Iterable[str]) -> Set[int]:
+        """Union of the posting lists of every ingredient term containing any fragment."""
+        with self._lock:
+            postings = self.postings["ingredients"]
+            result: Set[int] = set()
+            for fragment in fragments:
+                for term in self._ingredient_terms_containing(fragment):
+                    result |= postings[term]
+            return result
+
+    def count(self, field: str, terms: Iterable[str]) -> int:
+        """Summed posting list lengths of exact term matches: an upper bound of len(lookup()) without the union."""
+        with self._lock:
+            postings = self.postings[field]
+            return sum(len(postings.get(term, ())) for term in set(terms))
+
+    def count_partial(self, fragments: Iterable[str]) -> int:
+        """Summed posting list lengths of the ingredient terms containing any fragment (see count)."""
+        with self._lock:
+            postings = self.postings["ingredients"]
+            terms = {term for fragment in fragments for term in self._ingredient_terms_containing(fragment)}
+            return sum(len(postings[term]) for term in terms)
+
+    def ingredient_coverage(self, fragments: Iterable[str]) -> Tuple[Dict[int, int], Set[str]]:
+        """
+        Count, per recipe, the distinct ingredients containing any fragment.
         
-        for key, value in criteria.items():
-            strategy_cls = self.STRATEGIES.get(key)
-            if strategy_cls is None:
-                # Unknown filter types are ignored (graceful degradation)
-                continue
+        Only the posting lists of the matching ingredient terms are visited, so
+        the cost depends on the matches, not on the catalog size.
+        
+        Returns:
+            Tuple of (recipe id -> covered ingredient count, matched ingredient terms)
+        """
+        with self._lock:
+            terms: Set[str] = set()
+            for fragment in fragments:
+                terms.update(self._ingredient_terms_containing(fragment))
+            postings = self.postings["ingredients"]
+            covered: Dict[int, int] = defaultdict(int)
+            for term in terms:
+                for recipe_id in postings[term]:
+                    covered[recipe_id] += 1
+            return covered, terms
+
+    def ingredient_count(self, recipe_id: int) -> int:
+        """Number of distinct (lowercased) ingredients of an indexed recipe."""
+        fields = self.recipe_terms.get(recipe_id)
+        return len(fields["ingredients"]) if fields else 0
+
+    def _ingredient_terms_containing(self, fragment: str) -> Iterable[str]:
+        """Resolve a substring against the ingredient term dictionary."""
+        grams = _trigrams(fragment)
+        if not grams:
+            # Fragments shorter than a trigram fall back to the (small) term dictionary
+            return [term for term in self.postings["ingredients"] if fragment in term]
+        candidates = set.intersection(*(self.ingredient_trigrams.get(g, set()) for g in grams))
+        return [term for term in candidates if fragment in term]
+
+    def _add(self, recipe_id: int, fields: Dict[str, Set[str]]) -> None:
+        self.recipe_terms[recipe_id] = fields
+        for field, terms in fields.items():
+            postings = self.postings[field]
+            for term in terms:
+                if term not in postings:
+                    postings[term] = set()
+                    if field == "ingredients":
+                        for gram in _trigrams(term):
+                            self.ingredient_trigrams.setdefault(gram, set()).add(term)
+                postings[term].add(recipe_id)
+
+    def _remove(self, recipe_id: int) -> None:
+        fields = self.recipe_terms.pop(recipe_id, None)
+        if not fields:
+            return
+        for field, terms in fields.items():
+            postings = self.postings[field]
+            for term in terms:
+                ids = postings.get(term)
+                if ids is None:
+                    continue
+                ids.discard(recipe_id)
+                if not ids:
+                    del postings[term]
+                    if field == "ingredients":
+                        for gram in _trigrams(term):
+                            self.ingredient_trigrams[gram].discard(term)
+
+
+# Shared per-process index instance
+recipe_index = RecipeTermIndex()
+
+
+# ---------------------------------------------------------------------------
+# Full-Text Search Index (BM25)
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset({"a", "an", "and", "the", "with", "of", "in", "on", "or", "to"})
+
+
+def tokenize(text_value: Optional[str]) -> List[str]:
+    """Lowercase a string and split it into word tokens, dropping stopwords."""
+    if not text_value:
+        return []
+    return [t for t in _TOKEN_RE.findall(text_value.lower()) if t not in _STOPWORDS]
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions and
+    adjacent transpositions), or limit + 1 as soon as it must exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit and min(previous) > limit:
+            return limit + 1  # Rows only grow from here (transpositions reach back one row)
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class RecipeSearchIndex:
+    """
+    Per-process BM25 full-text index over recipe name, description, ingredients and cuisine.
+    
+    Design Notes:
+    - Fields are weighted (name > cuisine > ingredients > description) by scaling
+      their term frequencies before BM25 saturation
+    - Query tokens also match indexed terms they prefix ("carb" -> "carbonara"),
+      resolved by bisecting a sorted vocabulary
+    - When that finds fewer than fuzzy_min_hits recipes, the query is run again
+      typo-tolerant: tokens also match terms within an edit distance (1 up to 5
+      characters, 2 beyond; "carbonra" -> "carbonara"), found through a trigram
+      index of the vocabulary and weighted by similarity, so typical queries
+      pay nothing extra
+    - Pure Python so ranking is identical on PostgreSQL and the SQLite fallback
+    - Built lazily, then maintained by sync_catalog(), which replays the recipe
+      writes of every worker process
+    """
+
+    FIELD_WEIGHTS = {"name": 3.0, "cuisine": 2.0, "ingredients": 1.5, "description": 1.0}
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, fuzzy_min_hits: int = 5):
+        self._lock = threading.RLock()
+        self.fuzzy_min_hits = fuzzy_min_hits
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all postings; the index is rebuilt from the database on next use."""
+        with self._lock:
+            self.built = False
+            self.postings: Dict[str, Dict[int, float]] = {}  # term -> {recipe_id: weighted tf}
+            self.vocabulary: List[str] = []  # Sorted terms for prefix expansion
+            self.trigrams: Dict[str, Set[str]] = {}  # Padded trigram -> terms, for fuzzy matching
+            self.doc_lengths: Dict[int, float] = {}
+            self.doc_terms: Dict[int, List[str]] = {}  # For incremental removal
+            self.total_length = 0.0
+
+    def ensure_built(self) -> None:
+        """Build the index from the recipes table if it has not been built yet."""
+        if self.built:
+            return
+        with self._lock:
+            if self.built:
+                return
+            rows = db.session.query(
+                Recipe.id, Recipe.name, Recipe.description, Recipe.ingredients, Recipe.cuisine
+            ).yield_per(1000)
+            for row in rows:
+                self._add(row, sort=False)
+            # New terms are appended unsorted while building; one sort instead of an insort each
+            self.vocabulary.sort()
+            self.built = True
+
+    def add(self, recipe: Recipe) -> None:
+        """Index (or re-index) a recipe after it has been created or updated."""
+        with self._lock:
+            if not self.built:
+                return  # Picked up by the lazy build instead
+            self._remove(recipe.id)
+            self._add(recipe)
+
+    def remove(self, recipe_id: int) -> None:
+        """Drop a deleted recipe from the index."""
+        with self._lock:
+            self._remove(recipe_id)
+
+    def search(self, query: str, after: Optional[Tuple[float, int]] = None,
+               limit: Optional[int] = None) -> List[Tuple[float, int]]:
+        """
+        Rank recipes matching any query token by BM25 score, typo-tolerant if
+        fewer than fuzzy_min_hits recipes match exactly or by prefix.
+        
+        Args:
+            query: Free-text query
+            after: (score, recipe_id) of the last result already returned, for paging
+            limit: Maximum number of results (all matches if None)
             
-            try:
-                # Create strategy instance with validation
-                self.strategies.append(strategy_cls(value))
-            except ValueError:
-                # Invalid filter values are skipped (graceful degradation)
-                pass
+        Returns:
+            List of (score, recipe_id) ordered by descending score, then id
+        """
+        with self._lock:
+            if not self.doc_lengths:
+                return []
+            tokens = set(tokenize(query))
+            scores = self._score(tokens, fuzzy=False)
+            if len(scores) < self.fuzzy_min_hits:
+                scores = self._score(tokens, fuzzy=True)
+
+        ranked = ((-round(score, 6), recipe_id) for recipe_id, score in scores.items())
+        if after is not None:
+            after_key = (-after[0], after[1])
+            ranked = (key for key in ranked if key > after_key)
+        ordered = heapq.nsmallest(limit, ranked) if limit is not None else sorted(ranked)
+        return [(-neg_score, recipe_id) for neg_score, recipe_id in ordered]
+
+    def _score(self, tokens: Set[str], fuzzy: bool) -> Dict[int, float]:
+        """BM25 score of every recipe matching any token."""
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            # Best matching expansion per document, so prefixes don't double count
+            token_scores: Dict[int, float] = {}
+            for term, weight in self._matches(token, fuzzy).items():
+                postings = self.postings[term]
+                idf = weight * math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for recipe_id, tf in postings.items():
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[recipe_id] / avg_length)
+                    score = idf * tf * (self.K1 + 1) / (tf + norm)
+                    if score > token_scores.get(recipe_id, 0.0):
+                        token_scores[recipe_id] = score
+            for recipe_id, score in token_scores.items():
+                scores[recipe_id] = scores.get(recipe_id, 0.0) + score
+        return scores
 
-    def apply(self, recipes: List[Recipe]) -> List[Recipe]:
+    def _matches(self, token: str, fuzzy: bool) -> Dict[str, float]:
         """
-        Apply all active strategies to filter the recipe list.
-        Recipe must pass ALL strategies to be included in results (AND logic).
+        Indexed terms matching token, with their IDF weight: 1 for the token
+        itself, 0.5 for longer terms it prefixes (ranked below whole-word
+        matches) and, if fuzzy, half the similarity for terms within the edit
+        distance.
+        """
+        matches = {term: 1.0 if term == token else 0.5 for term in self._expand(token)}
+        if fuzzy:
+            for term, similarity in self._fuzzy(token):
+                matches[term] = max(matches.get(term, 0.0), 0.5 * similarity)
+        return matches
+
+    def _fuzzy(self, token: str) -> List[Tuple[str, float]]:
         """
+        Indexed terms sharing a trigram with token and within its edit distance,
+        with their similarity (0-1). Numbers are never corrected.
+        """
+        max_edits = 0 if len(token) < 3 or token.isdigit() else 1 if len(token) <= 5 else 2
+        if not max_edits:
+            return []
+        # Each edit changes at most 4 padded trigrams (an adjacent transposition
+        # touches 4): count shared trigrams to prune candidates
+        grams = _trigrams(f" {token} ")
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for term in self.trigrams.get(gram, ()):
+                shared[term] += 1
+        needed = max(1, len(grams) - 4 * max_edits)
         result = []
-        for recipe in recipes:
-            # Recipe passes if all strategies return True
-            if all(strategy.apply(recipe) for strategy in self.strategies):
-                result.append(recipe)
+        for term, count in shared.items():
+            if count < needed:
+                continue
+            distance = _edit_distance(token, term, max_edits)
+            if distance <= max_edits:
+                result.append((term, 1.0 - distance / max(len(term), len(token))))
         return result
 
+    def _expand(self, token: str) -> List[str]:
+        """Indexed terms equal to or starting with token."""
+        start = bisect.bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def _add(self, recipe: Any, sort: bool = True) -> None:
+        insert = bisect.insort if sort else list.append
+        ingredients = json.loads(recipe.ingredients) if recipe.ingredients else []
+        fields = {
+            "name": recipe.name,
+            "cuisine": recipe.cuisine,
+            "ingredients": " ".join(str(i) for i in ingredients),
+            "description": recipe.description,
+        }
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for field, value in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for token in tokenize(value):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                length += weight
+        self.doc_lengths[recipe.id] = length
+        self.doc_terms[recipe.id] = list(frequencies)
+        self.total_length += length
+        for term, tf in frequencies.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                insert(self.vocabulary, term)
+                for gram in _trigrams(f" {term} "):
+                    self.trigrams.setdefault(gram, set()).add(term)
+            self.postings[term][recipe.id] = tf
+
+    def _remove(self, recipe_id: int) -> None:
+        length = self.doc_lengths.pop(recipe_id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in self.doc_terms.pop(recipe_id):
+            docs = self.postings[term]
+            del docs[recipe_id]
+            if not docs:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+                for gram in _trigrams(f" {term} "):
+                    self.trigrams[gram].discard(term)
+
+
+# Shared per-process search index instance
+recipe_search_index = RecipeSearchIndex(app.config["SEARCH_FUZZY_MIN_HITS"])
+
 
 # ---------------------------------------------------------------------------
-# Utility Functions
+# Autocomplete Index (Sorted Prefix Array)
+# ---------------------------------------------------------------------------
+
+def _completion_keys(text_value: str) -> List[str]:
+    """Lowercased suffixes of text starting at each word, so any word start is a prefix."""
+    lowered = text_value.lower()
+    return list(dict.fromkeys(lowered[m.start():] for m in _TOKEN_RE.finditer(lowered)))
+
+
+class AutocompleteIndex:
+    """
+    Per-process typeahead index over recipe names, ingredient terms and cuisines.
+    
+    Design Notes:
+    - One sorted array of (key, kind, value) entries; every word start of a
+      completion is a key ("butter chicken" is found by "chi"), so the matches of
+      a prefix are the contiguous slice found by two bisections
+    - Completions are ranked by popularity: a recipe's favorite count, or the
+      summed favorite counts of the recipes having an ingredient or cuisine
+      (ties: more recipes, then alphabetical)
+    - The top LIMIT_MAX completions of each queried prefix are cached (LRU);
+      recipe writes evict only the cached prefixes of the keys they change, and
+      favorites re-rank the cached lists in place, so short (expensive)
+      prefixes stay cached while popularity moves
+    - Built lazily from the database, then maintained by sync_catalog(), which
+      replays the recipe and favorites writes of every worker process (favorite
+      counts are re-read from recipe_popularity)
+    """
+
+    KINDS = ("recipe", "ingredient", "cuisine")
+
+    def __init__(self, cache_size: int = 10000, limit_max: int = 20):
+        self._lock = threading.RLock()
+        self.cache_size = cache_size
+        self.limit_max = limit_max
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all entries; the index is rebuilt from the database on next use."""
+        with self._lock:
+            self.built = False
+            self.entries: List[Tuple[str, str, Any]] = []  # Sorted (key, kind, value)
+            self.recipes: Dict[int, Tuple[str, Set[str], str]] = {}  # id -> (name, ingredients, cuisine)
+            self.popularity: Dict[int, int] = {}  # Recipe favorite counts
+            self.terms: Dict[Tuple[str, str], List[int]] = {}  # (kind, value) -> [popularity, recipes]
+            self._cache: "OrderedDict[str, List[Tuple[str, Any]]]" = OrderedDict()
+
+    def ensure_built(self) -> None:
+        """Build the index from the recipes and popularity tables if it has not been built yet."""
+        if self.built:
+            return
+        with self._lock:
+            if self.built:
+                return
+            self.popularity = dict(db.session.execute(
+                select(RecipePopularity.recipe_id, RecipePopularity.favorite_count)
+                .where(RecipePopularity.favorite_count > 0)
+            ).all())
+            rows = db.session.query(Recipe.id, Recipe.name, Recipe.ingredients, Recipe.cuisine).yield_per(1000)
+            for row in rows:
+                self._add(row, sort=False)
+            self.entries.sort()
+            self.built = True
+
+    def add(self, recipe: Recipe) -> None:
+        """Index (or re-index) a recipe after it has been created or updated."""
+        with self._lock:
+            if not self.built:
+                return  # Picked up by the lazy build instead
+            self._remove(recipe.id)
+            self._add(recipe)
+
+    def remove(self, recipe_id: int) -> None:
+        """Drop a deleted recipe and its share of the ingredient and cuisine counts."""
+        with self._lock:
+            self._remove(recipe_id)
+            self.popularity.pop(recipe_id, None)
+
+    def popularity_changed(self, recipe_ids: Iterable[int], delta: int) -> None:
+        """Add delta to the favorite count of recipe_ids after a committed favorites write."""
+        with self._lock:
+            if not self.built:
+                return
+            for recipe_id in recipe_ids:
+                indexed = self.recipes.get(recipe_id)
+                if indexed is None:
+                    continue
+                name, ingredients, cuisine = indexed
+                self.popularity[recipe_id] = self.popularity.get(recipe_id, 0) + delta
+                self._rerank(("recipe", recipe_id), name, delta)
+                for kind, value in self._recipe_terms(ingredients, cuisine):
+                    self.terms[(kind, value)][0] += delta
+                    self._rerank((kind, value), value, delta)
+
+    def refresh_popularity(self, recipe_ids: Iterable[int]) -> None:
+        """Re-read the favorite counts of recipe_ids after committed favorites writes and re-rank them."""
+        with self._lock:
+            if not self.built:
+                return
+            ids = [recipe_id for recipe_id in recipe_ids if recipe_id in self.recipes]
+            if not ids:
+                return
+            counts = dict(db.session.execute(
+                select(RecipePopularity.recipe_id, RecipePopularity.favorite_count)
+                .where(RecipePopularity.recipe_id.in_(ids))
+            ).all())
+            for recipe_id in ids:
+                delta = counts.get(recipe_id, 0) - self.popularity.get(recipe_id, 0)
+                if delta:
+                    self.popularity_changed([recipe_id], delta)
+
+    def complete(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Most popular completions of prefix (matched against word starts, case-insensitive).
+        
+        Returns:
+            At most min(limit, limit_max) dicts with text, type and popularity,
+            plus id for recipes and recipes (count) for ingredients and cuisines
+        """
+        prefix = prefix.lower().lstrip()
+        if not prefix:
+            return []
+        with self._lock:
+            top = self._cache.get(prefix)
+            if top is None:
+                lo = bisect.bisect_left(self.entries, (prefix,))
+                hi = bisect.bisect_left(self.entries, (prefix + "\U0010ffff",), lo)
+                matches = {(kind, value) for _, kind, value in self.entries[lo:hi]}
+                top = heapq.nsmallest(self.limit_max, matches, key=self._rank)
+                self._cache[prefix] = top
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(prefix)
+            return [self._describe(kind, value) for kind, value in top[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index and prefix cache sizes."""
+        with self._lock:
+            return {"entries": len(self.entries), "cached_prefixes": len(self._cache)}
+
+    def _rank(self, completion: Tuple[str, Any]) -> Tuple[Any, ...]:
+        kind, value = completion
+        if kind == "recipe":
+            return -self.popularity.get(value, 0), -1, self.recipes[value][0].lower(), kind, value
+        popularity, count = self.terms[completion]
+        return -popularity, -count, value, kind, value
+
+    def _describe(self, kind: str, value: Any) -> Dict[str, Any]:
+        if kind == "recipe":
+            return {"text": self.recipes[value][0], "type": kind, "id": value,
+                    "popularity": self.popularity.get(value, 0)}
+        popularity, count = self.terms[(kind, value)]
+        return {"text": value, "type": kind, "recipes": count, "popularity": popularity}
+
+    @staticmethod
+    def _recipe_terms(ingredients: Set[str], cuisine: str) -> List[Tuple[str, str]]:
+        terms = [("ingredient", term) for term in ingredients]
+        if cuisine:
+            terms.append(("cuisine", cuisine))
+        return terms
+
+    def _add(self, recipe: Any, sort: bool = True) -> None:
+        insert = bisect.insort if sort else list.append
+        name = recipe.name or ""
+        ingredients = _decode_terms(recipe.ingredients)
+        cuisine = (recipe.cuisine or "").lower()
+        self.recipes[recipe.id] = (name, ingredients, cuisine)
+        popularity = self.popularity.get(recipe.id, 0)
+        for key in _completion_keys(name):
+            insert(self.entries, (key, "recipe", recipe.id))
+        self._evict(name)
+        for kind, value in self._recipe_terms(ingredients, cuisine):
+            stats = self.terms.get((kind, value))
+            if stats is None:
+                stats = self.terms[(kind, value)] = [0, 0]
+                for key in _completion_keys(value):
+                    insert(self.entries, (key, kind, value))
+            stats[0] += popularity
+            stats[1] += 1
+            self._evict(value)
+
+    def _remove(self, recipe_id: int) -> None:
+        indexed = self.recipes.pop(recipe_id, None)
+        if indexed is None:
+            return
+        name, ingredients, cuisine = indexed
+        popularity = self.popularity.get(recipe_id, 0)
+        for key in _completion_keys(name):
+            del self.entries[bisect.bisect_left(self.entries, (key, "recipe", recipe_id))]
+        self._evict(name)
+        for kind, value in self._recipe_terms(ingredients, cuisine):
+            stats = self.terms[(kind, value)]
+            stats[0] -= popularity
+            stats[1] -= 1
+            if not stats[1]:
+                del self.terms[(kind, value)]
+                for key in _completion_keys(value):
+                    del self.entries[bisect.bisect_left(self.entries, (key, kind, value))]
+            self._evict(value)
+
+    def _rerank(self, completion: Tuple[str, Any], text_value: str, delta: int) -> None:
+        """Update the cached results containing completion after its popularity moved by delta."""
+        if not self._cache:
+            return
+        rank = self._rank(completion)
+        for key in _completion_keys(text_value):
+            for end in range(1, len(key) + 1):
+                top = self._cache.get(key[:end])
+                if top is None:
+                    continue
+                if completion in top:
+                    top.sort(key=self._rank)
+                    if delta < 0 and len(top) == self.limit_max and top[-1] == completion:
+                        # An uncached match may now outrank it
+                        del self._cache[key[:end]]
+                elif delta > 0 and len(top) == self.limit_max and rank < self._rank(top[-1]):
+                    top[-1] = completion
+                    top.sort(key=self._rank)
+
+    def _evict(self, text_value: str) -> None:
+        """Forget the cached results of every prefix the completion text answers."""
+        if not self._cache:
+            return
+        for key in _completion_keys(text_value):
+            for end in range(1, len(key) + 1):
+                self._cache.pop(key[:end], None)
+
+
+# Shared per-process autocomplete index
+autocomplete_index = AutocompleteIndex(app.config["AUTOCOMPLETE_CACHE_SIZE"], app.config["AUTOCOMPLETE_LIMIT_MAX"])
+
+
+# ---------------------------------------------------------------------------
+# Columnar Catalog Snapshot (NumPy)
+# ---------------------------------------------------------------------------
+
+class CatalogColumns:
+    """
+    Immutable columnar snapshot of the filterable recipe columns.
+    
+    Row i of every array describes the recipe with id ids[i] (ids are sorted):
+    - time / time_known: cooking time and a not-NULL mask
+    - cuisine / difficulty: dictionary-encoded codes into lowercased value lists
+    - terms[field][term]: sorted row indices of recipes having that term, for
+      tools, ingredients and taste (kept sparse rather than one bitset per
+      term, so memory grows with total term occurrences, not vocabulary x rows)
+    - occurrences[field]: the same postings flattened into parallel (row, term
+      code) arrays, so per-term counts over a row mask take one bincount
+    """
+
+    def __init__(self, rows: Iterable[Any]):
+        ids: List[int] = []
+        times: List[int] = []
+        known: List[bool] = []
+        codes: Dict[str, List[int]] = {"cuisine": [], "difficulty": []}
+        dictionaries: Dict[str, Dict[str, int]] = {"cuisine": {}, "difficulty": {}}
+        postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in TERM_FIELDS}
+
+        for row_number, row in enumerate(rows):
+            ids.append(row.id)
+            known.append(row.time is not None)
+            times.append(row.time if row.time is not None else 0)
+            for column in ("cuisine", "difficulty"):
+                value = (getattr(row, column) or "").lower()
+                codes[column].append(dictionaries[column].setdefault(value, len(dictionaries[column])))
+            for field in TERM_FIELDS:
+                for term in _decode_terms(getattr(row, field)):
+                    postings[field].setdefault(term, []).append(row_number)
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.time = np.array(times, dtype=np.int64)
+        self.time_known = np.array(known, dtype=bool)
+        self.codes = {column: np.array(values, dtype=np.int32) for column, values in codes.items()}
+        self.values = {column: list(dictionary) for column, dictionary in dictionaries.items()}
+        self.terms = {
+            field: {term: np.array(rows_, dtype=np.int64) for term, rows_ in field_postings.items()}
+            for field, field_postings in postings.items()
+        }
+        self.term_names = {field: list(field_terms) for field, field_terms in self.terms.items()}
+        self.occurrences: Dict[str, Tuple["np.ndarray", "np.ndarray"]] = {}
+        for field, field_terms in self.terms.items():
+            arrays = list(field_terms.values())
+            self.occurrences[field] = (
+                np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64),
+                np.repeat(np.arange(len(arrays), dtype=np.int32), [len(a) for a in arrays]),
+            )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def value_counts(self, column: str, mask: "np.ndarray") -> Dict[str, int]:
+        """Rows under mask per (lowercased, non-empty) cuisine or difficulty value."""
+        values = self.values[column]
+        counts = np.bincount(self.codes[column][mask], minlength=len(values))
+        return {value: count for value, count in zip(values, counts.tolist()) if count and value}
+
+    def term_counts(self, field: str, mask: "np.ndarray") -> Dict[str, int]:
+        """Rows under mask per term of a JSON array field."""
+        rows, codes = self.occurrences[field]
+        names = self.term_names[field]
+        counts = np.bincount(codes[mask[rows]], minlength=len(names))
+        return {name: count for name, count in zip(names, counts.tolist()) if count}
+
+    def time_counts(self, mask: "np.ndarray", edges: List[int]) -> List[int]:
+        """Rows under mask with a known time of at most each edge (cumulative)."""
+        times = self.time[mask & self.time_known]
+        buckets = np.bincount(np.searchsorted(np.array(edges, dtype=np.int64), times), minlength=len(edges) + 1)
+        return np.cumsum(buckets)[:len(edges)].tolist()
+
+    def match_values(self, column: str, predicate) -> "np.ndarray":
+        """Mask of rows whose dictionary-encoded value satisfies predicate (evaluated once per distinct value)."""
+        lookup = np.fromiter((predicate(value) for value in self.values[column]), dtype=bool,
+                             count=len(self.values[column]))
+        return lookup[self.codes[column]] if len(lookup) else np.zeros(len(self), dtype=bool)
+
+    def match_terms(self, field: str, predicate) -> "np.ndarray":
+        """Mask of rows having ANY term of the field that satisfies predicate."""
+        mask = np.zeros(len(self), dtype=bool)
+        for term, rows in self.terms[field].items():
+            if predicate(term):
+                mask[rows] = True
+        return mask
+
+
+class ColumnarCatalog:
+    """
+    Per-process holder of the current CatalogColumns snapshot.
+    
+    Snapshots are immutable: writes, replayed from every worker process by
+    sync_catalog(), only mark the affected ids stale, and stale rows are
+    re-checked per recipe until enough of the catalog has changed to warrant
+    a rebuild (or a bulk change resets the snapshot).
+    """
+
+    REBUILD_STALE_RATIO = 0.05
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.columns: Optional[CatalogColumns] = None
+        self.stale: Set[int] = set()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.columns = None
+            self.stale = set()
+
+    def mark_stale(self, recipe_id: int) -> None:
+        with self._lock:
+            if self.columns is not None:
+                self.stale.add(recipe_id)
+
+    def snapshot(self) -> Tuple[CatalogColumns, Set[int]]:
+        """Return (columns, stale ids), building or rebuilding the snapshot if needed."""
+        with self._lock:
+            if self.columns is None or len(self.stale) > self.REBUILD_STALE_RATIO * max(len(self.columns), 1000):
+                rows = db.session.execute(
+                    select(Recipe.id, Recipe.time, Recipe.cuisine, Recipe.difficulty,
+                           Recipe.tools, Recipe.ingredients, Recipe.taste)
+                    .order_by(Recipe.id)
+                    .execution_options(yield_per=10000)
+                )
+                self.columns = CatalogColumns(rows)
+                self.stale = set()
+            return self.columns, set(self.stale)
+
+
+# Shared per-process snapshot holder
+columnar_catalog = ColumnarCatalog()
+
+
+class CatalogVersion:
+    """
+    The shared catalog_state row as last applied by this process (see sync_catalog).
+    
+    ETag tokens are built from the shared counters, so every worker process
+    issues, and answers 304 for, the same ETags at the same catalog state.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.epoch: Optional[str] = None
+        self.catalog = 0
+        self.favorites = 0
+        self.changes = 0
+
+    def current(self, state: Any) -> bool:
+        """Whether state (a catalog_state row) has already been applied."""
+        return state.epoch == self.epoch and state.changes <= self.changes
+
+    def token(self) -> str:
+        return f"{self.epoch}.{self.catalog}"
+
+    def favorites_token(self) -> str:
+        return f"{self.epoch}.{self.favorites}"
+
+
+# Shared catalog state as applied by this process
+catalog_version = CatalogVersion()
+
+# The catalog_state row, read once per synchronized request
+CATALOG_STATE_QUERY = select(
+    CatalogState.epoch, CatalogState.catalog, CatalogState.favorites, CatalogState.changes
+).where(CatalogState.id == 1)
+
+# State of a database whose catalog_state row has not been created yet
+EMPTY_CATALOG_STATE = SimpleNamespace(epoch="", catalog=0, favorites=0, changes=0)
+
+# More changed recipes than this are not replayed one by one; the indexes are rebuilt instead
+CATALOG_REPLAY_MAX = 10000
+
+
+def log_catalog_change(recipe_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Record created, updated or deleted recipes in the caller's transaction
+    (caller commits). Must be called by every write to the recipes table;
+    recipe_ids None stands for the whole catalog.
+    """
+    _log_change("recipes", recipe_ids)
+
+
+def log_favorites_change(recipe_ids: Optional[Iterable[int]] = None) -> None:
+    """Record changed favorite counts of recipe_ids (None: every recipe) in the caller's transaction."""
+    _log_change("favorites", recipe_ids)
+
+
+def _log_change(kind: str, recipe_ids: Optional[Iterable[int]]) -> None:
+    counter = CatalogState.catalog if kind == "recipes" else CatalogState.favorites
+    bump = (
+        update(CatalogState)
+        .where(CatalogState.id == 1)
+        .values({counter: counter + 1, CatalogState.changes: CatalogState.changes + 1})
+        .execution_options(synchronize_session=False)
+    )
+    if db.session.execute(bump).rowcount == 0:
+        create_catalog_state()
+        db.session.execute(bump)
+    version = db.session.execute(select(CatalogState.changes).where(CatalogState.id == 1)).scalar_one()
+    db.session.execute(insert(CatalogChange).values(
+        version=version,
+        kind=kind,
+        recipe_ids=None if recipe_ids is None else json.dumps(sorted(set(recipe_ids))),
+    ))
+    if version % 100 == 0:
+        db.session.execute(delete(CatalogChange).where(
+            CatalogChange.version <= version - app.config["CATALOG_CHANGES_KEEP"]
+        ))
+
+
+def create_catalog_state() -> None:
+    """Insert the catalog_state row if it does not exist yet (caller commits)."""
+    db.session.execute(insert_ignore(CatalogState).values(
+        id=1, epoch=os.urandom(8).hex(), catalog=0, favorites=0, changes=0
+    ))
+
+
+def sync_catalog(state: Any = None) -> None:
+    """
+    Bring this process's in-memory indexes and caches up to the shared catalog state.
+    
+    Costs one primary-key read when nothing changed. Otherwise the changes
+    logged since the last sync, by any process, are replayed; changed recipes
+    are re-read, so replaying is idempotent. When the log no longer reaches
+    back that far (or the tables were re-created), everything is reset and
+    rebuilt lazily. Called before every catalog read that uses them.
+    
+    Args:
+        state: The CATALOG_STATE_QUERY row, when the caller has already read it
+    """
+    if state is None:
+        state = db.session.execute(CATALOG_STATE_QUERY).one_or_none() or EMPTY_CATALOG_STATE
+    if catalog_version.current(state):
+        return
+    with catalog_version.lock:
+        if catalog_version.current(state):
+            return
+        if state.epoch != catalog_version.epoch:
+            reset_catalog_indexes()
+        else:
+            changes = db.session.execute(
+                select(CatalogChange.kind, CatalogChange.recipe_ids)
+                .where(CatalogChange.version > catalog_version.changes, CatalogChange.version <= state.changes)
+                .order_by(CatalogChange.version)
+            ).all()
+            if len(changes) < state.changes - catalog_version.changes:
+                reset_catalog_indexes()  # Pruned from the log meanwhile
+            else:
+                _replay_changes(changes)
+        catalog_version.epoch = state.epoch
+        catalog_version.catalog = state.catalog
+        catalog_version.favorites = state.favorites
+        catalog_version.changes = state.changes
+
+
+def warm_catalog_indexes() -> None:
+    """
+    Build every per-process catalog index now instead of on first use.
+    
+    Called in the gunicorn master before forking (see gunicorn.conf.py), so
+    workers start with the indexes built and only replay later changes.
+    """
+    with app.app_context():
+        sync_catalog()
+        recipe_index.ensure_built()
+        recipe_search_index.ensure_built()
+        autocomplete_index.ensure_built()
+        if np is not None:
+            columnar_catalog.snapshot()
+        db.session.remove()
+
+
+def reset_catalog_indexes() -> None:
+    """Drop every per-process derived structure; each is rebuilt lazily from the database."""
+    recipe_index.reset()
+    recipe_search_index.reset()
+    autocomplete_index.reset()
+    columnar_catalog.reset()
+    recipe_cache.clear()
+
+
+def _replay_changes(changes: List[Any]) -> None:
+    """Apply logged (kind, recipe_ids) changes to the per-process derived structures."""
+    recipe_ids: Set[int] = set()
+    favorite_ids: Set[int] = set()
+    for kind, ids in changes:
+        if ids is None:
+            if kind == "recipes":
+                reset_catalog_indexes()
+                return
+            autocomplete_index.reset()  # Favorite counts were resynchronized
+            continue
+        (recipe_ids if kind == "recipes" else favorite_ids).update(json.loads(ids))
+    if len(recipe_ids) > CATALOG_REPLAY_MAX:
+        reset_catalog_indexes()
+        return
+
+    ids = sorted(recipe_ids)
+    found: Dict[int, RecipeRecord] = {}
+    for start in range(0, len(ids), 1000):
+        records = load_recipe_records(select_recipe_records().where(Recipe.id.in_(ids[start:start + 1000])))
+        found.update((record.id, record) for record in records)
+    for recipe_id in ids:
+        record = found.get(recipe_id)
+        if record is None:
+            recipe_index.remove(recipe_id)
+            recipe_search_index.remove(recipe_id)
+            autocomplete_index.remove(recipe_id)
+        else:
+            recipe_index.add(record)
+            recipe_search_index.add(record)
+            autocomplete_index.add(record)
+        columnar_catalog.mark_stale(recipe_id)
+        recipe_cache.invalidate(recipe_id)
+    if favorite_ids:
+        autocomplete_index.refresh_popularity(favorite_ids)
+
+
+# ---------------------------------------------------------------------------
+# Strategy Pattern for Advanced Recipe Filtering
 # ---------------------------------------------------------------------------
 
-def get_json_or_abort(keys: List[str]):
+class FilterStrategy:
+    """
+    Abstract base class for the Strategy Pattern implementation.
+    
+    Each concrete strategy handles validation and filtering for specific recipe attributes.
+    This pattern allows for:
+    - Easy addition of new filter types
+    - Complex validation logic per filter
+    - Consistent interface across all filters
+    """
+
+    # Criterion name (query parameter) this strategy answers
+    name = ""
+
+    # Whether matching_ids() can answer this filter from the inverted index
+    indexed = False
+
+    # Planner hints: relative per-recipe evaluation cost and default fraction of recipes passing
+    cost = 1.0
+    selectivity = 0.5
+
+    def __init__(self, value: Any):
+        """Initialize strategy with filter value and validate it."""
+        self.value = value
+        self.validate()
+
+    def validate(self) -> None:
+        """
+        Validate the input value for this filter type.
+        Should raise ValueError for invalid inputs.
+        Must be implemented by concrete strategies.
+        """
+        raise NotImplementedError
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """
+        Apply filter logic to a recipe.
+        Returns True if recipe passes the filter, False otherwise.
+        Must be implemented by concrete strategies.
+        """
+        raise NotImplementedError
+
+    def matching_ids(self, index: RecipeTermIndex) -> Optional[Set[int]]:
+        """
+        Answer the filter for the whole catalog from the inverted index.
+        Returns the set of passing recipe ids, or None if this strategy is not indexed.
+        """
+        return None
+
+    def matching_count(self, index: RecipeTermIndex) -> Optional[int]:
+        """
+        Estimate len(matching_ids(index)) from posting list lengths, without
+        building the union. Returns None if this strategy is not indexed.
+        """
+        return None
+
+    def sql_clause(self) -> Any:
+        """
+        Express the filter as a SQL predicate on Recipe for database-level filtering.
+        Returns None if this strategy can only run in the application layer.
+        """
+        return None
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        """
+        Evaluate the filter for every row of a columnar snapshot at once.
+        Returns a boolean NumPy array, or None if this strategy is not vectorized.
+        """
+        return None
+
+    def estimate_selectivity(self) -> float:
+        """Estimated fraction of recipes passing this filter, used to order in-memory evaluation."""
+        if self.indexed and recipe_index.built and recipe_index.recipe_terms:
+            return min(1.0, self.matching_count(recipe_index) / len(recipe_index.recipe_terms))
+        return self.selectivity
+
+
+class TimeFilterStrategy(FilterStrategy):
+    """Filter recipes by maximum cooking time in minutes."""
+    
+    name = "time"
+    cost = 1.0
+
+    def validate(self):
+        if not str(self.value).isdigit() or int(self.value) <= 0:
+            raise ValueError("Time must be a positive integer")
+        self.max_time = int(self.value)
+
+    def sql_clause(self) -> Any:
+        """Numeric comparison; NULL times never pass, as in apply()."""
+        return Recipe.time <= self.max_time
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """Recipe passes if cooking time is within the specified maximum."""
+        return recipe.time is not None and recipe.time <= self.max_time
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        return columns.time_known & (columns.time <= self.max_time)
+
+
+class CuisineFilterStrategy(FilterStrategy):
+    """Filter recipes by cuisine type using case-insensitive partial matching."""
+    
+    name = "cuisine"
+    cost = 2.0
+    selectivity = 0.2
+
+    def validate(self):
+        if not str(self.value).strip():
+            raise ValueError("Cuisine must be non-empty")
+        self.cuisine = str(self.value).lower()
+
+    def sql_clause(self) -> Any:
+        """Case-insensitive partial matching (ILIKE), wildcards in the value escaped."""
+        return Recipe.cuisine.icontains(self.cuisine, autoescape=True)
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """Recipe passes if cuisine contains the filter value (case-insensitive)."""
+        return self.cuisine in (recipe.cuisine or "").lower()
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        return columns.match_values("cuisine", lambda value: self.cuisine in value)
+
+
+class IngredientFilterStrategy(FilterStrategy):
+    """
+    Filter recipes by ingredients using comma-separated list.
+    Supports partial matching (e.g., "chick" matches "chicken").
+    """
+    
+    name = "ingredients"
+    indexed = True
+    cost = 6.0
+    selectivity = 0.2
+
+    def validate(self):
+        if not str(self.value).strip():
+            raise ValueError("Ingredients must be non-empty")
+        # Parse comma-separated ingredients and clean whitespace
+        self.ingredients = [i.strip().lower() for i in str(self.value).split(",") if i.strip()]
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """Recipe passes if ANY filter ingredient is found in ANY recipe ingredient."""
+        recipe_ingredients = [i.lower() for i in (json.loads(recipe.ingredients) if recipe.ingredients else [])]
+        # Check if any filter ingredient is a substring of any recipe ingredient
+        return any(any(ing in r_ingredient for r_ingredient in recipe_ingredients) for ing in self.ingredients)
+
+    def matching_ids(self, index: RecipeTermIndex) -> Optional[Set[int]]:
+        """Partial matches are resolved through the ingredient term dictionary."""
+        return index.lookup_partial(self.ingredients)
+
+    def matching_count(self, index: RecipeTermIndex) -> Optional[int]:
+        return index.count_partial(self.ingredients)
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        return columns.match_terms("ingredients", lambda term: any(ing in term for ing in self.ingredients))
+
+    def sql_clause(self) -> Any:
+        """Substring match against the normalized ingredient vocabulary."""
+        return recipe_has_term("ingredients", or_(
+            *(Term.name.contains(ing, autoescape=True) for ing in self.ingredients)
+        ))
+
+
+class ToolsFilterStrategy(FilterStrategy):
+    """Filter recipes by required cooking tools using exact matching."""
+    
+    name = "tools"
+    indexed = True
+    cost = 4.0
+    selectivity = 0.3
+
+    def validate(self):
+        if not str(self.value).strip():
+            raise ValueError("Tools must be non-empty")
+        self.tools = [t.strip().lower() for t in str(self.value).split(",") if t.strip()]
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """Recipe passes if it contains ALL the required tools."""
+        recipe_tools = [t.lower() for t in (json.loads(recipe.tools) if recipe.tools else [])]
+        return any(tool in recipe_tools for tool in self.tools)
+
+    def matching_ids(self, index: RecipeTermIndex) -> Optional[Set[int]]:
+        return index.lookup("tools", self.tools)
+
+    def matching_count(self, index: RecipeTermIndex) -> Optional[int]:
+        return index.count("tools", self.tools)
+
+    def sql_clause(self) -> Any:
+        return recipe_has_term("tools", Term.name.in_(self.tools))
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        return columns.match_terms("tools", set(self.tools).__contains__)
+
+
+class TasteFilterStrategy(FilterStrategy):
+    """Filter recipes by taste profile using comma-separated list."""
+    
+    name = "taste"
+    indexed = True
+    cost = 4.0
+    selectivity = 0.3
+
+    def validate(self):
+        if not str(self.value).strip():
+            raise ValueError("Taste must be non-empty")
+        self.tastes = [t.strip().lower() for t in str(self.value).split(",") if t.strip()]
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """Recipe passes if it has ANY of the specified taste profiles."""
+        recipe_tastes = [t.lower() for t in (json.loads(recipe.taste) if recipe.taste else [])]
+        return any(taste in recipe_tastes for taste in self.tastes)
+
+    def matching_ids(self, index: RecipeTermIndex) -> Optional[Set[int]]:
+        return index.lookup("taste", self.tastes)
+
+    def matching_count(self, index: RecipeTermIndex) -> Optional[int]:
+        return index.count("taste", self.tastes)
+
+    def sql_clause(self) -> Any:
+        return recipe_has_term("taste", Term.name.in_(self.tastes))
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        return columns.match_terms("taste", set(self.tastes).__contains__)
+
+
+class DifficultyFilterStrategy(FilterStrategy):
+    """Filter recipes by difficulty level using case-insensitive partial matching."""
+    
+    name = "difficulty"
+    cost = 2.0
+    selectivity = 0.33
+
+    def validate(self):
+        if not str(self.value).strip():
+            raise ValueError("Difficulty must be non-empty")
+        self.diff = str(self.value).lower()
+
+    def sql_clause(self) -> Any:
+        """Case-insensitive partial matching (ILIKE), wildcards in the value escaped."""
+        return Recipe.difficulty.icontains(self.diff, autoescape=True)
+
+    def apply(self, recipe: RecipeRow) -> bool:
+        """Recipe passes if difficulty contains the filter value (case-insensitive)."""
+        return self.diff in (recipe.difficulty or "").lower()
+
+    def mask(self, columns: CatalogColumns) -> Optional["np.ndarray"]:
+        return columns.match_values("difficulty", lambda value: self.diff in value)
+
+
+class FilterEngine:
+    """
+    Main engine that orchestrates the Strategy Pattern filtering system.
+    
+    Two-Layer Filtering Architecture:
+    1. Database Layer: SQL predicates compiled from the strategies (see FilterPlan)
+    2. Application Layer: Strategy Pattern for the criteria left in memory
+    
+    This engine handles the application layer filtering. Strategies are
+    evaluated cheapest and most selective first; they are only ranked when
+    first needed, so engines whose strategies all end up in SQL never
+    estimate selectivities.
+    """
+    
+    # Registry mapping filter names to their strategy classes
+    STRATEGIES = {
+        "time": TimeFilterStrategy,
+        "cuisine": CuisineFilterStrategy,
+        "ingredients": IngredientFilterStrategy,
+        "tools": ToolsFilterStrategy,
+        "taste": TasteFilterStrategy,
+        "difficulty": DifficultyFilterStrategy,
+    }
+
+    def __init__(self, criteria: Dict[str, Any]):
+        """
+        Initialize filter engine with criteria dictionary.
+        Gracefully handles invalid filters by skipping them.
+        """
+        self._strategies = self.parse(criteria)
+        self._ranked = len(self._strategies) < 2
+
+    @classmethod
+    def parse(cls, criteria: Dict[str, Any]) -> List[FilterStrategy]:
+        """Validated strategies for criteria, in criteria order (invalid and unknown filters skipped)."""
+        strategies: List[FilterStrategy] = []
+        for key, value in criteria.items():
+            strategy_cls = cls.STRATEGIES.get(key)
+            if strategy_cls is None:
+                # Unknown filter types are ignored (graceful degradation)
+                continue
+            
+            try:
+                # Create strategy instance with validation
+                strategies.append(strategy_cls(value))
+            except ValueError:
+                # Invalid filter values are skipped (graceful degradation)
+                pass
+        return strategies
+
+    @property
+    def strategies(self) -> List[FilterStrategy]:
+        """Active strategies, cheapest and most selective first (ranked on first access)."""
+        if not self._ranked:
+            # Cheapest and most selective first, so AND evaluation short-circuits early
+            self._strategies.sort(key=self.rank)
+            self._ranked = True
+        return self._strategies
+
+    @staticmethod
+    def rank(strategy: FilterStrategy) -> float:
+        """Evaluation cost per recipe eliminated; lower ranks are evaluated first."""
+        rejected = 1.0 - strategy.estimate_selectivity()
+        return strategy.cost / rejected if rejected > 0 else float("inf")
+
+    def apply(self, recipes: List[RecipeRow]) -> List[RecipeRow]:
+        """
+        Apply all active strategies to filter the recipe list.
+        Recipe must pass ALL strategies to be included in results (AND logic).
+
+        With NumPy available, strategies are evaluated as vectorized masks over
+        the columnar catalog snapshot; otherwise indexed strategies are answered
+        with posting list intersections. Only the remaining strategies (and
+        recipes unknown to, or changed since, the snapshot/index) are evaluated
+        per recipe.
+        """
+        if not self.strategies or not recipes:
+            return list(recipes)
+        if np is not None:
+            return self._apply_columnar(recipes)
+        return self._apply_indexed(recipes)
+
+    def _apply_columnar(self, recipes: List[RecipeRow]) -> List[RecipeRow]:
+        """Combine per-strategy boolean masks with bitwise AND, then look up each recipe's row."""
+        columns, stale = columnar_catalog.snapshot()
+        combined = np.ones(len(columns), dtype=bool)
+        per_recipe: List[FilterStrategy] = []
+        for strategy in self.strategies:
+            mask = strategy.mask(columns)
+            if mask is None:
+                per_recipe.append(strategy)
+            else:
+                combined &= mask
+                if not combined.any():
+                    # No snapshot row can pass; only unknown recipes need checking
+                    break
+
+        ids = np.fromiter((recipe.id for recipe in recipes), dtype=np.int64, count=len(recipes))
+        rows = np.minimum(np.searchsorted(columns.ids, ids), max(len(columns) - 1, 0))
+        known = (columns.ids[rows] == ids) if len(columns) else np.zeros(len(ids), dtype=bool)
+        if stale:
+            known &= ~np.isin(ids, np.fromiter(stale, dtype=np.int64, count=len(stale)))
+        passed = known & combined[rows] if len(columns) else known
+
+        result = []
+        for recipe, is_known, is_passed in zip(recipes, known.tolist(), passed.tolist()):
+            if is_known and not is_passed:
+                continue
+            checks = per_recipe if is_known else self.strategies
+            if all(strategy.apply(recipe) for strategy in checks):
+                result.append(recipe)
+        return result
+
+    def _apply_indexed(self, recipes: List[RecipeRow]) -> List[RecipeRow]:
+        """Intersect inverted index posting lists, falling back to per-recipe checks."""
+        per_recipe: List[FilterStrategy] = []
+        allowed: Optional[Set[int]] = None
+        if any(strategy.indexed for strategy in self.strategies):
+            recipe_index.ensure_built()
+
+        for strategy in self.strategies:
+            ids = strategy.matching_ids(recipe_index)
+            if ids is None:
+                per_recipe.append(strategy)
+            else:
+                # AND logic across strategies: intersect posting lists
+                allowed = ids if allowed is None else allowed & ids
+                if not allowed:
+                    break
+
+        result = []
+        for recipe in recipes:
+            if allowed is not None and recipe_index.contains(recipe.id):
+                if recipe.id not in allowed:
+                    continue
+                checks = per_recipe
+            else:
+                checks = self.strategies
+            # Recipe passes if all remaining strategies return True
+            if all(strategy.apply(recipe) for strategy in checks):
+                result.append(recipe)
+        return result
+
+
+class FilterPlan:
+    """
+    Query plan splitting filter criteria between the two layers.
+
+    Every strategy with a SQL compilation (sql_clause) is pushed down to the
+    database (Layer 1), unless listed in FILTER_PUSHDOWN_DISABLED; the rest
+    form the residual FilterEngine (Layer 2). Each criterion is applied in
+    exactly one layer.
+    """
+
+    def __init__(self, criteria: Dict[str, Any]):
+        disabled = app.config["FILTER_PUSHDOWN_DISABLED"]
+        self.pushdown: List[Tuple[FilterStrategy, Any]] = []
+        residual: Dict[str, Any] = {}
+
+        for strategy in FilterEngine.parse(criteria):
+            clause = None if strategy.name in disabled else strategy.sql_clause()
+            if clause is None:
+                residual[strategy.name] = strategy.value
+            else:
+                self.pushdown.append((strategy, clause))
+
+        self.residual = FilterEngine(residual)
+
+    def apply_sql(self, query):
+        """Add the pushed-down predicates to query (an ORM query or a Core select on Recipe)."""
+        for _, clause in self.pushdown:
+            query = query.filter(clause)
+        return query
+
+    def apply(self, recipes: List[Any]) -> List[Any]:
+        """Run the residual strategies over rows returned by the database."""
+        return self.residual.apply(recipes)
+
+    def explain(self) -> Dict[str, Any]:
+        """Describe the plan: SQL predicates pushed down and the in-memory evaluation order."""
+        return {
+            "pushdown": [strategy.name for strategy, _ in self.pushdown],
+            "sql": self._compile(self.apply_sql(select(Recipe.id))),
+            "in_memory": [
+                {
+                    "filter": strategy.name,
+                    "cost": strategy.cost,
+                    "selectivity": round(strategy.estimate_selectivity(), 4),
+                }
+                for strategy in self.residual.strategies
+            ],
+            "engine": "columnar" if np is not None else "indexed",
+        }
+
+    @staticmethod
+    def _compile(statement: Any) -> str:
+        """Render a statement for the current dialect, inlining parameters where possible."""
+        try:
+            return str(statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+        except Exception:
+            return str(statement.compile(dialect=db.engine.dialect))
+
+
+# ---------------------------------------------------------------------------
+# Facet Counts
+# ---------------------------------------------------------------------------
+
+FACET_VALUE_FIELDS = ("cuisine", "difficulty")
+FACET_TERM_FIELDS = ("tools", "taste")
+
+
+def facet_counts(criteria: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Count, in one pass, the recipes matching criteria per facet value.
+    
+    With NumPy the filter strategies are evaluated as masks over the columnar
+    snapshot and every facet is one bincount over the combined mask; otherwise
+    each facet is one grouped SQL aggregate with all criteria pushed down.
+    Either way the cost does not depend on the number of facet values.
+    Invalid criteria are skipped, as in filter_recipes.
+    
+    Returns:
+        Dict with total, counts per facet field (value -> count) and time
+        (cumulative counts per FACET_TIME_BUCKETS edge)
+    """
+    engine = FilterEngine(criteria)
+    edges = app.config["FACET_TIME_BUCKETS"]
+    if np is not None and all(type(strategy).mask is not FilterStrategy.mask for strategy in engine.strategies):
+        return _facet_counts_columnar(engine, edges)
+    return _facet_counts_sql(engine, edges)
+
+
+def _facet_counts_columnar(engine: FilterEngine, edges: List[int]) -> Dict[str, Any]:
+    """Facet counts over the columnar snapshot; stale rows are re-read and counted one by one."""
+    columns, stale = columnar_catalog.snapshot()
+    mask = np.ones(len(columns), dtype=bool)
+    for strategy in engine.strategies:
+        mask &= strategy.mask(columns)
+
+    extra: List[RecipeRecord] = []
+    if stale:
+        stale_ids = np.fromiter(stale, dtype=np.int64, count=len(stale))
+        mask &= ~np.isin(columns.ids, stale_ids)
+        records = load_recipe_records(select_recipe_records().where(Recipe.id.in_(list(stale))))
+        extra = [r for r in records if all(strategy.apply(r) for strategy in engine.strategies)]
+
+    counts: Dict[str, Any] = {"total": int(mask.sum()) + len(extra)}
+    for column in FACET_VALUE_FIELDS:
+        counts[column] = columns.value_counts(column, mask)
+    for field in FACET_TERM_FIELDS:
+        counts[field] = columns.term_counts(field, mask)
+    counts["time"] = columns.time_counts(mask, edges)
+
+    for row in extra:
+        for column in FACET_VALUE_FIELDS:
+            value = (getattr(row, column) or "").lower()
+            if value:
+                counts[column][value] = counts[column].get(value, 0) + 1
+        for field in FACET_TERM_FIELDS:
+            for term in _decode_terms(getattr(row, field)):
+                counts[field][term] = counts[field].get(term, 0) + 1
+        if row.time is not None:
+            counts["time"] = [n + (row.time <= edge) for n, edge in zip(counts["time"], edges)]
+    return counts
+
+
+def _facet_counts_sql(engine: FilterEngine, edges: List[int]) -> Dict[str, Any]:
+    """Facet counts as grouped aggregates; every criterion is pushed down, whatever FILTER_PUSHDOWN_DISABLED says."""
+    clauses = []
+    for strategy in engine.strategies:
+        clause = strategy.sql_clause()
+        if clause is None:
+            raise ValueError(f"Filter {strategy.name} has no SQL compilation")
+        clauses.append(clause)
+
+    totals = db.session.execute(
+        select(func.count(), *(func.sum(case((Recipe.time <= edge, 1), else_=0)) for edge in edges))
+        .where(*clauses)
+    ).one()
+    counts: Dict[str, Any] = {"total": totals[0], "time": [int(n or 0) for n in totals[1:]]}
+
+    for column in FACET_VALUE_FIELDS:
+        value = func.lower(getattr(Recipe, column))
+        rows = db.session.execute(select(value, func.count()).where(*clauses).group_by(value))
+        counts[column] = {name: count for name, count in rows if name}
+
+    matching = select(Recipe.id).where(*clauses)
+    rows = db.session.execute(
+        select(Term.kind, Term.name, func.count())
+        .join(RecipeTerm, RecipeTerm.term_id == Term.id)
+        .where(Term.kind.in_(FACET_TERM_FIELDS), RecipeTerm.recipe_id.in_(matching))
+        .group_by(Term.kind, Term.name)
+    )
+    for field in FACET_TERM_FIELDS:
+        counts[field] = {}
+    for kind, name, count in rows:
+        counts[kind][name] = count
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Utility Functions
+# ---------------------------------------------------------------------------
+
+def get_json_or_abort(keys: List[str]):
+    """
+    Extract JSON data from request and validate required fields.
+    Aborts with 400 error if any required field is missing.
+    
+    Args:
+        keys: List of required field names
+        
+    Returns:
+        Dictionary with request JSON data
+        
+    Raises:
+        400 Bad Request if any required field is missing
+    """
+    data = request.get_json(silent=True) or {}
+    for k in keys:
+        if k not in data:
+            abort(400, description=f"Missing field: {k}")
+    return data
+
+
+FILTER_PARAMS = ("time", "tools", "ingredients", "taste", "cuisine", "difficulty")
+
+
+def get_filter_criteria(args: Optional[Any] = None) -> Dict[str, Any]:
+    """Extract the non-empty filter criteria (see filter_recipes) from the query string (or args)."""
+    args = request.args if args is None else args
+    criteria: Dict[str, Any] = {}
+    for param in FILTER_PARAMS:
+        value = args.get(param)
+        if value:
+            criteria[param] = value
+    return criteria
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last returned row as an opaque pagination cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor(). Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+# Cursor shapes for get_page_args: the accepted types of each cursor value
+ID_CURSOR = (int,)  # [last id]
+SCORE_CURSOR = ((int, float), int)  # [last score, last id]
+
+
+def get_page_args(default_limit: Optional[int] = None, args: Optional[Any] = None,
+                  cursor_shape: Optional[Tuple[Any, ...]] = None) -> Tuple[int, Optional[List[Any]]]:
+    """
+    Extract keyset pagination parameters from the query string (or args).
+    
+    Query Parameters:
+        - limit: Page size (defaults to PAGE_SIZE_DEFAULT, capped at PAGE_SIZE_MAX)
+        - cursor: Opaque next_cursor value from the previous page
+        
+    Args:
+        cursor_shape: Types of the cursor values, one entry per value (e.g.
+            ID_CURSOR); cursors of another length or type are rejected
+        
+    Returns:
+        Tuple of (limit, decoded cursor values or None for the first page)
+        
+    Raises:
+        400 Bad Request if limit is not a positive integer or the cursor is malformed
+    """
+    args = request.args if args is None else args
+    limit_arg = args.get("limit")
+    if limit_arg is None:
+        limit = default_limit or app.config["PAGE_SIZE_DEFAULT"]
+    elif limit_arg.isdigit() and int(limit_arg) > 0:
+        limit = int(limit_arg)
+    else:
+        abort(400, description="Limit must be a positive integer")
+    limit = min(limit, app.config["PAGE_SIZE_MAX"])
+
+    cursor = args.get("cursor")
+    if not cursor:
+        return limit, None
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        abort(400, description=str(e))
+    if cursor_shape is not None and (len(after) != len(cursor_shape) or not all(
+        isinstance(value, types) and not isinstance(value, bool) for value, types in zip(after, cursor_shape)
+    )):
+        abort(400, description="Invalid cursor")
+    return limit, after
+
+
+def select_recipe_records():
+    """Core select of the RecipeRecord columns; add filters, then run with load_recipe_records()."""
+    return select(*RECIPE_RECORD_COLUMNS)
+
+
+def load_recipe_records(stmt) -> List[RecipeRecord]:
+    """Execute a select_recipe_records() statement into RecipeRecord objects."""
+    return [RecipeRecord(*row) for row in db.session.execute(stmt)]
+
+
+def keyset_page(stmt, column, after: Optional[List[Any]], limit: int,
+                keep: Optional[Callable[[List[Any]], List[Any]]] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of stmt (a select_recipe_records() statement) ordered by an
+    indexed unique column, seeking past the cursor.
+    
+    Uses WHERE column > :last instead of OFFSET, so deep pages cost the same as
+    the first one. One extra row is fetched to tell whether more results exist
+    without a COUNT.
+    
+    Args:
+        keep: Optional in-memory filter applied to each fetched batch; further
+            batches are fetched until the page is full or the query is exhausted
+    
+    Returns:
+        Tuple of (RecipeRecords on this page, next_cursor or None on the last page)
+    """
+    last = after[0] if after else None
+    page: List[Any] = []
+    while True:
+        batch_stmt = stmt if last is None else stmt.where(column > last)
+        rows = load_recipe_records(batch_stmt.order_by(column).limit(limit + 1))
+        more = len(rows) > limit
+        rows = rows[:limit]
+        page.extend(keep(rows) if keep else rows)
+        if len(page) > limit or (more and len(page) == limit):
+            page = page[:limit]
+            return page, encode_cursor([getattr(page[-1], column.key)])
+        if not more:
+            return page, None
+        last = getattr(rows[-1], column.key)
+
+
+def upgrade_schema() -> None:
+    """
+    Create missing tables and add columns introduced after the initial schema.
+    
+    db.create_all() never alters existing tables, so databases created by
+    earlier releases are brought up to date here. Safe to run repeatedly.
+    """
+    db.create_all()
+    create_catalog_state()
+    db.session.commit()
+
+    recipe_columns = {column["name"] for column in inspect(db.engine).get_columns("recipes")}
+    with db.engine.begin() as conn:
+        if "version" not in recipe_columns:
+            conn.execute(text("ALTER TABLE recipes ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+    # Normalized term tables are created above; backfill them from the JSON columns
+    backfill_recipe_terms()
+
+
+# ---------------------------------------------------------------------------
+# Recommendations
+# ---------------------------------------------------------------------------
+
+def _content_features(row: Any) -> Set[Tuple[str, str]]:
+    """Ingredient, taste and cuisine features of a recipe row for content similarity."""
+    features = {("ingredients", term) for term in _decode_terms(row.ingredients)}
+    features |= {("taste", term) for term in _decode_terms(row.taste)}
+    if row.cuisine:
+        features.add(("cuisine", row.cuisine.lower()))
+    return features
+
+
+def build_recommendations() -> Dict[str, int]:
+    """
+    Recompute the recipe_neighbors and recipe_popularity tables (offline job).
+    
+    Each recipe's score for another recipe blends:
+    - collaborative: cosine similarity of the two recipes' favoriting users
+      (co-occurrence count / sqrt(favorites of a * favorites of b)); only the
+      latest RECOMMENDATION_MAX_USER_ITEMS favorites of each user are paired
+    - content: cosine similarity of IDF-weighted ingredient, taste and cuisine
+      features, computed exactly for each candidate. Candidates are the
+      recipes sharing a feature, at most RECOMMENDATION_CANDIDATES_PER_FEATURE
+      per feature (an evenly spaced sample of longer posting lists), plus the
+      co-favorited recipes, so the work per recipe is bounded
+    weighted by RECOMMENDATION_COLLAB_WEIGHT, and only the top
+    RECOMMENDATION_TOP_K neighbors are stored.
+    
+    Neighbors are computed outside any write transaction and staged in
+    recipe_neighbors_staging in IMPORT_BATCH_SIZE batches; one short
+    transaction then swaps them into recipe_neighbors and resynchronizes
+    recipe_popularity, so readers see either the old or the new tables and
+    writers wait only for the swap.
+    
+    Returns:
+        Counts of recipes, favorites and neighbor rows processed
+    
+    Raises:
+        RuntimeError: A concurrent build removed this build's staged rows
+    """
+    top_k = app.config["RECOMMENDATION_TOP_K"]
+    collab_weight = app.config["RECOMMENDATION_COLLAB_WEIGHT"]
+    per_feature = app.config["RECOMMENDATION_CANDIDATES_PER_FEATURE"]
+    max_user_items = app.config["RECOMMENDATION_MAX_USER_ITEMS"]
+
+    # Content features (numbered, so set intersections hash ints) and their inverted index
+    feature_ids: Dict[Tuple[str, str], int] = {}
+    features: Dict[int, Set[int]] = {}
+    postings: List[List[int]] = []
+    rows = db.session.query(Recipe.id, Recipe.ingredients, Recipe.taste, Recipe.cuisine).yield_per(1000)
+    for row in rows:
+        features[row.id] = set()
+        for feature in _content_features(row):
+            if feature not in feature_ids:
+                feature_ids[feature] = len(postings)
+                postings.append([])
+            features[row.id].add(feature_ids[feature])
+            postings[feature_ids[feature]].append(row.id)
+    weights = [math.log(1 + len(features) / len(ids)) ** 2 for ids in postings]
+    norms = {rid: math.sqrt(sum(map(weights.__getitem__, feats))) or 1.0 for rid, feats in features.items()}
+
+    # Favorites co-occurrence, one user at a time (favorites ordered by user, newest first)
+    favorite_counts: Dict[int, int] = defaultdict(int)
+    co_counts: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    favorites = 0
+
+    def pair(items: List[int]) -> None:
+        for i, a in enumerate(items):
+            favorite_counts[a] += 1
+            for b in items[i + 1:]:
+                co_counts[a][b] += 1
+                co_counts[b][a] += 1
+
+    current_user, items = None, []
+    stmt = select(Favorite.user_id, Favorite.recipe_id).order_by(Favorite.user_id, Favorite.id.desc())
+    for user_id, recipe_id in db.session.execute(stmt).yield_per(10000):
+        favorites += 1
+        if user_id != current_user:
+            pair(items)
+            current_user, items = user_id, []
+        if len(items) < max_user_items:
+            items.append(recipe_id)
+    pair(items)
+
+    # Staged rows of earlier failed builds are dropped; a concurrent build
+    # notices the loss of its own rows before swapping
+    build_id = int.from_bytes(os.urandom(4), "big") >> 1
+    db.session.execute(delete(RecipeNeighborStaging))
+    db.session.commit()
+
+    staged = 0
+    batch: List[Dict[str, Any]] = []
+    try:
+        for recipe_id, feats in features.items():
+            candidates: Set[int] = set()
+            for feature in feats:
+                ids = postings[feature]
+                if len(ids) > per_feature:
+                    step = -(-len(ids) // per_feature)
+                    ids = ids[recipe_id % step::step]
+                candidates.update(ids)
+            collab = co_counts.get(recipe_id, {})
+            candidates.update(other for other in collab if other in features)
+            candidates.discard(recipe_id)
+
+            scores = []
+            content_scale = (1 - collab_weight) / norms[recipe_id]
+            for other in candidates:
+                score = content_scale * sum(map(weights.__getitem__, feats & features[other])) / norms[other]
+                count = collab.get(other)
+                if count:
+                    score += collab_weight * count / math.sqrt(favorite_counts[recipe_id] * favorite_counts[other])
+                scores.append((score, -other))
+            batch.extend(
+                {"build_id": build_id, "recipe_id": recipe_id, "neighbor_id": -other, "score": score}
+                for score, other in heapq.nlargest(top_k, scores)
+            )
+            if len(batch) >= app.config["IMPORT_BATCH_SIZE"]:
+                db.session.execute(insert(RecipeNeighborStaging), batch)
+                db.session.commit()
+                staged += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(RecipeNeighborStaging), batch)
+            staged += len(batch)
+
+        # Swap: replace the live neighbors with the staged ones of recipes that still exist
+        mine = RecipeNeighborStaging.build_id == build_id
+        if db.session.execute(select(func.count()).select_from(RecipeNeighborStaging).where(mine)).scalar_one() != staged:
+            raise RuntimeError("Staged neighbors were removed by a concurrent rebuild")
+        recipe, neighbor = aliased(Recipe), aliased(Recipe)
+        db.session.execute(delete(RecipeNeighbor))
+        neighbor_rows = db.session.execute(
+            insert(RecipeNeighbor).from_select(
+                ["recipe_id", "neighbor_id", "score"],
+                select(RecipeNeighborStaging.recipe_id, RecipeNeighborStaging.neighbor_id, RecipeNeighborStaging.score)
+                .join(recipe, recipe.id == RecipeNeighborStaging.recipe_id)
+                .join(neighbor, neighbor.id == RecipeNeighborStaging.neighbor_id)
+                .where(mine),
+            )
+        ).rowcount
+        db.session.execute(delete(RecipeNeighborStaging).where(mine))
+
+        # Resynchronize the incrementally maintained favorite counts
+        db.session.execute(delete(RecipePopularity))
+        db.session.execute(
+            insert(RecipePopularity).from_select(
+                ["recipe_id", "favorite_count"],
+                select(Favorite.recipe_id, func.count()).group_by(Favorite.recipe_id),
+            )
+        )
+        log_favorites_change()  # Popularity was resynchronized
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        db.session.execute(delete(RecipeNeighborStaging).where(RecipeNeighborStaging.build_id == build_id))
+        db.session.commit()
+        raise
+    return {"recipes": len(features), "favorites": favorites, "neighbors": neighbor_rows}
+
+
+class BackgroundJob:
+    """
+    Runs a function on a background thread, one run at a time per process,
+    inside its own app context; the outcome of the last run is kept for polling.
+    """
+
+    def __init__(self, name: str, fn: Callable[[], Dict[str, Any]]):
+        self.name = name
+        self.fn = fn
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._state: Dict[str, Any] = {"status": "idle"}
+
+    def start(self) -> bool:
+        """Start a run; False if one is already running in this process."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._state = {"status": "running", "started_at": datetime.utcnow().isoformat() + "Z"}
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            return True
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the current run to finish (tests and CLI use)."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._state)
+
+    def _run(self) -> None:
+        with app.app_context():
+            try:
+                outcome = {"status": "succeeded", "result": self.fn()}
+            except Exception as e:
+                app.logger.exception("%s failed", self.name)
+                outcome = {"status": "failed", "error": str(e)}
+            finally:
+                db.session.remove()
+        with self._lock:
+            self._state.update(outcome, finished_at=datetime.utcnow().isoformat() + "Z")
+
+
+# Out-of-band recommendation rebuilds started by the admin endpoint
+recommendations_job = BackgroundJob("recommendations-rebuild", build_recommendations)
+
+
+def update_popularity(recipe_ids: List[int], delta: int) -> None:
+    """Add delta to the favorite count of recipe_ids (caller commits)."""
+    if not recipe_ids:
+        return
+    db.session.execute(
+        insert_ignore(RecipePopularity).from_select(
+            ["recipe_id", "favorite_count"],
+            select(Recipe.id, literal(0)).where(Recipe.id.in_(recipe_ids)),
+        )
+    )
+    db.session.execute(
+        update(RecipePopularity)
+        .where(RecipePopularity.recipe_id.in_(recipe_ids))
+        .values(favorite_count=RecipePopularity.favorite_count + delta)
+    )
+
+
+def recommended_recipe_ids(user_id: Optional[int]) -> List[int]:
+    """
+    Ranked recipe ids for a user (at most RECOMMENDATION_LIMIT), most relevant first.
+    
+    Sums the stored neighbor scores of the user's latest favorites and drops
+    recipes they already favorited, then fills up with the most favorited
+    recipes. Anonymous users get the popularity ranking only. Every query is
+    bounded by the configuration, not the catalog size.
+    """
+    seeds: List[int] = []
+    if user_id is not None:
+        seeds = db.session.execute(recommendation_seeds_query(user_id)).scalars().all()
+    neighbors = db.session.execute(recommendation_neighbors_query(seeds)).all() if seeds else []
+    popular = db.session.execute(recommendation_popular_query(len(seeds))).scalars().all()
+    candidates = {neighbor_id for neighbor_id, _ in neighbors} | set(popular)
+    favorited: List[int] = []
+    if user_id is not None and candidates:
+        favorited = db.session.execute(favorited_among_query(user_id, candidates)).scalars().all()
+    return rank_recommendations(seeds, neighbors, popular, favorited)
+
+
+def recommendation_seeds_query(user_id: int) -> Any:
+    """The user's latest RECOMMENDATION_SEED_FAVORITES favorite recipe ids."""
+    return (
+        select(Favorite.recipe_id)
+        .where(Favorite.user_id == user_id)
+        .order_by(Favorite.id.desc())
+        .limit(app.config["RECOMMENDATION_SEED_FAVORITES"])
+    )
+
+
+def recommendation_neighbors_query(seeds: List[int]) -> Any:
+    """(neighbor_id, score) rows of the seed recipes."""
+    return select(RecipeNeighbor.neighbor_id, RecipeNeighbor.score).where(RecipeNeighbor.recipe_id.in_(seeds))
+
+
+def recommendation_popular_query(seed_count: int) -> Any:
+    """The most favorited recipe ids, enough to fill the ranking after dropping the seeds."""
+    return (
+        select(RecipePopularity.recipe_id)
+        .where(RecipePopularity.favorite_count > 0)
+        .order_by(RecipePopularity.favorite_count.desc(), RecipePopularity.recipe_id)
+        .limit(app.config["RECOMMENDATION_LIMIT"] + seed_count)
+    )
+
+
+def favorited_among_query(user_id: int, recipe_ids: Set[int]) -> Any:
+    """Which of recipe_ids the user favorited."""
+    return select(Favorite.recipe_id).where(Favorite.user_id == user_id, Favorite.recipe_id.in_(recipe_ids))
+
+
+def not_favorited_by(user_id: Optional[int], id_column: Any) -> Any:
+    """Filter clause dropping the user's favorites from a recipe query (no-op for anonymous users)."""
+    if user_id is None:
+        return true()
+    return ~exists().where(Favorite.user_id == user_id, Favorite.recipe_id == id_column)
+
+
+def rank_recommendations(seeds: List[int], neighbors: List[Tuple[int, float]],
+                         popular: List[int], favorited: List[int]) -> List[int]:
+    """Merge the rows of the recommended_recipe_ids queries into the ranked id list."""
+    limit = app.config["RECOMMENDATION_LIMIT"]
+    scores: Dict[int, float] = defaultdict(float)
+    for neighbor_id, score in neighbors:
+        scores[neighbor_id] += score
+    excluded = set(seeds) | set(favorited)
+
+    ranked = [rid for rid, _ in heapq.nlargest(
+        limit, ((rid, score) for rid, score in scores.items() if rid not in excluded),
+        key=lambda item: (item[1], -item[0]),
+    )]
+    seen = excluded | set(ranked)
+    for rid in popular:
+        if len(ranked) >= limit:
+            break
+        if rid not in seen:
+            ranked.append(rid)
+            seen.add(rid)
+    return ranked
+
+
+def get_recommendation_cursor(after: Optional[List[Any]]) -> Tuple[Optional[int], Optional[List[Any]]]:
+    """
+    Split a get_recipes cursor into (offset into the ranked list, catalog keyset cursor).
+    
+    Pages walk the ranked recommendations (cursor ["rank", offset]) and then the
+    rest of the catalog in id order (cursor [last_id]).
+    
+    Raises:
+        400 Bad Request for any other cursor shape
+    """
+    if after is None:
+        return 0, None
+    if len(after) == 2 and after[0] == "rank" and isinstance(after[1], int) and after[1] >= 0:
+        return after[1], None
+    if len(after) == 1 and isinstance(after[0], int):
+        return None, after
+    abort(400, description="Invalid cursor")
+
+
+def recommendations_page(ranked: List[int], after: Optional[List[Any]], limit: int,
+                         user_id: Optional[int] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of get_recipes: the ranked recipes, then every other recipe in id order.
+    
+    The catalog part leaves out the user's favorites, like the ranked part.
+    
+    Returns:
+        Tuple of (recipes on this page, next_cursor or None on the last page)
+    """
+    offset, catalog_after = get_recommendation_cursor(after)
+    page: List[Any] = []
+    if offset is not None:
+        ids = ranked[offset:offset + limit]
+        records = load_recipe_records(select_recipe_records().where(Recipe.id.in_(ids))) if ids else []
+        by_id = {r.id: r for r in records}
+        page = [by_id[rid] for rid in ids if rid in by_id]
+        if offset + limit < len(ranked):
+            return page, encode_cursor(["rank", offset + limit])
+
+    stmt = select_recipe_records().where(not_favorited_by(user_id, Recipe.id))
+    if ranked:
+        # The ranked list is bounded by RECOMMENDATION_LIMIT
+        stmt = stmt.where(Recipe.id.not_in(ranked))
+    if offset is not None and len(page) >= limit:
+        # The ranked list ends exactly on this page: is there anything left?
+        rest = db.session.execute(stmt.with_only_columns(Recipe.id).limit(1)).first()
+        return page, encode_cursor(["rank", len(ranked)]) if rest else None
+    rest, next_cursor = keyset_page(stmt, Recipe.id, catalog_after, limit - len(page))
+    return page + rest, next_cursor
+
+
+def recommendations_etag_key() -> str:
+    """ETag component of personalized responses: the favorites version and the caller."""
+    return f"{catalog_version.favorites_token()}|{get_jwt_identity()}"
+
+
+# ---------------------------------------------------------------------------
+# HTTP Caching & Compression
+# ---------------------------------------------------------------------------
+
+def uncacheable(response):
+    """
+    Mark a response (e.g. a graceful-degradation fallback) as not cacheable,
+    so conditional_get() does not attach an ETag to it.
+    """
+    response = make_response(response)
+    response.cache_control.no_store = True
+    return response
+
+
+# Stands in for the recipe list while the rest of a page is encoded
+_FRAGMENTS_PLACEHOLDER = f"__recipe_fragments_{os.urandom(8).hex()}__"
+
+
+def encode_recipe_page(key: str, rows: Iterable[Any], **fields: Any) -> bytes:
+    """
+    JSON body {key: [recipe, ...], **fields}, always compact.
+    
+    The recipes are joined from their cached encoded fragments
+    (Recipe.cached_json) instead of being re-encoded on every request; only
+    the small envelope (cursor, flags) is encoded per response. The body
+    equals jsonify's with the same provider when jsonify is compact; in debug
+    mode jsonify indents and this does not.
+    """
+    envelope = app.json.dumps({key: _FRAGMENTS_PLACEHOLDER, **fields}, separators=(",", ":")).encode()
+    recipes = b"[" + b",".join(Recipe.cached_json(row) for row in rows) + b"]"
+    return envelope.replace(f'"{_FRAGMENTS_PLACEHOLDER}"'.encode(), recipes, 1) + b"\n"
+
+
+def recipe_page_response(key: str, rows: Iterable[Any], **fields: Any):
+    """JSON response for a page of recipes (see encode_recipe_page)."""
+    return app.response_class(encode_recipe_page(key, rows, **fields), mimetype=app.json.mimetype)
+
+
+def catalog_etag(full_path: str, vary: Optional[str] = None) -> Tuple[str, Set[str]]:
+    """
+    Strong ETag for a catalog read at the current catalog version (call
+    sync_catalog() first).
+    
+    Args:
+        vary: Extra key for responses that also depend on something other than
+            the catalog and the URL (e.g. the caller, see recommendations_etag_key)
+    
+    Returns:
+        Tuple of (ETag, every ETag matching it, including compressed variants)
+    """
+    key = f"{catalog_version.token()}|{full_path}" if vary is None else f"{catalog_version.token()}|{vary}|{full_path}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    # Compressed representations carry a coding suffix (see compress_response)
+    return digest, {digest, f"{digest}-gzip", f"{digest}-br"}
+
+
+def negotiate_compression(body: bytes, accepted: Any) -> Optional[Tuple[str, bytes]]:
+    """
+    Compress body with the best encoding the client accepts (brotli when
+    available, otherwise gzip).
+    
+    Returns:
+        Tuple of (encoding, compressed body), or None to send body as-is
+    """
+    if len(body) < app.config["COMPRESS_MIN_SIZE"]:
+        return None
+    if brotli is not None and accepted["br"]:
+        return "br", brotli.compress(body, quality=4)
+    if accepted["gzip"]:
+        return "gzip", gzip.compress(body, compresslevel=6)
+    return None
+
+
+def conditional_get(f=None, *, vary: Optional[Callable[[], str]] = None):
+    """
+    Decorator adding strong ETags and conditional GET to catalog read endpoints.
+    
+    The ETag is derived from the shared catalog version and the request URL,
+    so an If-None-Match revalidation is answered with 304 before the view
+    runs, after a single primary-key read (see sync_catalog) that also brings
+    the in-memory indexes up to date for the view.
+    
+    Args:
+        vary: Optional callable returning an extra ETag key, for responses that
+            differ per user (use as @conditional_get(vary=...)); such responses
+            also carry Vary: Authorization and are Cache-Control: private
+    """
+    if f is None:
+        return lambda view: conditional_get(view, vary=vary)
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        sync_catalog()
+        digest, variants = catalog_etag(request.full_path, vary() if vary else None)
+        matched = next((etag for etag in variants if etag in request.if_none_match), None)
+        if matched is not None:
+            response = app.response_class(status=304)
+            response.set_etag(matched)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.cache_control.no_store:
+                return response
+            response.set_etag(digest)
+        if vary is not None:
+            # Per-caller responses may be kept by the browser, never by shared caches
+            response.vary.add("Authorization")
+            response.cache_control.private = True
+        else:
+            response.cache_control.public = True
+        response.cache_control.max_age = app.config["HTTP_CACHE_MAX_AGE"]
+        response.cache_control.must_revalidate = True
+        return response
+    return decorated_function
+
+
+@app.after_request
+def compress_response(response):
+    """
+    Compress large JSON responses with the best encoding the client accepts
+    (brotli when available, otherwise gzip).
+    """
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype != "application/json"):
+        return response
+    response.vary.add("Accept-Encoding")
+    compressed = negotiate_compression(response.get_data(), request.accept_encodings)
+    if compressed is None:
+        return response
+
+    encoding, body = compressed
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Strong ETags must differ between content codings
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+# ---------------------------------------------------------------------------
+# Prometheus Metrics
+# ---------------------------------------------------------------------------
+
+class RequestMetrics:
+    """
+    Prometheus instrumentation: request latency, status codes and in-flight
+    requests per route, SQL queries and database time per request, and the
+    rows handled by each filtering layer.
+    
+    Routes are labelled by their URL rule (/api/v1/recipes/<int:recipe_id>),
+    never the raw path, so the number of series stays bounded. When
+    PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py sets it), each worker
+    process writes its samples to files in that directory and /metrics
+    aggregates all of them, so the totals are correct whichever worker answers
+    the scrape. Every method is a no-op when prometheus_client is not installed.
+    """
+
+    UNMATCHED_ROUTE = "<unmatched>"  # 404/405 responses, which have no URL rule
+    QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+    def __init__(self):
+        self.enabled = prometheus_client is not None
+        if not self.enabled:
+            return
+        self.registry = prometheus_client.CollectorRegistry()
+        labels = ["method", "route"]
+        self.requests = prometheus_client.Counter(
+            "http_requests_total", "HTTP responses by route and status code",
+            labels + ["status"], registry=self.registry,
+        )
+        self.latency = prometheus_client.Histogram(
+            "http_request_duration_seconds", "Time to produce the response",
+            labels, registry=self.registry,
+        )
+        self.in_flight = prometheus_client.Gauge(
+            "http_requests_in_flight", "Requests being processed",
+            labels, registry=self.registry, multiprocess_mode="livesum",
+        )
+        self.db_queries = prometheus_client.Histogram(
+            "http_request_db_queries", "SQL statements executed per request",
+            labels, buckets=self.QUERY_COUNT_BUCKETS, registry=self.registry,
+        )
+        self.db_time = prometheus_client.Histogram(
+            "http_request_db_seconds", "Time spent executing SQL per request",
+            labels, registry=self.registry,
+        )
+        self.filter_rows = prometheus_client.Counter(
+            "filter_rows_total",
+            "Rows returned by the SQL layer and kept by the strategy layer of /recipes/filter",
+            ["layer"], registry=self.registry,
+        )
+
+    @staticmethod
+    def _labels() -> Tuple[str, str]:
+        rule = request.url_rule
+        return request.method, rule.rule if rule is not None else RequestMetrics.UNMATCHED_ROUTE
+
+    def start_request(self) -> None:
+        if not self.enabled:
+            return
+        g.metrics = SimpleNamespace(
+            labels=self._labels(), start=time.perf_counter(), status=500, db_queries=0, db_seconds=0.0,
+        )
+        self.in_flight.labels(*g.metrics.labels).inc()
+
+    def record_status(self, response) -> None:
+        state = g.get("metrics")
+        if state is not None:
+            state.status = response.status_code
+
+    def finish_request(self) -> None:
+        """Observe the request; runs at teardown, after the response is fully built."""
+        state = g.pop("metrics", None)
+        if state is None:
+            return
+        self.in_flight.labels(*state.labels).dec()
+        self.requests.labels(*state.labels, str(state.status)).inc()
+        self.latency.labels(*state.labels).observe(time.perf_counter() - state.start)
+        self.db_queries.labels(*state.labels).observe(state.db_queries)
+        self.db_time.labels(*state.labels).observe(state.db_seconds)
+
+    def record_query(self, seconds: float) -> None:
+        """Attribute one SQL statement to the current request, if any."""
+        if has_request_context():
+            state = g.get("metrics")
+            if state is not None:
+                state.db_queries += 1
+                state.db_seconds += seconds
+
+    def record_filter_rows(self, fetched: int, kept: int) -> None:
+        if self.enabled:
+            self.filter_rows.labels("sql").inc(fetched)
+            self.filter_rows.labels("strategy").inc(kept)
+
+    def render(self) -> Tuple[bytes, str]:
+        """Prometheus text exposition of this process, or of all workers in multiprocess mode."""
+        registry = self.registry
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = prometheus_client.CollectorRegistry()
+            prometheus_multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+metrics = RequestMetrics()
+
+
+@app.before_request
+def start_request_metrics():
+    metrics.start_request()
+
+
+@app.after_request
+def record_response_status(response):
+    metrics.record_status(response)
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    metrics.finish_request()
+
+
+# ---------------------------------------------------------------------------
+# Slow Query Log
+# ---------------------------------------------------------------------------
+
+class SlowQueryLog:
+    """
+    Ring buffer of SQL statements that ran longer than a threshold.
+    
+    Each entry records the statement, its bound parameters (values replaced
+    by "?" unless log_parameters), the endpoint that issued it, the duration
+    and the query plan, captured right away on the same connection: EXPLAIN
+    QUERY PLAN on SQLite, plain EXPLAIN elsewhere. The plan is never
+    ANALYZEd, which would run the slow statement a second time inside the
+    request. A statement is explained at most once per explain_interval
+    seconds. Entries are also written to the application log.
+    """
+
+    MAX_PARAM_LENGTH = 200  # Longer parameter values are truncated in entries
+    REDACTED = "?"
+
+    def __init__(self, threshold_ms: float, maxsize: int, explain: bool = True, explain_interval: float = 60,
+                 log_parameters: bool = False):
+        self.threshold = threshold_ms / 1000 if threshold_ms >= 0 else None
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self.log_parameters = log_parameters
+        self._entries: "deque[Dict[str, Any]]" = deque(maxlen=maxsize)
+        self._plans: "OrderedDict[str, tuple]" = OrderedDict()  # statement -> (explained_at, plan)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def is_slow(self, seconds: float) -> bool:
+        return self.threshold is not None and seconds >= self.threshold
+
+    @classmethod
+    def _loggable(cls, value: Any) -> Any:
+        """JSON-safe, truncated copy of a bound parameter value."""
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        text_value = value if isinstance(value, str) else repr(value)
+        if len(text_value) > cls.MAX_PARAM_LENGTH:
+            text_value = text_value[:cls.MAX_PARAM_LENGTH] + "..."
+        return text_value
+
+    def _loggable_params(self, parameters: Any) -> Any:
+        """Loggable copy of the parameters; values are redacted unless log_parameters is set."""
+        loggable = self._loggable if self.log_parameters else lambda value: self.REDACTED
+        if isinstance(parameters, dict):
+            return {key: loggable(value) for key, value in parameters.items()}
+        if isinstance(parameters, (list, tuple)):
+            return [loggable(value) for value in parameters]
+        return loggable(parameters)
+
+    def _plan(self, conn, statement: str, parameters: Any) -> Optional[List[str]]:
+        """EXPLAIN the statement on the connection that ran it; None if it cannot be explained."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._plans.get(statement)
+            if cached is not None and now - cached[0] < self.explain_interval:
+                return cached[1]
+
+        dialect = conn.dialect.name
+        prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+
+        try:
+            cursor = conn.connection.cursor()
+        except Exception:
+            return None
+        try:
+            if dialect == "postgresql":
+                # A failed EXPLAIN must not abort the request's transaction
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = [str(row[-1]) for row in cursor.fetchall()]
+            except Exception:
+                if dialect == "postgresql":
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return None
+            if dialect == "postgresql":
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception:
+            return None
+        finally:
+            cursor.close()
+
+        with self._lock:
+            self._plans[statement] = (now, plan)
+            self._plans.move_to_end(statement)
+            while len(self._plans) > max(self._entries.maxlen or 0, 1):
+                self._plans.popitem(last=False)
+        return plan
+
+    def record(self, conn, statement: str, parameters: Any, seconds: float, executemany: bool) -> None:
+        """Log a slow statement and add it to the ring buffer."""
+        entry = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "duration_ms": round(seconds * 1000, 3),
+            "endpoint": None,
+            "method": None,
+            "path": None,
+            "statement": statement,
+            # executemany runs one statement per parameter set; the first one stands for the batch
+            "parameters": self._loggable_params(parameters[0] if executemany and parameters else parameters),
+            "executemany": len(parameters) if executemany else None,
+            "plan": None,
+        }
+        if has_request_context():
+            entry.update(endpoint=request.endpoint, method=request.method, path=request.path)
+        if self.explain and not executemany:
+            entry["plan"] = self._plan(conn, statement, parameters)
+
+        with self._lock:
+            self._entries.append(entry)
+            self.recorded += 1
+        app.logger.warning(
+            "Slow query (%.1f ms) in %s: %s; parameters=%r; plan=%r",
+            entry["duration_ms"], entry["endpoint"], statement, entry["parameters"], entry["plan"],
+        )
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Buffered entries, newest first."""
+        with self._lock:
+            return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+
+# Shared per-process slow-query log
+slow_query_log = SlowQueryLog(
+    app.config["SLOW_QUERY_THRESHOLD_MS"],
+    app.config["SLOW_QUERY_LOG_SIZE"],
+    explain=app.config["SLOW_QUERY_EXPLAIN"],
+    explain_interval=app.config["SLOW_QUERY_EXPLAIN_INTERVAL"],
+    log_parameters=app.config["SLOW_QUERY_LOG_PARAMETERS"],
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context.query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def record_query_time(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - context.query_start
+    metrics.record_query(seconds)
+    if slow_query_log.is_slow(seconds):
+        slow_query_log.record(conn, statement, parameters, seconds, executemany)
+
+
+# ---------------------------------------------------------------------------
+# Bulk Recipe Import
+# ---------------------------------------------------------------------------
+
+MAX_IMPORT_RECORD_SIZE = 1 << 20  # Largest single recipe accepted, in characters
+
+
+def iter_json_records(stream: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[Tuple[int, Any]]:
+    """
+    Incrementally parse recipes from a binary stream holding NDJSON or a JSON array.
+    
+    The format is detected from the first non-whitespace character. Only one
+    chunk plus the record being decoded is held in memory at a time.
+    
+    Yields:
+        (position, record) tuples, 1-based; record is a ValueError for
+        unparseable input. NDJSON resumes at the next line, a malformed
+        JSON array ends the stream.
+    """
+    decoder = json.JSONDecoder()
+    decode = codecs.getincrementaldecoder("utf-8")(errors="replace").decode
+    buffer = ""
+    eof = False
+
+    def fill() -> None:
+        nonlocal buffer, eof
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += decode(chunk or b"", final=eof)
+
+    while not eof and not buffer.strip():
+        fill()
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+    position = 0
+
+    if buffer[0] != "[":
+        # NDJSON: one record per line
+        while buffer or not eof:
+            newline = buffer.find("\n")
+            if newline == -1 and not eof:
+                if len(buffer) > MAX_IMPORT_RECORD_SIZE:
+                    yield position + 1, ValueError("Record too large")
+                    return
+                fill()
+                continue
+            if newline == -1:
+                line, buffer = buffer, ""
+            else:
+                line, buffer = buffer[:newline], buffer[newline + 1:]
+            if line.strip():
+                position += 1
+                try:
+                    yield position, json.loads(line)
+                except ValueError as e:
+                    yield position, ValueError(f"Invalid JSON: {e}")
+        return
+
+    # JSON array: decode one element at a time
+    pos = 1
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buffer):
+            if eof:
+                yield position + 1, ValueError("Unterminated JSON array")
+                return
+            buffer, pos = buffer[pos:], 0
+            fill()
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except ValueError as e:
+            if eof or len(buffer) - pos > MAX_IMPORT_RECORD_SIZE:
+                yield position + 1, ValueError(f"Invalid JSON: {e}")
+                return
+            buffer, pos = buffer[pos:], 0
+            fill()
+            continue
+        position += 1
+        yield position, record
+        pos = end
+
+
+def parse_recipe_record(data: Any) -> Dict[str, Any]:
+    """
+    Validate one imported recipe and convert it to recipes table column values.
+    Uses the same defaults as the create_recipe endpoint.
+    
+    Raises:
+        ValueError if the record is not a recipe object or has invalid fields
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Record must be a JSON object")
+    if not isinstance(data.get("name"), str) or not data["name"].strip():
+        raise ValueError("Missing field: name")
+    time_value = data.get("time")
+    if time_value is not None and (not isinstance(time_value, int) or isinstance(time_value, bool)):
+        raise ValueError("Time must be an integer")
+
+    row = {
+        "name": data["name"],
+        "description": data.get("description", ""),
+        "image_url": data.get("image_url", ""),
+        "time": time_value,
+        "cuisine": data.get("cuisine"),
+        "difficulty": data.get("difficulty"),
+        "version": new_recipe_version(),
+    }
+    for field in TERM_FIELDS:
+        values = data.get(field, [])
+        if not isinstance(values, list):
+            raise ValueError(f"{field.capitalize()} must be an array")
+        row[field] = json.dumps(values)  # Convert arrays to JSON strings
+    return row
+
+
+def _insert_recipe_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insert rows with one multi-row INSERT, link their terms and log the change (caller commits)."""
+    recipes_table = Recipe.__table__
+    ids = db.session.execute(
+        insert(recipes_table).returning(recipes_table.c.id, sort_by_parameter_order=True),
+        rows,
+    ).scalars().all()
+    sync_recipe_terms([SimpleNamespace(id=recipe_id, **row) for recipe_id, row in zip(ids, rows)])
+    log_catalog_change(ids)
+
+
+def _insert_recipe_batch(batch: List[Tuple[int, Dict[str, Any]]]) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Insert one batch in a single transaction. If the batch is rejected by the
+    database, retry row by row to isolate the failing records.
+    
+    Returns:
+        Tuple of (rows inserted, [(position, error message)])
+    """
+    try:
+        _insert_recipe_rows([row for _, row in batch])
+        db.session.commit()
+        return len(batch), []
+    except SQLAlchemyError:
+        db.session.rollback()
+
+    inserted = 0
+    failures = []
+    for position, row in batch:
+        try:
+            _insert_recipe_rows([row])
+            db.session.commit()
+            inserted += 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            failures.append((position, str(getattr(e, "orig", e))))
+    return inserted, failures
+
+
+def import_recipes(records: Iterable[Tuple[int, Any]], batch_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Insert parsed records in batches, yielding progress events as it goes.
+    
+    Events:
+        {"row": n, "error": "..."}                        - a record was rejected
+        {"batch": n, "inserted": k, "failed": f, ...}    - a batch was committed
+        {"summary": {"inserted": ..., "failed": ..., "batches": ...}} - always last
+    
+    Memory use is bounded by batch_size; errors are streamed, not retained.
+    Each batch commits together with its catalog change, so an import cut
+    short (a dropped client closing the stream) leaves whole batches that
+    every process's in-memory indexes already follow, and nothing to reset.
+    """
+    totals = {"inserted": 0, "failed": 0, "batches": 0}
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        inserted, failures = _insert_recipe_batch(batch)
+        for position, message in failures:
+            yield {"row": position, "error": message}
+        totals["batches"] += 1
+        totals["inserted"] += inserted
+        totals["failed"] += len(failures)
+        yield {
+            "batch": totals["batches"],
+            "inserted": inserted,
+            "failed": len(failures),
+            "total_inserted": totals["inserted"],
+        }
+        batch.clear()
+
+    for position, record in records:
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            batch.append((position, parse_recipe_record(record)))
+        except ValueError as e:
+            totals["failed"] += 1
+            yield {"row": position, "error": str(e)}
+            continue
+        if len(batch) >= batch_size:
+            yield from flush()
+    if batch:
+        yield from flush()
+    yield {"summary": totals}
+
+
+def load_sample_recipes() -> int:
+    """Stream sample_recipes.json into the database. Returns the number of recipes created."""
+    summary: Dict[str, Any] = {}
+    with open('sample_recipes.json', 'rb') as f:
+        for progress in import_recipes(iter_json_records(f), app.config["IMPORT_BATCH_SIZE"]):
+            summary = progress.get("summary", summary)
+    return summary.get("inserted", 0)
+
+
+# ---------------------------------------------------------------------------
+# Streaming Catalog Export
+# ---------------------------------------------------------------------------
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = ["id", "name", "description", "image_url", "time",
+                  "cuisine", "difficulty", "tools", "ingredients", "taste"]
+
+
+def export_recipes(criteria: Dict[str, Any], fmt: str, with_favorites: bool,
+                   batch_size: int = 1000) -> Iterator[str]:
     """
-    Extract JSON data from request and validate required fields.
-    Aborts with 400 error if any required field is missing.
+    Stream the recipes matching criteria (same as filter_recipes) as NDJSON or CSV.
+    
+    Rows are fetched with yield_per, which uses a server-side cursor on
+    PostgreSQL, and filtered/encoded one batch at a time, so the table is never
+    materialized in memory.
     
     Args:
-        keys: List of required field names
-        
-    Returns:
-        Dictionary with request JSON data
+        criteria: Filter criteria as returned by get_filter_criteria()
+        fmt: "ndjson" (to_dict shape per line) or "csv" (array fields as JSON text)
+        with_favorites: Add a favorite_count column aggregated from favorites
+        batch_size: Rows fetched and encoded per chunk
         
-    Raises:
-        400 Bad Request if any required field is missing
+    Yields:
+        Encoded text chunks
     """
-    data = request.get_json(silent=True) or {}
-    for k in keys:
-        if k not in data:
-            abort(400, description=f"Missing field: {k}")
-    return data
+    query = select(*(getattr(Recipe, column) for column in EXPORT_COLUMNS))
+    header = list(EXPORT_COLUMNS)
+    if with_favorites:
+        counts = (
+            select(Favorite.recipe_id, func.count().label("favorite_count"))
+            .group_by(Favorite.recipe_id)
+            .subquery()
+        )
+        query = (
+            query.add_columns(func.coalesce(counts.c.favorite_count, 0).label("favorite_count"))
+            .outerjoin(counts, counts.c.recipe_id == Recipe.id)
+        )
+        header.append("favorite_count")
+    plan = FilterPlan(criteria)
+    query = plan.apply_sql(query)
+    result = db.session.execute(query.order_by(Recipe.id).execution_options(yield_per=batch_size))
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for rows in result.partitions():
+            writer.writerows(plan.apply(rows))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+        return
+
+    for rows in result.partitions():
+        lines = []
+        for row in plan.apply(rows):
+            data = Recipe.serialize(row)
+            if with_favorites:
+                data["favorite_count"] = row.favorite_count
+            lines.append(json.dumps(data) + "\n")
+        yield "".join(lines)
 
 
 # ---------------------------------------------------------------------------
@@ -484,6 +3850,8 @@ def login():
     user: User | None = User.query.filter_by(username=data["username"]).first()
     if not user or not user.check_password(data["password"]):
         return jsonify({"message": "Invalid username or password"}), 401
+    # Persist a hash upgraded by check_password
+    db.session.commit()
 
     # Generate JWT token with user ID as identity
     access_token = create_access_token(identity=user.id)
@@ -539,25 +3907,42 @@ def get_current_user():
 
 @app.get("/api/v1/recipes")
 @jwt_required(optional=True)
+@conditional_get(vary=recommendations_etag_key)
 def get_recipes():
     """
-    Get recommended recipes (currently returns first 20 recipes).
+    Get recommended recipes.
     
     Authentication: Optional (works for both authenticated and anonymous users)
     
+    Authenticated users first get recipes similar to their favorites (see
+    recommended_recipe_ids), anonymous users the most favorited recipes; the
+    rest of the catalog follows in id order. Recipes the user favorited are
+    never listed.
+    
+    Query Parameters (all optional):
+        - limit: Page size (default 20)
+        - cursor: next_cursor from the previous page
+    
     Returns:
-        200: List of recommended recipes
+        200: Page of recommended recipes with next_cursor and has_more
+        400: Invalid limit or cursor
         500: Database error (gracefully handled)
         
     Error Handling:
         Returns empty list if database tables don't exist yet.
     """
+    limit, after = get_page_args()
+    get_recommendation_cursor(after)
     try:
-        recipes = Recipe.query.limit(20).all()  # Placeholder "recommended" logic
-        return jsonify({"recipes": [r.to_dict() for r in recipes]})
+        user_id = get_jwt_identity()
+        ranked = recommended_recipe_ids(user_id)
+        recipes, next_cursor = recommendations_page(ranked, after, limit, user_id)
+        return recipe_page_response(
+            "recipes", recipes, next_cursor=next_cursor, has_more=next_cursor is not None
+        )
     except Exception as e:
         # Graceful degradation: return empty list if DB not initialized
-        return jsonify({"recipes": []})
+        return uncacheable(jsonify({"recipes": [], "next_cursor": None, "has_more": False}))
 
 
 @app.post("/api/v1/recipes")
@@ -601,6 +3986,9 @@ def create_recipe():
         )
         
         db.session.add(recipe)
+        db.session.flush()  # Assign recipe.id for the term links
+        sync_recipe_terms([recipe])
+        log_catalog_change([recipe.id])
         db.session.commit()
         
         return jsonify({
@@ -633,36 +4021,17 @@ def init_database():
         500: Database initialization failed
     """
     try:
-        # Create all database tables
-        db.create_all()
+        # Create all database tables and bring older schemas up to date
+        upgrade_schema()
         
         # Only add sample data if database is empty
         if Recipe.query.count() == 0:
-            # Load sample recipes from sample_recipes.json if database is empty
-            with open('sample_recipes.json', 'r') as f:
-                sample_data = json.load(f)
-            
-            sample_recipes = []
-            for data in sample_data:
-                recipe = Recipe(
-                    name=data["name"],
-                    description=data["description"],
-                    image_url=data["image_url"],
-                    time=data["time"],
-                    cuisine=data["cuisine"],
-                    difficulty=data["difficulty"],
-                    tools=json.dumps(data["tools"]),        # Convert arrays to JSON strings
-                    ingredients=json.dumps(data["ingredients"]),
-                    taste=json.dumps(data["taste"])
-                )
-                sample_recipes.append(recipe)
-                db.session.add(recipe)
-            
-            db.session.commit()
+            # Stream sample recipes from sample_recipes.json in batches
+            recipes_created = load_sample_recipes()
             
             return jsonify({
-                "message": f"Database initialized successfully with {len(sample_recipes)} sample recipes",
-                "recipes_created": len(sample_recipes)
+                "message": f"Database initialized successfully with {recipes_created} sample recipes",
+                "recipes_created": recipes_created
             }), 201
         else:
             # Database already has data
@@ -707,7 +4076,11 @@ def delete_all_recipes():
             }), 200
         
         # Delete all recipes (favorites will be deleted automatically due to CASCADE)
+        RecipeTerm.query.delete()  # Explicit: SQLite does not enforce ON DELETE CASCADE
+        RecipeNeighbor.query.delete()
+        RecipePopularity.query.delete()
         Recipe.query.delete()
+        log_catalog_change()
         db.session.commit()
         
         return jsonify({
@@ -724,8 +4097,168 @@ def delete_all_recipes():
         }), 500
 
 
+@app.post("/api/v1/admin/recipes/import")
+def import_recipes_endpoint():
+    """
+    Administrative endpoint for streaming bulk recipe import.
+    
+    Request Body:
+        NDJSON (one recipe object per line) or a JSON array of recipe objects,
+        using the same fields as POST /api/v1/recipes. The body is parsed
+        incrementally, so it may be arbitrarily large.
+        
+    Query Parameters:
+        - batch_size: Rows per multi-row INSERT (default IMPORT_BATCH_SIZE, capped at IMPORT_BATCH_MAX)
+        
+    Returns:
+        200: application/x-ndjson stream of progress events, one per line:
+             per-row errors, per-batch progress and a final summary
+        400: Invalid batch_size
+    """
+    batch_size = request.args.get("batch_size", app.config["IMPORT_BATCH_SIZE"], type=int)
+    if batch_size <= 0:
+        abort(400, description="Batch size must be a positive integer")
+    # Each batch is held in memory and sent as one statement
+    batch_size = min(batch_size, app.config["IMPORT_BATCH_MAX"])
+
+    def generate():
+        for progress in import_recipes(iter_json_records(request.stream), batch_size):
+            yield json.dumps(progress) + "\n"
+
+    return app.response_class(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.get("/api/v1/admin/recipes/export")
+def export_recipes_endpoint():
+    """
+    Administrative endpoint streaming the recipe catalog for analytics and backups.
+    
+    Query Parameters (all optional):
+        - format: "ndjson" (default) or "csv"
+        - favorites: "1" to include a favorite_count column
+        - time, tools, ingredients, taste, cuisine, difficulty: same as /api/v1/recipes/filter
+        
+    Returns:
+        200: Chunked NDJSON or CSV stream of matching recipes, in id order
+        400: Unknown format
+    """
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        abort(400, description=f"Format must be one of: {', '.join(EXPORT_FORMATS)}")
+    with_favorites = request.args.get("favorites") in ("1", "true")
+
+    sync_catalog()
+    stream = export_recipes(get_filter_criteria(), fmt, with_favorites)
+    response = app.response_class(stream_with_context(stream), mimetype=EXPORT_FORMATS[fmt])
+    response.headers["Content-Disposition"] = f"attachment; filename=recipes.{fmt}"
+    return response
+
+
+@app.post("/api/v1/admin/recommendations/rebuild")
+def rebuild_recommendations():
+    """
+    Administrative endpoint starting a recommendation rebuild in the background.
+    
+    build_recommendations() runs on a background thread of this worker, so
+    the request returns immediately; poll GET on the same URL for the outcome.
+    Schedule `flask build-recommendations` instead for periodic rebuilds.
+    
+    Returns:
+        202: Rebuild started, with the job status
+        409: A rebuild is already running in this worker
+    """
+    if not recommendations_job.start():
+        return jsonify({"message": "Recommendation rebuild already running", "job": recommendations_job.status()}), 409
+    return jsonify({"message": "Recommendation rebuild started", "job": recommendations_job.status()}), 202
+
+
+@app.get("/api/v1/admin/recommendations/rebuild")
+def rebuild_recommendations_status():
+    """
+    Administrative endpoint reporting this worker's last recommendation rebuild.
+    
+    Returns:
+        200: status (idle, running, succeeded or failed), started_at/finished_at,
+             and the counts (result) or error of a finished run
+    """
+    return jsonify(recommendations_job.status())
+
+
+@app.get("/api/v1/admin/cache/stats")
+def cache_stats():
+    """
+    Administrative endpoint exposing the per-process cache counters.
+    
+    Returns:
+        200: Size, hit, miss and eviction counters for each in-memory cache
+    """
+    return jsonify({
+        "recipe_dict_cache": recipe_cache.stats(),
+        "verified_token_cache": token_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "autocomplete_index": autocomplete_index.stats(),
+    })
+
+
+@app.get("/api/v1/admin/slow-queries")
+def slow_queries():
+    """
+    Administrative endpoint listing recent slow SQL statements in this process.
+    
+    Query Parameters:
+        - limit: Number of entries to return (default: all buffered)
+        
+    Returns:
+        200: Threshold and entries, newest first, with statement, bound parameters,
+             endpoint, duration and query plan
+        404: SLOW_QUERY_ENDPOINT is not enabled
+    """
+    if not app.config["SLOW_QUERY_ENDPOINT"]:
+        abort(404, description="Slow-query endpoint is not enabled")
+    entries = slow_query_log.entries()
+    limit = request.args.get("limit", type=int)
+    if limit is not None:
+        entries = entries[:max(limit, 0)]
+    return jsonify({
+        "threshold_ms": app.config["SLOW_QUERY_THRESHOLD_MS"],
+        "recorded": slow_query_log.recorded,
+        "entries": entries,
+    })
+
+
+@app.delete("/api/v1/admin/slow-queries")
+def clear_slow_queries():
+    """
+    Administrative endpoint emptying the slow-query buffer of this process.
+    
+    Returns:
+        200: Success message
+        404: SLOW_QUERY_ENDPOINT is not enabled
+    """
+    if not app.config["SLOW_QUERY_ENDPOINT"]:
+        abort(404, description="Slow-query endpoint is not enabled")
+    slow_query_log.clear()
+    return jsonify({"message": "Slow-query log cleared"})
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    
+    Returns:
+        200: Metrics in the Prometheus text exposition format
+        404: prometheus_client is not installed
+    """
+    if not metrics.enabled:
+        abort(404, description="Metrics are not enabled")
+    body, content_type = metrics.render()
+    return app.response_class(body, content_type=content_type)
+
+
 @app.get("/api/v1/recipes/<int:recipe_id>")
 @jwt_required(optional=True)
+@conditional_get
 def get_recipe(recipe_id: int):
     """
     Get a specific recipe by ID.
@@ -741,7 +4274,7 @@ def get_recipe(recipe_id: int):
     """
     try:
         recipe: Recipe = Recipe.query.get_or_404(recipe_id)
-        return jsonify(recipe.to_dict())
+        return app.response_class(Recipe.cached_json(recipe) + b"\n", mimetype=app.json.mimetype)
     except Exception as e:
         # If tables don't exist or other error, return 404
         return jsonify({"message": "Recipe not found"}), 404
@@ -761,7 +4294,7 @@ def delete_recipe_by_name(recipe_name: str):
     Returns:
         200: Recipe deleted successfully
         404: Recipe not found
-        409: Multiple recipes found with same name
+        409: Multiple recipes found with same name, or the recipe was changed concurrently
         500: Database deletion failed
         
     Note: This also removes the recipe from all users' favorites
@@ -788,7 +4321,13 @@ def delete_recipe_by_name(recipe_name: str):
         recipe_id = recipe.id
         
         # Delete the recipe (favorites will be deleted automatically due to CASCADE)
+        RecipeTerm.query.filter_by(recipe_id=recipe_id).delete()
+        RecipeNeighbor.query.filter(
+            or_(RecipeNeighbor.recipe_id == recipe_id, RecipeNeighbor.neighbor_id == recipe_id)
+        ).delete()
+        RecipePopularity.query.filter_by(recipe_id=recipe_id).delete()
         db.session.delete(recipe)
+        log_catalog_change([recipe_id])
         db.session.commit()
         
         return jsonify({
@@ -796,6 +4335,11 @@ def delete_recipe_by_name(recipe_name: str):
             "recipe_id": recipe_id
         }), 200
         
+    except StaleDataError:
+        # Another request updated or deleted the row since it was read
+        db.session.rollback()
+        return jsonify({"message": f"Recipe '{recipe_name}' was changed concurrently, retry"}), 409
+
     except Exception as e:
         # Rollback transaction on error
         db.session.rollback()
@@ -830,7 +4374,7 @@ def update_recipe(recipe_name: str):
     Returns:
         200: Recipe updated successfully
         404: Recipe not found
-        409: Multiple recipes found with same name
+        409: Multiple recipes found with same name, or the recipe was changed concurrently
         500: Database update failed
     """
     try:
@@ -872,6 +4416,9 @@ def update_recipe(recipe_name: str):
             recipe.ingredients = json.dumps(data["ingredients"])
         if "taste" in data:
             recipe.taste = json.dumps(data["taste"])
+        if any(field in data for field in TERM_FIELDS):
+            sync_recipe_terms([recipe])
+        log_catalog_change([recipe.id])
         
         db.session.commit()
         
@@ -880,6 +4427,11 @@ def update_recipe(recipe_name: str):
             "recipe": recipe.to_dict()
         }), 200
         
+    except StaleDataError:
+        # Another request updated or deleted the row since it was read
+        db.session.rollback()
+        return jsonify({"message": f"Recipe '{recipe_name}' was changed concurrently, retry"}), 409
+
     except Exception as e:
         # Rollback transaction on error
         db.session.rollback()
@@ -891,6 +4443,7 @@ def update_recipe(recipe_name: str):
 
 @app.get("/api/v1/recipes/filter")
 @jwt_required(optional=True)
+@conditional_get
 def filter_recipes():
     """
     Advanced recipe filtering using two-layer architecture.
@@ -904,96 +4457,323 @@ def filter_recipes():
         - taste: Comma-separated list of taste profiles
         - cuisine: Cuisine type (partial matching)
         - difficulty: Difficulty level (partial matching)
+        - limit: Page size (default 20)
+        - cursor: next_cursor from the previous page
+        - explain: If 1, include the filter plan in the response
         
     Two-Layer Filtering:
-        Layer 1 (Database): SQL filters for performance on time, cuisine, difficulty
-        Layer 2 (Strategy Pattern): Complex logic for tools, ingredients, taste
+        Layer 1 (Database): Every strategy with a SQL compilation is pushed down,
+            including EXISTS subqueries on the normalized term tables for tools, ingredients, taste
+        Layer 2 (Strategy Pattern): Only the criteria left in memory, cheapest and most
+            selective first; pages are refilled so rejected rows do not shorten them
         
     Returns:
-        200: Filtered list of recipes
+        200: Page of filtered recipes with next_cursor and has_more (and plan with explain=1)
+        400: Invalid limit or cursor
         500: Database error (returns empty list)
         
     Example:
         /api/v1/recipes/filter?time=30&cuisine=Italian&ingredients=chicken,pasta
     """
+    limit, after = get_page_args(cursor_shape=ID_CURSOR)
     try:
         # Extract and normalize query parameters
-        criteria: Dict[str, Any] = {}
-        for param in ["time", "tools", "ingredients", "taste", "cuisine", "difficulty"]:
-            value = request.args.get(param)
-            if value:
-                criteria[param] = value
+        criteria = get_filter_criteria()
 
         # Layer 1: Database-level SQL filtering for performance
         # These filters can use database indexes and are very fast
-        query = Recipe.query
-        
-        if "time" in criteria and str(criteria["time"]).isdigit():
-            # Numeric comparison for cooking time
-            query = query.filter(Recipe.time <= int(criteria["time"]))
-            
-        if "cuisine" in criteria:
-            # Case-insensitive partial matching for cuisine
-            query = query.filter(Recipe.cuisine.ilike(f"%{criteria['cuisine']}%"))
-            
-        if "difficulty" in criteria:
-            # Case-insensitive partial matching for difficulty
-            query = query.filter(Recipe.difficulty.ilike(f"%{criteria['difficulty']}%"))
+        plan = FilterPlan(criteria)
+        stmt = plan.apply_sql(select_recipe_records())
 
-        # Execute database query to get preliminary results
-        preliminary = query.all()
+        # Layer 2: Strategy Pattern filtering of the residual criteria, if any
+        def keep(rows):
+            kept = plan.apply(rows) if plan.residual.strategies else rows
+            metrics.record_filter_rows(len(rows), len(kept))
+            return kept
 
-        # Layer 2: Strategy Pattern filtering for complex application logic
-        # Handles JSON array fields and complex matching logic
-        engine = FilterEngine(criteria)
-        filtered = engine.apply(preliminary)
+        filtered, next_cursor = keyset_page(stmt, Recipe.id, after, limit, keep=keep)
 
-        return jsonify({"recipes": [r.to_dict() for r in filtered]})
+        fields = {"next_cursor": next_cursor, "has_more": next_cursor is not None}
+        if request.args.get("explain") == "1":
+            fields["plan"] = plan.explain()
+        return recipe_page_response("recipes", filtered, **fields)
         
     except Exception as e:
         # Graceful degradation: return empty list on any error
-        return jsonify({"recipes": []})
+        return uncacheable(jsonify({"recipes": [], "next_cursor": None, "has_more": False}))
 
 
 @app.get("/api/v1/recipes/search")
 @jwt_required(optional=True)
+@conditional_get
 def search_recipes():
     """
-    Search recipes by name using fuzzy matching.
+    Full-text recipe search ranked by relevance (BM25).
     
     Authentication: Optional
     
     Query Parameters:
-        - query: Search term for recipe name (required)
+        - query: Search terms matched against name, description, ingredients
+          and cuisine; word prefixes match too ("carb" finds "carbonara"), and
+          misspellings when few recipes match ("carbonra") (required)
+        - limit: Page size (default 20)
+        - cursor: next_cursor from the previous page
         
     Returns:
-        200: List of matching recipes
-        400: Missing query parameter
+        200: Page of matching recipes, best match first, with next_cursor and has_more
+        400: Missing query parameter, invalid limit or cursor
         500: Database error (returns empty list)
         
     Example:
         /api/v1/recipes/search?query=chicken curry
     """
+    limit, after = get_page_args(cursor_shape=SCORE_CURSOR)
     try:
         query_str = request.args.get("query", "").strip()
         if not query_str:
             abort(400, description="Query parameter is required")
 
-        # Case-insensitive partial matching on recipe name
-        results = Recipe.query.filter(Recipe.name.ilike(f"%{query_str}%")).all()
-        return jsonify({"recipes": [r.to_dict() for r in results]})
+        # Rank in the in-memory index, then load only this page's rows
+        recipe_search_index.ensure_built()
+        ranked = recipe_search_index.search(query_str, after=tuple(after) if after else None, limit=limit + 1)
+        page = ranked[:limit]
+        next_cursor = encode_cursor(list(page[-1])) if len(ranked) > limit else None
+        records = load_recipe_records(select_recipe_records().where(Recipe.id.in_([rid for _, rid in page])))
+        by_id = {r.id: r for r in records}
+        results = [by_id[rid] for _, rid in page if rid in by_id]
+        return recipe_page_response(
+            "recipes", results, next_cursor=next_cursor, has_more=next_cursor is not None
+        )
         
     except Exception as e:
         if "query parameter is required" in str(e):
             raise  # Re-raise validation errors (400 status)
         # Graceful degradation: return empty list on database errors
-        return jsonify({"recipes": []})
+        return uncacheable(jsonify({"recipes": [], "next_cursor": None, "has_more": False}))
+
+
+@app.get("/api/v1/recipes/facets")
+@jwt_required(optional=True)
+@conditional_get
+def recipe_facets():
+    """
+    Result counts per filter option, for the recipes matching the given filters.
+    
+    Authentication: Optional
+    
+    Query Parameters (all optional):
+        - time, tools, ingredients, taste, cuisine, difficulty: As in filter_recipes
+        
+    Each count is the number of matching recipes having that value, so adding
+    that option as a new filter would return that many recipes. All facets
+    are counted together, whatever the number of options (see facet_counts).
+    
+    Returns:
+        200: total, and facets with cuisine, difficulty, tools and taste lists of
+            {value, count} (most frequent first, at most FACET_VALUES_MAX) and a
+            time list of {max, count} (recipes ready within max minutes)
+        500: Database error (returns empty facets)
+        
+    Example:
+        /api/v1/recipes/facets?ingredients=chicken&time=45
+    """
+    try:
+        counts = facet_counts(get_filter_criteria())
+        values_max = app.config["FACET_VALUES_MAX"]
+        facets: Dict[str, Any] = {}
+        for field in FACET_VALUE_FIELDS + FACET_TERM_FIELDS:
+            ranked = sorted(counts[field].items(), key=lambda item: (-item[1], item[0]))[:values_max]
+            facets[field] = [{"value": value, "count": count} for value, count in ranked]
+        facets["time"] = [
+            {"max": edge, "count": count} for edge, count in zip(app.config["FACET_TIME_BUCKETS"], counts["time"])
+        ]
+        return jsonify({"total": counts["total"], "facets": facets})
+
+    except Exception as e:
+        # Graceful degradation: return empty facets on database errors
+        return uncacheable(jsonify({"total": 0, "facets": {}}))
+
+
+@app.get("/api/v1/recipes/autocomplete")
+@jwt_required(optional=True)
+def autocomplete_recipes():
+    """
+    Typeahead completions for recipe names, ingredients and cuisines.
+    
+    Authentication: Optional
+    
+    Answered from the in-memory AutocompleteIndex with a single primary-key
+    read once it is built (see sync_catalog): matches are a bisected slice of
+    a sorted key array, and the top results per prefix are cached. No catalog ETag: the
+    ranking also moves with every favorite.
+    
+    Query Parameters:
+        - q: Typed prefix, matched against the start of any word (required)
+        - limit: Number of completions (default 10, capped at AUTOCOMPLETE_LIMIT_MAX)
+        
+    Returns:
+        200: Completions, most popular (favorited) first, each with text, type
+            (recipe, ingredient or cuisine), popularity, and id (recipes) or
+            recipes (number of recipes, for ingredients and cuisines)
+        400: Missing q or invalid limit
+        500: Database error (returns empty list)
+        
+    Example:
+        /api/v1/recipes/autocomplete?q=chi&limit=5
+    """
+    limit, _ = get_page_args(default_limit=10)
+    prefix = request.args.get("q", "")
+    if not prefix.strip():
+        abort(400, description="Query parameter q is required")
+    try:
+        sync_catalog()
+        autocomplete_index.ensure_built()
+        return jsonify({"completions": autocomplete_index.complete(prefix, limit)})
+
+    except Exception as e:
+        # Graceful degradation: return empty list on database errors
+        return uncacheable(jsonify({"completions": []}))
+
+
+PANTRY_SORTS = ("coverage", "missing")
+
+
+@app.get("/api/v1/recipes/pantry")
+@jwt_required(optional=True)
+@conditional_get
+def pantry_recipes():
+    """
+    "Cook with what I have": rank recipes by how much of them a pantry covers.
+    
+    Authentication: Optional
+    
+    A recipe ingredient is covered when a pantry item is part of it ("chick"
+    covers "chicken breast"), as in the ingredients filter. Coverage counts
+    come from the ingredient posting lists of the in-memory term index, so only
+    recipes sharing at least one ingredient with the pantry are scored, and
+    the best limit are selected with a heap.
+    
+    Query Parameters:
+        - ingredients: Comma-separated pantry items (required)
+        - sort: "coverage" (default: highest covered share first) or
+          "missing" (fewest missing ingredients first)
+        - limit: Number of recipes (top-K, default 20, not paginated)
+        
+    Returns:
+        200: Recipes with coverage (0-1), missing_count and missing_ingredients
+            (distinct, lowercased)
+        400: Missing ingredients, invalid sort or limit
+        500: Database error (returns empty list)
+        
+    Example:
+        /api/v1/recipes/pantry?ingredients=egg,pasta,bacon,cheese&sort=missing
+    """
+    limit, _ = get_page_args()
+    pantry = [i.strip().lower() for i in request.args.get("ingredients", "").split(",") if i.strip()]
+    if not pantry:
+        abort(400, description="Ingredients parameter is required")
+    sort = request.args.get("sort", "coverage")
+    if sort not in PANTRY_SORTS:
+        abort(400, description=f"Sort must be one of: {', '.join(PANTRY_SORTS)}")
+    try:
+        recipe_index.ensure_built()
+        covered, matched_terms = recipe_index.ingredient_coverage(pantry)
+
+        scored = []
+        for recipe_id, count in covered.items():
+            total = recipe_index.ingredient_count(recipe_id)
+            if total:
+                scored.append((count / total, total - count, recipe_id))
+        if sort == "coverage":
+            # Highest coverage, then fewest missing, then lowest id
+            top = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1], item[2]))
+        else:
+            top = heapq.nsmallest(limit, scored, key=lambda item: (item[1], -item[0], item[2]))
+
+        records = load_recipe_records(select_recipe_records().where(Recipe.id.in_([rid for _, _, rid in top])))
+        by_id = {r.id: r for r in records}
+        results = []
+        for coverage, _, recipe_id in top:
+            recipe = by_id.get(recipe_id)
+            if recipe is None:
+                continue
+            data = recipe.to_dict()
+            # Distinct lowercased ingredients, as indexed, so the count and the list agree
+            ingredients = dict.fromkeys(str(i).lower() for i in data["ingredients"])
+            data["coverage"] = round(coverage, 4)
+            data["missing_ingredients"] = [i for i in ingredients if i not in matched_terms]
+            data["missing_count"] = len(data["missing_ingredients"])
+            results.append(data)
+        return jsonify({"recipes": results})
+
+    except Exception as e:
+        # Graceful degradation: return empty list on database errors
+        return uncacheable(jsonify({"recipes": []}))
 
 
 # ---------------------------------------------------------------------------
 # Favorites Management Routes
 # ---------------------------------------------------------------------------
 
+def add_favorites(user_id: int, recipe_ids: List[int]) -> List[int]:
+    """
+    Favorite every existing recipe in recipe_ids with one INSERT ... SELECT ...
+    ON CONFLICT DO NOTHING; unknown and already favorited ids are skipped.
+    
+    Returns:
+        The recipe ids actually added (caller commits)
+    """
+    rows = select(literal(user_id), Recipe.id).where(Recipe.id.in_(recipe_ids))
+    stmt = (
+        insert_ignore(Favorite)
+        .from_select(["user_id", "recipe_id"], rows)
+        .returning(Favorite.recipe_id)
+    )
+    added = db.session.execute(stmt).scalars().all()
+    if added:
+        update_popularity(added, 1)
+        log_favorites_change(added)
+    return added
+
+
+def remove_favorites(user_id: int, recipe_ids: List[int]) -> List[int]:
+    """
+    Remove recipe_ids from the user's favorites with one DELETE ... WHERE recipe_id IN (...).
+    
+    Returns:
+        The recipe ids actually removed (caller commits)
+    """
+    stmt = (
+        delete(Favorite)
+        .where(Favorite.user_id == user_id, Favorite.recipe_id.in_(recipe_ids))
+        .returning(Favorite.recipe_id)
+    )
+    removed = db.session.execute(stmt).scalars().all()
+    if removed:
+        update_popularity(removed, -1)
+        log_favorites_change(removed)
+    return removed
+
+
+def get_recipe_ids_or_abort() -> List[int]:
+    """
+    Extract and validate the recipe_ids list of a batch favorites request.
+    
+    Raises:
+        400 Bad Request if recipe_ids is missing, not a list of integers,
+        or longer than FAVORITES_BATCH_MAX
+    """
+    recipe_ids = get_json_or_abort(["recipe_ids"])["recipe_ids"]
+    if not isinstance(recipe_ids, list) or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in recipe_ids
+    ):
+        abort(400, description="recipe_ids must be a list of integers")
+    if len(recipe_ids) > app.config["FAVORITES_BATCH_MAX"]:
+        abort(400, description=f"At most {app.config['FAVORITES_BATCH_MAX']} recipe_ids per request")
+    # Deduplicate, keeping request order
+    return list(dict.fromkeys(recipe_ids))
+
+
 @app.get("/api/v1/favorites")
 @jwt_required()
 def get_favorites():
@@ -1004,26 +4784,36 @@ def get_favorites():
     
     Headers:
         Authorization: Bearer <JWT token>
+    
+    Query Parameters (all optional):
+        - limit: Page size (default 20)
+        - cursor: next_cursor from the previous page
         
     Returns:
-        200: List of user's favorite recipes
+        200: Page of user's favorite recipes with next_cursor and has_more
+        400: Invalid limit or cursor
         401: Invalid or missing token
         500: Database error
     """
     user_id = get_jwt_identity()
+    limit, after = get_page_args(cursor_shape=ID_CURSOR)
     
     try:
-        # Join favorites with recipes to get complete recipe data
-        favs = (
-            Favorite.query.filter_by(user_id=user_id)
-            .join(Recipe)
-            .all()
+        # Load the favorite recipes themselves in one joined query (no lazy
+        # per-favorite loads); seeks on the (user_id, recipe_id) unique index
+        stmt = (
+            select_recipe_records()
+            .join(Favorite, Favorite.recipe_id == Recipe.id)
+            .where(Favorite.user_id == user_id)
+        )
+        recipes, next_cursor = keyset_page(stmt, Recipe.id, after, limit)
+        return recipe_page_response(
+            "favorites", recipes, next_cursor=next_cursor, has_more=next_cursor is not None
         )
-        return jsonify({"favorites": [f.recipe.to_dict() for f in favs]})
         
     except Exception as e:
         # Graceful degradation for database errors
-        return jsonify({"favorites": []})
+        return jsonify({"favorites": [], "next_cursor": None, "has_more": False})
 
 
 @app.post("/api/v1/favorites")
@@ -1049,18 +4839,20 @@ def add_favorite():
     """
     data = get_json_or_abort(["recipe_id"])
     user_id = get_jwt_identity()
+    try:
+        recipe_id = int(data["recipe_id"])
+    except (TypeError, ValueError):
+        abort(404)
 
-    # Verify recipe exists
-    Recipe.query.get_or_404(data["recipe_id"])
-
-    # Check if already in favorites (idempotent operation)
-    if Favorite.query.filter_by(user_id=user_id, recipe_id=data["recipe_id"]).first():
-        return jsonify({"message": "Already in favorites"}), 200
-
-    # Add to favorites
-    fav = Favorite(user_id=user_id, recipe_id=data["recipe_id"])
-    db.session.add(fav)
+    # Insert in one statement; it adds nothing if the recipe does not exist
+    # or is already a favorite
+    added = add_favorites(user_id, [recipe_id])
     db.session.commit()
+    if not added:
+        # Verify recipe exists
+        Recipe.query.get_or_404(recipe_id)
+        # Already in favorites (idempotent operation)
+        return jsonify({"message": "Already in favorites"}), 200
 
     return jsonify({
         "message": "Recipe added to favorites", 
@@ -1089,17 +4881,14 @@ def remove_favorite(recipe_id: int):
     """
     user_id = get_jwt_identity()
     
-    # Find the favorite record for this user and recipe
-    fav: Favorite | None = Favorite.query.filter_by(user_id=user_id, recipe_id=recipe_id).first()
-    if not fav:
+    # Remove the favorite record for this user and recipe in one DELETE
+    removed = remove_favorites(user_id, [recipe_id])
+    db.session.commit()
+    if not removed:
         return jsonify({
             "message": "Recipe not found in favorites", 
             "recipe_id": recipe_id
         }), 404
-
-    # Remove from favorites
-    db.session.delete(fav)
-    db.session.commit()
     
     return jsonify({
         "message": "Recipe removed from favorites", 
@@ -1107,6 +4896,64 @@ def remove_favorite(recipe_id: int):
     }), 200
 
 
+@app.post("/api/v1/favorites/batch")
+@jwt_required()
+def add_favorites_batch():
+    """
+    Add many recipes to user's favorites in a single statement.
+    
+    Authentication: Required (JWT token)
+    
+    Request Body:
+        - recipe_ids: List of recipe IDs (at most FAVORITES_BATCH_MAX)
+        
+    Returns:
+        200: added (newly favorited ids) and skipped (already favorited or unknown ids)
+        400: Missing or invalid recipe_ids
+        401: Invalid or missing token
+    """
+    recipe_ids = get_recipe_ids_or_abort()
+    user_id = get_jwt_identity()
+
+    added = add_favorites(user_id, recipe_ids) if recipe_ids else []
+    db.session.commit()
+
+    added_set = set(added)
+    return jsonify({
+        "added": [i for i in recipe_ids if i in added_set],
+        "skipped": [i for i in recipe_ids if i not in added_set],
+    }), 200
+
+
+@app.delete("/api/v1/favorites/batch")
+@jwt_required()
+def remove_favorites_batch():
+    """
+    Remove many recipes from user's favorites in a single statement.
+    
+    Authentication: Required (JWT token)
+    
+    Request Body:
+        - recipe_ids: List of recipe IDs (at most FAVORITES_BATCH_MAX)
+        
+    Returns:
+        200: removed (ids removed) and skipped (ids not in favorites)
+        400: Missing or invalid recipe_ids
+        401: Invalid or missing token
+    """
+    recipe_ids = get_recipe_ids_or_abort()
+    user_id = get_jwt_identity()
+
+    removed = remove_favorites(user_id, recipe_ids) if recipe_ids else []
+    db.session.commit()
+
+    removed_set = set(removed)
+    return jsonify({
+        "removed": [i for i in recipe_ids if i in removed_set],
+        "skipped": [i for i in recipe_ids if i not in removed_set],
+    }), 200
+
+
 # ---------------------------------------------------------------------------
 # Error Handlers
 # ---------------------------------------------------------------------------
@@ -1116,6 +4963,7 @@ def remove_favorite(recipe_id: int):
 @app.errorhandler(404)
 @app.errorhandler(409)
 @app.errorhandler(500)
+@app.errorhandler(503)
 def error_handler(error):
     """
     Global error handler for consistent error responses.
@@ -1124,7 +4972,10 @@ def error_handler(error):
     status codes and error messages.
     """
     code = getattr(error, "code", 500)
-    return jsonify({"message": str(error)}), code
+    response = jsonify({"message": str(error)})
+    if getattr(error, "retry_after", None) is not None:
+        response.headers["Retry-After"] = str(error.retry_after)
+    return response, code
 
 
 # ---------------------------------------------------------------------------
@@ -1141,33 +4992,77 @@ def init_db_command():
     Creates tables and loads sample data if database is empty.
     This is an alternative to the /api/v1/admin/init-db endpoint.
     """
-    # Create all tables
-    db.create_all()
+    # Create all tables and bring older schemas up to date
+    upgrade_schema()
     
     # Add sample recipes if none exist
     if Recipe.query.count() == 0:
-        # Load sample recipes from JSON file
-        with open('sample_recipes.json', 'r') as f:
-            sample_data = json.load(f)
-            
-        for data in sample_data:
-            recipe = Recipe(
-                name=data["name"],
-                description=data["description"],
-                image_url=data["image_url"],
-                time=data["time"],
-                cuisine=data["cuisine"],
-                difficulty=data["difficulty"],
-                tools=json.dumps(data["tools"]),        # Convert arrays to JSON strings
-                ingredients=json.dumps(data["ingredients"]),
-                taste=json.dumps(data["taste"])
-            )
-            db.session.add(recipe)
-        
-        db.session.commit()
+        # Stream sample recipes from JSON file in batches
+        load_sample_recipes()
         print("Database initialized with sample data!")
 
 
+@app.cli.command("import-recipes")
+@click.argument("source", type=click.File("rb"))
+@click.option("--batch-size", type=click.IntRange(min=1), default=None,
+              help="Rows per multi-row INSERT (default IMPORT_BATCH_SIZE).")
+def import_recipes_command(source, batch_size):
+    """
+    Flask CLI command for streaming bulk recipe import.
+    
+    Usage: flask import-recipes recipes.ndjson [--batch-size 5000]
+           cat feed.json | flask import-recipes -
+    
+    Accepts NDJSON or a JSON array and prints one progress event per line.
+    """
+    batch_size = batch_size or app.config["IMPORT_BATCH_SIZE"]
+    for progress in import_recipes(iter_json_records(source), batch_size):
+        click.echo(json.dumps(progress))
+
+
+@app.cli.command("export-recipes")
+@click.option("--format", "fmt", type=click.Choice(list(EXPORT_FORMATS)), default="ndjson", show_default=True)
+@click.option("--output", type=click.File("w"), default="-", help="Destination file (default stdout).")
+@click.option("--favorites", is_flag=True, help="Include a favorite_count column.")
+@click.option("--filter", "filters", multiple=True, metavar="KEY=VALUE",
+              help="Filter criteria as accepted by /api/v1/recipes/filter, e.g. time=30.")
+def export_recipes_command(fmt, output, favorites, filters):
+    """
+    Flask CLI command streaming the recipe catalog as NDJSON or CSV.
+    
+    Usage: flask export-recipes --format csv --output recipes.csv --favorites --filter cuisine=Italian
+    """
+    criteria: Dict[str, Any] = {}
+    for item in filters:
+        key, _, value = item.partition("=")
+        if key not in FILTER_PARAMS or not value:
+            raise click.BadParameter(f"Expected KEY=VALUE with KEY in {', '.join(FILTER_PARAMS)}", param_hint="--filter")
+        criteria[key] = value
+    for chunk in export_recipes(criteria, fmt, favorites):
+        output.write(chunk)
+
+
+@app.cli.command("build-recommendations")
+def build_recommendations_command():
+    """
+    Flask CLI command recomputing the recommendation tables (run periodically).
+    
+    Usage: flask build-recommendations
+    """
+    print(json.dumps(build_recommendations()))
+
+
+@app.cli.command("upgrade-db")
+def upgrade_db_command():
+    """
+    Flask CLI command to migrate an existing database to the current schema.
+    
+    Usage: flask upgrade-db
+    """
+    upgrade_schema()
+    print("Database schema is up to date!")
+
+
 # ---------------------------------------------------------------------------
 # Application Entrypoint
 # ---------------------------------------------------------------------------
@@ -1182,7 +5077,7 @@ if __name__ == "__main__":
     with app.app_context():
         # Only create tables, don't force sample data initialization
         try:
-            db.create_all()
+            upgrade_schema()
         except Exception as e:
             print(f"Note: Could not initialize database tables: {e}")
     
@@ -0,0 +1,440 @@
+"""
+Chef de Cuisine - ASGI Serving Mode
+
+Async read path for the hottest catalog endpoints, served next to the Flask
+application. The read endpoints below run on the event loop with async
+SQLAlchemy sessions (asyncpg for PostgreSQL, aiosqlite for SQLite), so an
+in-flight query no longer pins a worker thread; every other route is
+forwarded to the unchanged Flask app.
+
+Async endpoints (identical JSON contracts, ETags and compression to app.py):
+    GET /api/v1/recipes
+    GET /api/v1/recipes/<id>
+    GET /api/v1/recipes/filter
+    GET /api/v1/recipes/search
+    GET /api/v1/favorites
+
+Usage:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000 --workers 4
+
+Writes still go through Flask and are logged in the shared catalog_state and
+catalog_changes tables; both paths replay them through app.sync_catalog(), so
+in-memory indexes, caches and ETags stay consistent across processes.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from werkzeug.datastructures import Headers
+from werkzeug.exceptions import HTTPException, NotFound
+from werkzeug.http import parse_accept_header, parse_etags
+
+from app import (
+    CATALOG_STATE_QUERY,
+    EMPTY_CATALOG_STATE,
+    Favorite,
+    FilterPlan,
+    ID_CURSOR,
+    Recipe,
+    SCORE_CURSOR,
+    _identity_from_header,
+    app,
+    catalog_etag,
+    catalog_version,
+    encode_cursor,
+    encode_recipe_page,
+    favorited_among_query,
+    get_filter_criteria,
+    get_page_args,
+    get_recommendation_cursor,
+    metrics,
+    negotiate_compression,
+    not_favorited_by,
+    rank_recommendations,
+    recipe_search_index,
+    recommendation_neighbors_query,
+    recommendation_popular_query,
+    recommendation_seeds_query,
+    sync_catalog,
+)
+
+# ---------------------------------------------------------------------------
+# Async Database Configuration
+# ---------------------------------------------------------------------------
+
+# Sync driver URL prefixes mapped to their async counterparts
+ASYNC_DRIVERS = {
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "postgresql://": "postgresql+asyncpg://",
+    "sqlite:///": "sqlite+aiosqlite:///",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Derive the async driver URL from the Flask app's database URL (ASYNC_DATABASE_URL overrides)."""
+    if os.getenv("ASYNC_DATABASE_URL"):
+        return os.getenv("ASYNC_DATABASE_URL")
+    for sync_prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# Engine and session factory are created per process on startup, never inherited
+engine: Optional[AsyncEngine] = None
+Session: Optional[async_sessionmaker] = None
+
+recipes_table = Recipe.__table__
+
+# Response payload: a dict, or a JSON body already encoded by encode_recipe_page
+Payload = Union[Dict[str, Any], bytes]
+
+
+async def startup() -> None:
+    """Create the async engine with the same pool settings as the Flask app."""
+    global engine, Session
+    engine = create_async_engine(
+        async_database_url(app.config["SQLALCHEMY_DATABASE_URI"]),
+        **app.config["SQLALCHEMY_ENGINE_OPTIONS"],
+    )
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def shutdown() -> None:
+    """Close every pooled connection."""
+    if engine is not None:
+        await engine.dispose()
+
+
+def in_app_context(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn inside a Flask app context (for helpers using the sync db.session)."""
+    with app.app_context():
+        return fn(*args)
+
+
+async def run_sync(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run blocking work (index builds, snapshot rebuilds) on a thread, off the event loop."""
+    return await asyncio.to_thread(in_app_context, fn, *args)
+
+
+async def sync_catalog_async() -> None:
+    """Async counterpart of app.sync_catalog: the state read stays on the loop, replays run on a thread."""
+    async with Session() as session:
+        state = (await session.execute(CATALOG_STATE_QUERY)).one_or_none() or EMPTY_CATALOG_STATE
+    if not catalog_version.current(state):
+        await run_sync(sync_catalog, state)
+
+
+# ---------------------------------------------------------------------------
+# Responses
+# ---------------------------------------------------------------------------
+
+def cache_control(private: bool) -> str:
+    """Cache-Control of cacheable responses (private when they depend on the caller, see app.conditional_get)."""
+    scope = "private" if private else "public"
+    return f"{scope}, max-age={app.config['HTTP_CACHE_MAX_AGE']}, must-revalidate"
+
+
+def json_response(request: Request, payload: Payload, status: int = 200,
+                  etag: Optional[str] = None, no_store: bool = False,
+                  vary_authorization: bool = False) -> Response:
+    """
+    Encode payload exactly as Flask's jsonify and apply the same headers as
+    conditional_get/compress_response/uncacheable in app.py.
+    """
+    body = payload if isinstance(payload, bytes) else app.json.response(payload).get_data()
+    headers = Headers()
+    if vary_authorization and etag is not None:
+        headers["Vary"] = "Authorization"
+    if no_store:
+        headers["Cache-Control"] = "no-store"
+    elif etag is not None:
+        headers["Cache-Control"] = cache_control(private=vary_authorization)
+
+    if status == 200:
+        headers["Vary"] = ", ".join(filter(None, [headers.get("Vary"), "Accept-Encoding"]))
+        accepted = parse_accept_header(request.headers.get("accept-encoding"))
+        compressed = negotiate_compression(body, accepted)
+        if compressed is not None:
+            encoding, body = compressed
+            headers["Content-Encoding"] = encoding
+            if etag is not None:
+                # Strong ETags must differ between content codings
+                etag = f"{etag}-{encoding}"
+    if etag is not None and not no_store:
+        headers["ETag"] = f'"{etag}"'
+    return Response(body, status_code=status, headers=dict(headers), media_type="application/json")
+
+
+def error_response(request: Request, error: HTTPException) -> Response:
+    """Same body as the Flask error_handler."""
+    return json_response(request, {"message": str(error)}, status=error.code or 500)
+
+
+def full_path(request: Request) -> str:
+    """Equivalent of Flask's request.full_path (always carries the '?')."""
+    return f"{request.url.path}?{request.scope.get('query_string', b'').decode('latin1')}"
+
+
+def conditional_get(view: Optional[Callable[[Request], Awaitable[Tuple[Payload, bool]]]] = None, *,
+                    vary: Optional[Callable[[Request], str]] = None):
+    """
+    Async counterpart of app.conditional_get: answer If-None-Match with 304
+    before the view runs. Views return (payload, cacheable).
+    """
+    if view is None:
+        return lambda view: conditional_get(view, vary=vary)
+
+    async def endpoint(request: Request) -> Response:
+        await sync_catalog_async()
+        digest, variants = catalog_etag(full_path(request), vary(request) if vary else None)
+        if_none_match = parse_etags(request.headers.get("if-none-match"))
+        matched = next((etag for etag in variants if etag in if_none_match), None)
+        if matched is not None:
+            headers = {
+                "ETag": f'"{matched}"',
+                "Cache-Control": cache_control(private=vary is not None),
+            }
+            if vary is not None:
+                headers["Vary"] = "Authorization"
+            return Response(status_code=304, headers=headers)
+        try:
+            payload, cacheable = await view(request)
+        except HTTPException as e:
+            return error_response(request, e)
+        return json_response(request, payload, etag=digest if cacheable else None, no_store=not cacheable,
+                             vary_authorization=vary is not None)
+    return endpoint
+
+
+class RecipeNotFound(NotFound):
+    """404 with the body of app.get_recipe ({"message": "Recipe not found"})."""
+
+    def __str__(self) -> str:
+        return "Recipe not found"
+
+
+def empty_page(key: str = "recipes") -> Tuple[Dict[str, Any], bool]:
+    """Graceful degradation result: empty, uncacheable page."""
+    return {key: [], "next_cursor": None, "has_more": False}, False
+
+
+async def keyset_page(session: AsyncSession, stmt: Any, column: Any, after: Optional[List[Any]], limit: int,
+                      keep: Optional[Callable[[List[Any]], List[Any]]] = None) -> Tuple[List[Any], Optional[str]]:
+    """Async counterpart of app.keyset_page (same seek, look-ahead row and page refill)."""
+    last = after[0] if after else None
+    page: List[Any] = []
+    while True:
+        batch_stmt = stmt if last is None else stmt.where(column > last)
+        rows = (await session.execute(batch_stmt.order_by(column).limit(limit + 1))).all()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        page.extend(await run_sync(keep, rows) if keep else rows)
+        if len(page) > limit or (more and len(page) == limit):
+            page = page[:limit]
+            return page, encode_cursor([getattr(page[-1], column.key)])
+        if not more:
+            return page, None
+        last = getattr(rows[-1], column.key)
+
+
+async def recommended_recipe_ids(session: AsyncSession, user_id: Optional[int]) -> List[int]:
+    """Async counterpart of app.recommended_recipe_ids (same bounded queries)."""
+    seeds: List[int] = []
+    if user_id is not None:
+        seeds = (await session.execute(recommendation_seeds_query(user_id))).scalars().all()
+    neighbors = (await session.execute(recommendation_neighbors_query(seeds))).all() if seeds else []
+    popular = (await session.execute(recommendation_popular_query(len(seeds)))).scalars().all()
+    candidates = {neighbor_id for neighbor_id, _ in neighbors} | set(popular)
+    favorited: List[int] = []
+    if user_id is not None and candidates:
+        favorited = (await session.execute(favorited_among_query(user_id, candidates))).scalars().all()
+    return rank_recommendations(seeds, neighbors, popular, favorited)
+
+
+async def recommendations_page(session: AsyncSession, ranked: List[int], after: Optional[List[Any]],
+                               limit: int, user_id: Optional[int] = None) -> Tuple[List[Any], Optional[str]]:
+    """Async counterpart of app.recommendations_page."""
+    offset, catalog_after = get_recommendation_cursor(after)
+    page: List[Any] = []
+    if offset is not None:
+        ids = ranked[offset:offset + limit]
+        rows = (await session.execute(select(recipes_table).where(recipes_table.c.id.in_(ids)))).all() if ids else []
+        by_id = {row.id: row for row in rows}
+        page = [by_id[rid] for rid in ids if rid in by_id]
+        if offset + limit < len(ranked):
+            return page, encode_cursor(["rank", offset + limit])
+
+    stmt = select(recipes_table).where(not_favorited_by(user_id, recipes_table.c.id))
+    if ranked:
+        # The ranked list is bounded by RECOMMENDATION_LIMIT
+        stmt = stmt.where(recipes_table.c.id.not_in(ranked))
+    if offset is not None and len(page) >= limit:
+        rest = (await session.execute(stmt.limit(1))).all()
+        return page, encode_cursor(["rank", len(ranked)]) if rest else None
+    rest, next_cursor = await keyset_page(session, stmt, recipes_table.c.id, catalog_after, limit - len(page))
+    return page + rest, next_cursor
+
+
+def recommendations_etag_key(request: Request) -> str:
+    """Async counterpart of app.recommendations_etag_key."""
+    return f"{catalog_version.favorites_token()}|{_identity_from_header(request.headers.get('authorization'))}"
+
+
+def page_payload(key: str, rows: List[Any], next_cursor: Optional[str], **fields: Any) -> bytes:
+    return encode_recipe_page(key, rows, next_cursor=next_cursor, has_more=next_cursor is not None, **fields)
+
+
+# ---------------------------------------------------------------------------
+# Async Read Routes
+# ---------------------------------------------------------------------------
+
+@conditional_get(vary=recommendations_etag_key)
+async def get_recipes(request: Request) -> Tuple[Payload, bool]:
+    """GET /api/v1/recipes (see app.get_recipes)."""
+    limit, after = get_page_args(args=request.query_params)
+    get_recommendation_cursor(after)
+    try:
+        user_id = _identity_from_header(request.headers.get("authorization"))
+        async with Session() as session:
+            ranked = await recommended_recipe_ids(session, user_id)
+            rows, next_cursor = await recommendations_page(session, ranked, after, limit, user_id)
+        return page_payload("recipes", rows, next_cursor), True
+    except Exception:
+        return empty_page()
+
+
+@conditional_get
+async def get_recipe(request: Request) -> Tuple[Payload, bool]:
+    """GET /api/v1/recipes/<id> (see app.get_recipe)."""
+    try:
+        async with Session() as session:
+            row = (await session.execute(
+                select(recipes_table).where(recipes_table.c.id == request.path_params["recipe_id"])
+            )).first()
+    except Exception:
+        row = None
+    if row is None:
+        raise RecipeNotFound()
+    return Recipe.cached_json(row) + b"\n", True
+
+
+@conditional_get
+async def filter_recipes(request: Request) -> Tuple[Payload, bool]:
+    """GET /api/v1/recipes/filter (see app.filter_recipes)."""
+    limit, after = get_page_args(args=request.query_params, cursor_shape=ID_CURSOR)
+    try:
+        plan = FilterPlan(get_filter_criteria(request.query_params))
+        stmt = plan.apply_sql(select(recipes_table))
+        residual = bool(plan.residual.strategies)
+
+        def keep(batch):
+            kept = plan.apply(batch)
+            metrics.record_filter_rows(len(batch), len(kept))
+            return kept
+
+        async with Session() as session:
+            rows, next_cursor = await keyset_page(session, stmt, recipes_table.c.id, after, limit,
+                                                  keep=keep if residual else None)
+        if not residual:
+            # Single batch, every fetched row kept (no thread hop just to count it)
+            metrics.record_filter_rows(len(rows), len(rows))
+        fields = {}
+        if request.query_params.get("explain") == "1":
+            fields["plan"] = await run_sync(plan.explain)
+        return page_payload("recipes", rows, next_cursor, **fields), True
+    except Exception:
+        return empty_page()
+
+
+@conditional_get
+async def search_recipes(request: Request) -> Tuple[Payload, bool]:
+    """GET /api/v1/recipes/search (see app.search_recipes)."""
+    limit, after = get_page_args(args=request.query_params, cursor_shape=SCORE_CURSOR)
+    query_str = request.query_params.get("query", "").strip()
+    try:
+        if not query_str:
+            # The Flask view answers a missing query with an empty page as well
+            return empty_page()
+        if not recipe_search_index.built:
+            await run_sync(recipe_search_index.ensure_built)
+        ranked = recipe_search_index.search(query_str, after=tuple(after) if after else None, limit=limit + 1)
+        page = ranked[:limit]
+        next_cursor = encode_cursor(list(page[-1])) if len(ranked) > limit else None
+        async with Session() as session:
+            rows = (await session.execute(
+                select(recipes_table).where(recipes_table.c.id.in_([rid for _, rid in page]))
+            )).all()
+        by_id = {row.id: row for row in rows}
+        results = [by_id[rid] for _, rid in page if rid in by_id]
+        return page_payload("recipes", results, next_cursor), True
+    except Exception:
+        return empty_page()
+
+
+async def get_favorites(request: Request) -> Response:
+    """GET /api/v1/favorites (see app.get_favorites)."""
+    user_id = _identity_from_header(request.headers.get("authorization"))
+    if user_id is None:
+        return json_response(request, {"message": "Token missing or invalid"}, status=401)
+    try:
+        limit, after = get_page_args(args=request.query_params, cursor_shape=ID_CURSOR)
+    except HTTPException as e:
+        return error_response(request, e)
+    try:
+        stmt = (
+            select(recipes_table)
+            .join(Favorite.__table__, Favorite.__table__.c.recipe_id == recipes_table.c.id)
+            .where(Favorite.__table__.c.user_id == user_id)
+        )
+        async with Session() as session:
+            rows, next_cursor = await keyset_page(session, stmt, recipes_table.c.id, after, limit)
+        return json_response(request, page_payload("favorites", rows, next_cursor))
+    except Exception:
+        return json_response(request, {"favorites": [], "next_cursor": None, "has_more": False})
+
+
+# ---------------------------------------------------------------------------
+# ASGI Application
+# ---------------------------------------------------------------------------
+
+@asynccontextmanager
+async def lifespan(_: Starlette):
+    await startup()
+    yield
+    await shutdown()
+
+
+routes = [
+    Route("/api/v1/recipes", get_recipes, methods=["GET"]),
+    Route("/api/v1/recipes/filter", filter_recipes, methods=["GET"]),
+    Route("/api/v1/recipes/search", search_recipes, methods=["GET"]),
+    Route("/api/v1/recipes/{recipe_id:int}", get_recipe, methods=["GET"]),
+    Route("/api/v1/favorites", get_favorites, methods=["GET"]),
+    # Everything else (writes, auth, admin) is served by the Flask app
+    Mount("/", app=WSGIMiddleware(app)),
+]
+
+# Same CORS policy as the Flask app
+middleware = [
+    Middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_headers=["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With"],
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        expose_headers=["Content-Type", "Authorization"],
+    ),
+]
+
+application = Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
@@ -0,0 +1,102 @@
+"""
+Synthetic recipe catalogs for benchmarking.
+
+Recipes follow the shape of sample_recipes.json: the same fields, list
+lengths drawn from the sample recipes, and tools, ingredients, tastes,
+cuisines and difficulties drawn from the sample vocabularies. Larger
+catalogs get a larger vocabulary (numbered variants of the sample terms),
+sampled with a Zipf-like skew so a few terms are common and most are rare,
+as in real catalogs. Generation is deterministic for a given seed.
+"""
+
+import json
+import os
+import random
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Sequence
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_recipes.json")
+
+
+class CatalogGenerator:
+    """Generates recipe dicts accepted by POST /api/v1/recipes and the bulk importer."""
+
+    def __init__(self, seed: int = 42, sample_path: str = SAMPLE_PATH):
+        with open(sample_path) as f:
+            self.samples: List[Dict[str, Any]] = json.load(f)
+        self.seed = seed
+
+        self.names = [r["name"] for r in self.samples]
+        self.descriptions = [r.get("description", "") for r in self.samples]
+        self.images = [r.get("image_url", "") for r in self.samples]
+        self.times = [r["time"] for r in self.samples if r.get("time")]
+        self.cuisines = sorted({r["cuisine"] for r in self.samples if r.get("cuisine")})
+        self.difficulties = sorted({r["difficulty"] for r in self.samples if r.get("difficulty")})
+        self.vocab = {
+            field: sorted({term for r in self.samples for term in r.get(field, [])})
+            for field in ("tools", "ingredients", "taste")
+        }
+        self.lengths = {
+            field: [len(r.get(field, [])) for r in self.samples]
+            for field in ("tools", "ingredients", "taste")
+        }
+
+    @staticmethod
+    def expand(values: Sequence[str], scale: int) -> List[str]:
+        """values plus numbered variants ("pasta 2", "pasta 3", ...), scale times as many in total."""
+        result = list(values)
+        for k in range(2, scale + 1):
+            result.extend(f"{value} {k}" for value in values)
+        return result
+
+    @staticmethod
+    def _zipf_cum_weights(n: int) -> List[float]:
+        """Cumulative 1/rank weights, for O(log n) random.choices."""
+        return list(accumulate(1.0 / (rank + 1) for rank in range(n)))
+
+    def generate(self, n: int) -> Iterator[Dict[str, Any]]:
+        """Yield n synthetic recipes."""
+        rng = random.Random(self.seed)
+        # Vocabulary grows with the square root of the catalog size
+        scale = max(1, int(n ** 0.5) // 10)
+        vocab = {field: self.expand(terms, scale) for field, terms in self.vocab.items()}
+        weights = {field: self._zipf_cum_weights(len(terms)) for field, terms in vocab.items()}
+        cuisines = self.expand(self.cuisines, scale)
+        cuisine_weights = self._zipf_cum_weights(len(cuisines))
+
+        for i in range(n):
+            base = rng.randrange(len(self.samples))
+            recipe: Dict[str, Any] = {
+                "name": f"{self.names[base]} {i}",
+                "description": self.descriptions[base],
+                "image_url": self.images[base],
+                "time": max(5, int(rng.choice(self.times) * rng.uniform(0.5, 1.5))),
+                "cuisine": rng.choices(cuisines, cum_weights=cuisine_weights)[0],
+                "difficulty": rng.choice(self.difficulties),
+            }
+            for field in ("tools", "ingredients", "taste"):
+                count = rng.choice(self.lengths[field])
+                recipe[field] = self._sample(rng, vocab[field], weights[field], count)
+            yield recipe
+
+    @staticmethod
+    def _sample(rng: random.Random, terms: List[str], cum_weights: List[float], count: int) -> List[str]:
+        """count distinct weighted picks from terms."""
+        picked: List[str] = []
+        seen = set()
+        attempts = 0
+        while len(picked) < min(count, len(terms)) and attempts < count * 10:
+            term = rng.choices(terms, cum_weights=cum_weights)[0]
+            attempts += 1
+            if term not in seen:
+                seen.add(term)
+                picked.append(term)
+        return picked
+
+
+if __name__ == "__main__":
+    # python benchmarks/catalog.py 1000 > catalog.ndjson  (for flask import-recipes)
+    import sys
+
+    for recipe in CatalogGenerator().generate(int(sys.argv[1]) if len(sys.argv) > 1 else 1000):
+        sys.stdout.write(json.dumps(recipe) + "\n")
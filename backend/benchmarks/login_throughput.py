@@ -0,0 +1,65 @@
+"""
+Login throughput versus hashing pool size.
+
+Verifies one stored password hash from many concurrent request threads, the
+way the login endpoint does, first inline in the request threads and then
+through PasswordHasher pools of 1..N worker processes. Prints one JSON object
+per configuration with the sustained logins per second.
+
+Usage:
+    python benchmarks/login_throughput.py [--logins 200] [--max-workers 8]
+                                          [--threads 32] [--method pbkdf2:sha256:600000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import PasswordHasher  # noqa: E402
+
+
+def run(hasher: PasswordHasher, password_hash: str, logins: int, threads: int) -> float:
+    """Verify password_hash logins times from a pool of request threads; returns logins/s."""
+    with ThreadPoolExecutor(max_workers=threads) as request_threads:
+        start = time.perf_counter()
+        results = list(request_threads.map(
+            lambda _: hasher.verify(password_hash, "correct horse battery staple"),
+            range(logins),
+        ))
+        elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200, help="Verifications per configuration")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool to try")
+    parser.add_argument("--threads", type=int, default=32, help="Concurrent request threads")
+    parser.add_argument("--method", default="pbkdf2:sha256:600000", help="Werkzeug hash method")
+    args = parser.parse_args()
+
+    for workers in range(0, args.max_workers + 1):
+        hasher = PasswordHasher(args.method, 16, workers, queue_max=args.logins)
+        password_hash = hasher.hash("correct horse battery staple")
+        hasher.verify(password_hash, "warm up")  # start the worker processes
+        rate = run(hasher, password_hash, args.logins, args.threads)
+        hasher.shutdown()
+        print(json.dumps({
+            "benchmark": "login_throughput",
+            "method": args.method,
+            "workers": workers or "inline",
+            "cpu_count": os.cpu_count(),
+            "threads": args.threads,
+            "logins": args.logins,
+            "logins_per_second": round(rate, 2),
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Benchmark suite for the backend.
+
+For each catalog size, loads a synthetic catalog (see catalog.py) into a
+fresh SQLite database through the bulk importer, then runs:
+
+- micro benchmarks: every FilterStrategy.apply, FilterEngine.apply per
+  criteria set, loading ORM instances versus RecipeRecords, Recipe.to_dict
+  (cold and warm cache), and jsonify of a page versus encode_recipe_page
+  (cached fragments)
+- macro benchmarks: the read endpoints through the Flask test client
+
+Results are written as JSON (one entry per benchmark and size) so runs can
+be compared across commits; --compare exits with status 1 when a benchmark
+got slower than the threshold.
+
+Usage:
+    python benchmarks/run.py --sizes 1000,10000 --output results.json
+    python benchmarks/run.py --sizes 1000,10000 --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, ".."))
+
+# The app reads its database URL at import time
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-"), "bench.db")
+
+import app as backend  # noqa: E402
+from catalog import CatalogGenerator  # noqa: E402
+
+# Criteria sets exercised by the filter benchmarks (single filters and a combination)
+CRITERIA = {
+    "time": {"time": "30"},
+    "cuisine": {"cuisine": "ital"},
+    "ingredients": {"ingredients": "chick,egg"},
+    "tools": {"tools": "pan"},
+    "taste": {"taste": "spicy,sweet"},
+    "difficulty": {"difficulty": "easy"},
+    "combined": {"time": "45", "ingredients": "chick", "taste": "spicy", "difficulty": "medium"},
+}
+
+SEARCH_QUERIES = ["chicken", "pasta carbonara", "carb"]
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float = 0.05) -> Dict[str, Any]:
+    """
+    Time fn: calibrate the number of calls per sample so one sample takes at
+    least min_time, then take repeat samples.
+
+    Returns:
+        Per-call seconds (min/median/mean), calls per second and sample shape
+    """
+    fn()  # warm up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    median = statistics.median(samples)
+    return {
+        "min_s": min(samples),
+        "median_s": median,
+        "mean_s": statistics.fmean(samples),
+        "ops_per_s": 1.0 / median if median else None,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def load_catalog(size: int, seed: int) -> float:
+    """Replace the catalog with size synthetic recipes; returns the load time in seconds."""
+    start = time.perf_counter()
+    with backend.app.app_context():
+        backend.db.drop_all()
+        backend.upgrade_schema()
+        records = enumerate(CatalogGenerator(seed).generate(size))
+        for progress in backend.import_recipes(records, batch_size=5000):
+            if "row" in progress:
+                raise RuntimeError(f"Import failed: {progress}")
+    return time.perf_counter() - start
+
+
+def micro_benchmarks(size: int, repeat: int, micro_rows: int) -> List[Dict[str, Any]]:
+    """Strategy, engine, serialization and JSON encoding benchmarks."""
+    results = []
+    with backend.app.app_context():
+        rows = backend.Recipe.query.order_by(backend.Recipe.id).limit(micro_rows).all()
+        page = rows[:20]
+
+        for name, criteria in CRITERIA.items():
+            engine = backend.FilterEngine(criteria)
+            if name != "combined":
+                strategy = engine.strategies[0]
+                results.append({
+                    "name": f"strategy.{name}.apply", "rows": len(rows),
+                    **measure(lambda s=strategy: [s.apply(r) for r in rows], repeat),
+                })
+            results.append({
+                "name": f"filter_engine.{name}.apply", "rows": len(rows),
+                **measure(lambda e=engine: e.apply(rows), repeat),
+            })
+
+        load_limit = min(len(rows), 1000)
+
+        def load_orm():
+            loaded = backend.Recipe.query.order_by(backend.Recipe.id).limit(load_limit).all()
+            backend.db.session.expunge_all()
+            return loaded
+
+        results.append({"name": "load_rows.orm", "rows": load_limit, **measure(load_orm, repeat)})
+        results.append({
+            "name": "load_rows.records", "rows": load_limit,
+            **measure(lambda: backend.load_recipe_records(
+                backend.select_recipe_records().order_by(backend.Recipe.id).limit(load_limit)), repeat),
+        })
+
+        def to_dict_cold():
+            backend.recipe_cache.clear()
+            return [r.to_dict() for r in page]
+
+        results.append({"name": "recipe.to_dict.cold", "rows": len(page), **measure(to_dict_cold, repeat)})
+        results.append({
+            "name": "recipe.to_dict.warm", "rows": len(page),
+            **measure(lambda: [r.to_dict() for r in page], repeat),
+        })
+
+        # Both paths build the same body from the same rows, with warm recipe caches
+        def jsonify_page(page_rows):
+            return backend.jsonify({
+                "recipes": [r.to_dict() for r in page_rows], "next_cursor": "WzIwXQ", "has_more": True,
+            }).get_data()
+
+        def encode_page(page_rows):
+            return backend.encode_recipe_page("recipes", page_rows, next_cursor="WzIwXQ", has_more=True)
+
+        for page_size in (20, 100):
+            page_rows = rows[:page_size]
+            with backend.app.test_request_context():
+                if jsonify_page(page_rows) != encode_page(page_rows):
+                    raise RuntimeError("jsonify and encode_recipe_page bodies differ")
+                results.append({
+                    "name": f"jsonify.page_{page_size}", "rows": len(page_rows),
+                    **measure(lambda r=page_rows: jsonify_page(r), repeat),
+                })
+                results.append({
+                    "name": f"encode_recipe_page.page_{page_size}", "rows": len(page_rows),
+                    **measure(lambda r=page_rows: encode_page(r), repeat),
+                })
+    for result in results:
+        result.update(kind="micro", size=size)
+    return results
+
+
+def macro_benchmarks(size: int, repeat: int) -> List[Dict[str, Any]]:
+    """Read endpoints through the Flask test client (full request cycle, no 304s)."""
+    client = backend.app.test_client()
+    urls = {
+        "GET /api/v1/recipes": "/api/v1/recipes",
+        "GET /api/v1/recipes?limit=100": "/api/v1/recipes?limit=100",
+        "GET /api/v1/recipes/<id>": f"/api/v1/recipes/{max(1, size // 2)}",
+    }
+    for name, criteria in CRITERIA.items():
+        query = "&".join(f"{k}={v}" for k, v in criteria.items())
+        urls[f"GET /api/v1/recipes/filter ({name})"] = f"/api/v1/recipes/filter?{query}"
+    for query in SEARCH_QUERIES:
+        urls[f"GET /api/v1/recipes/search ({query})"] = f"/api/v1/recipes/search?query={query}"
+    urls["GET /api/v1/recipes/pantry"] = "/api/v1/recipes/pantry?ingredients=chick,egg,tomato,garlic,onion"
+    urls["GET /api/v1/recipes/autocomplete (c)"] = "/api/v1/recipes/autocomplete?q=c"
+    urls["GET /api/v1/recipes/autocomplete (chi)"] = "/api/v1/recipes/autocomplete?q=chi"
+    urls["GET /api/v1/recipes/facets"] = "/api/v1/recipes/facets"
+    urls["GET /api/v1/recipes/facets (combined)"] = "/api/v1/recipes/facets?" + "&".join(
+        f"{k}={v}" for k, v in CRITERIA["combined"].items())
+
+    results = []
+    for name, url in urls.items():
+        def request(url=url):
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+            return response
+
+        results.append({"name": name, "kind": "macro", "size": size, **measure(request, repeat)})
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Print median ratios against a previous results file; returns True if anything regressed."""
+    with open(baseline_path) as f:
+        baseline = {(r["name"], r["size"]): r for r in json.load(f)["results"]}
+    regressed = False
+    for result in results:
+        old = baseline.get((result["name"], result["size"]))
+        if old is None:
+            continue
+        ratio = result["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag, regressed = "  REGRESSION", True
+        elif ratio < 1 - threshold:
+            flag = "  improved"
+        print(f"{result['name']:<50} size={result['size']:<8} x{ratio:.2f}{flag}", file=sys.stderr)
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="Comma-separated catalog sizes (1000 up to 5000000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per benchmark")
+    parser.add_argument("--micro-rows", type=int, default=100000,
+                        help="Rows loaded for the micro benchmarks (caps memory on large catalogs)")
+    parser.add_argument("--seed", type=int, default=42, help="Catalog generator seed")
+    parser.add_argument("--only", choices=["micro", "macro"], help="Run one kind of benchmark")
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    load_times = {}
+    for size in (int(s) for s in args.sizes.split(",")):
+        load_times[size] = load_catalog(size, args.seed)
+        print(f"loaded {size} recipes in {load_times[size]:.1f}s", file=sys.stderr)
+        if args.only != "macro":
+            results.extend(micro_benchmarks(size, args.repeat, args.micro_rows))
+        if args.only != "micro":
+            results.extend(macro_benchmarks(size, args.repeat))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": backend.np is not None,
+            "json_provider": type(backend.app.json).__name__,
+            "seed": args.seed,
+            "load_seconds": load_times,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Gunicorn configuration for production serving.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+
+Every setting can be overridden from the environment. The app is preloaded in
+the master and shared copy-on-write by the workers; app.reset_after_fork()
+runs in each forked worker so database connection pools are never shared.
+The in-memory catalog indexes are built in the master before the workers are
+forked (see when_ready) and caught up before every later fork (see pre_fork),
+so no worker, recycled or not, builds them inside a request.
+"""
+
+import glob
+import multiprocessing
+import os
+import tempfile
+
+cpu_count = multiprocessing.cpu_count()
+
+# Listening socket
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Worker model: one process per core, each serving requests from a thread pool
+# (gthread), so requests blocked on the database or the hashing pool do not stall the
+# worker. Every worker ends up holding its own copy of the catalog indexes, so memory,
+# not CPU, bounds the worker count; lower WEB_CONCURRENCY on small-memory hosts.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", str(cpu_count)))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Load the application once in the master before forking workers
+preload_app = True
+
+# Restart workers after max_requests (+ jitter so they do not restart together)
+# to bound memory growth; 0 disables recycling. A recycled worker re-forks from
+# the master's indexes, which pre_fork brings up to date first.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Share the cores between the workers' password hashing pools instead of
+# giving each worker one hashing process per core
+os.environ.setdefault("PASSWORD_HASH_WORKERS", str(max(1, cpu_count // workers)))
+
+# Prometheus multiprocess mode: each worker writes its metrics to this
+# directory and /metrics aggregates them. Must be set before the app (and
+# prometheus_client) is imported.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "chef-prometheus"))
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def when_ready(server):
+    """
+    Build the catalog indexes in the master, once, so every worker inherits
+    them copy-on-write (GUNICORN_WARM_INDEXES=0 leaves them to the first request).
+    """
+    warm_indexes(server)
+
+
+def pre_fork(server, worker):
+    """
+    Catch the master's indexes up before forking a worker (a recycled or
+    crashed one), replaying the change log or rebuilding here rather than in
+    the new worker's first request. A no-op when nothing changed.
+    """
+    warm_indexes(server)
+
+
+def warm_indexes(server):
+    if os.getenv("GUNICORN_WARM_INDEXES", "1") != "1":
+        return
+    import app
+    try:
+        app.warm_catalog_indexes()
+    except Exception as e:
+        # No database yet: workers build the indexes lazily instead
+        server.log.warning("Catalog indexes not warmed: %s", e)
+
+
+def on_starting(server):
+    """Drop samples left over from a previous run of the server."""
+    for path in glob.glob(os.path.join(os.environ["PROMETHEUS_MULTIPROC_DIR"], "*.db")):
+        os.remove(path)
+
+
+def child_exit(server, worker):
+    """Remove the exited worker's in-flight gauges; its counters stay in the totals."""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+# Log to stdout/stderr for the container runtime
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
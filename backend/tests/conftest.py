@@ -0,0 +1,80 @@
+"""
+Shared fixtures for the backend tests.
+
+The app reads its configuration at import time, so the environment is set
+before importing it: a throwaway SQLite database and inline, cheap password
+hashing. Every test starts from empty tables and empty per-process indexes.
+
+Usage:
+    python -m pytest backend/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="chef-tests-"), "test.db")
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+os.environ["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+
+import app as backend  # noqa: E402
+
+
+@pytest.fixture
+def app_context():
+    with backend.app.app_context():
+        backend.db.drop_all()
+        backend.upgrade_schema()
+        backend.sync_catalog()
+        yield backend.app
+        backend.db.session.remove()
+
+
+@pytest.fixture
+def client(app_context):
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization header of a freshly registered user."""
+    client.post("/api/v1/auth/register",
+                json={"username": "cook", "email": "cook@example.com", "password": "pw-123456"})
+    response = client.post("/api/v1/auth/login", json={"username": "cook", "password": "pw-123456"})
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def make_recipe(client):
+    """Create a recipe through the API; returns its id."""
+    def make(name, **fields):
+        response = client.post("/api/v1/recipes", json={"name": name, **fields})
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()["recipe"]["id"]
+    return make
+
+
+@pytest.fixture
+def other_worker(app_context):
+    """
+    Run (method, path, body[, headers]) requests in a separate process on the
+    same database, like another gunicorn worker.
+    """
+    def run(*requests):
+        script = (
+            "import json, sys\n"
+            "import app\n"
+            "client = app.app.test_client()\n"
+            "for method, path, body, *headers in json.loads(sys.argv[1]):\n"
+            "    response = client.open(path, method=method, json=body, headers=dict(*headers))\n"
+            "    assert response.status_code < 300, response.get_json()\n"
+        )
+        subprocess.run([sys.executable, "-c", script, json.dumps(requests)], cwd=BACKEND_DIR, check=True)
+    return run
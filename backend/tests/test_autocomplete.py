@@ -0,0 +1,51 @@
+"""Popularity-ranked autocomplete and its maintenance across worker processes."""
+
+import pytest
+
+
+def complete(client, prefix, limit=10):
+    response = client.get("/api/v1/recipes/autocomplete", query_string={"q": prefix, "limit": limit})
+    assert response.status_code == 200
+    return [(c["type"], c["text"]) for c in response.get_json()["completions"]]
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    return {
+        "curry": make_recipe("Chicken Curry", ingredients=["chicken", "curry paste"], cuisine="Indian"),
+        "butter": make_recipe("Butter Chicken", ingredients=["chicken", "butter"], cuisine="Indian"),
+        "chili": make_recipe("Chili", ingredients=["beans"], cuisine="Mexican"),
+    }
+
+
+def test_word_starts_match(client, catalog):
+    completions = complete(client, "chi")
+    assert ("recipe", "Butter Chicken") in completions
+    assert ("ingredient", "chicken") in completions
+    assert ("recipe", "Chili") in completions
+    assert complete(client, "zzz") == []
+
+
+def test_missing_prefix_is_rejected(client):
+    assert client.get("/api/v1/recipes/autocomplete").status_code == 400
+
+
+def test_favorites_move_completions_up(client, auth_headers, catalog):
+    complete(client, "chi")  # Index and prefix cache built
+    client.post("/api/v1/favorites", json={"recipe_id": catalog["chili"]}, headers=auth_headers)
+    assert complete(client, "chi", limit=1) == [("recipe", "Chili")]
+
+
+def test_writes_from_other_process_update_completions(client, auth_headers, catalog, other_worker):
+    complete(client, "chi")  # Index and prefix cache built
+
+    other_worker(
+        ("POST", "/api/v1/recipes", {"name": "Chimichurri Steak", "ingredients": ["steak"]}),
+        ("DELETE", "/api/v1/recipes/Chili", None),
+        ("POST", "/api/v1/favorites", {"recipe_id": catalog["curry"]}, auth_headers),
+    )
+
+    completions = complete(client, "chi")
+    assert completions.index(("recipe", "Chicken Curry")) < completions.index(("recipe", "Butter Chicken"))
+    assert ("recipe", "Chimichurri Steak") in completions
+    assert ("recipe", "Chili") not in completions
@@ -0,0 +1,49 @@
+"""Catalog versions and in-memory indexes shared across worker processes."""
+
+import app as backend
+
+
+def test_etag_changes_after_write_in_other_process(client, make_recipe, other_worker):
+    make_recipe("Tomato Soup", ingredients=["tomato"], time=20)
+    first = client.get("/api/v1/recipes/filter?time=30")
+    etag = first.headers["ETag"]
+    assert client.get("/api/v1/recipes/filter?time=30", headers={"If-None-Match": etag}).status_code == 304
+
+    other_worker(("POST", "/api/v1/recipes", {"name": "Miso Soup", "ingredients": ["miso"], "time": 10}))
+
+    second = client.get("/api/v1/recipes/filter?time=30", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert [r["name"] for r in second.get_json()["recipes"]] == ["Tomato Soup", "Miso Soup"]
+
+
+def test_index_sees_updates_and_deletes_from_other_process(client, make_recipe, other_worker):
+    make_recipe("Tomato Soup", ingredients=["tomato"])
+    make_recipe("Leek Soup", ingredients=["leek"])
+    assert len(client.get("/api/v1/recipes/filter?ingredients=tomato").get_json()["recipes"]) == 1
+
+    other_worker(
+        ("PUT", "/api/v1/recipes/Leek Soup", {"ingredients": ["leek", "tomato"]}),
+        ("DELETE", "/api/v1/recipes/Tomato Soup", None),
+    )
+
+    names = [r["name"] for r in client.get("/api/v1/recipes/filter?ingredients=tomato").get_json()["recipes"]]
+    assert names == ["Leek Soup"]
+
+
+def test_pruned_log_resets_indexes(client, make_recipe, other_worker):
+    make_recipe("Tomato Soup", ingredients=["tomato"])
+    assert client.get("/api/v1/recipes/search?query=tomato").get_json()["recipes"]
+
+    other_worker(("POST", "/api/v1/recipes", {"name": "Tomato Salad", "ingredients": ["tomato"]}))
+    backend.db.session.execute(backend.delete(backend.CatalogChange))  # As if pruned meanwhile
+    backend.db.session.commit()
+
+    names = [r["name"] for r in client.get("/api/v1/recipes/search?query=tomato").get_json()["recipes"]]
+    assert sorted(names) == ["Tomato Salad", "Tomato Soup"]
+
+
+def test_warmed_indexes_need_no_build(client, make_recipe):
+    make_recipe("Tomato Soup", ingredients=["tomato"])
+    backend.warm_catalog_indexes()
+    assert backend.recipe_index.built and backend.recipe_search_index.built and backend.autocomplete_index.built
+    assert client.get("/api/v1/recipes/search?query=tomato").get_json()["recipes"]
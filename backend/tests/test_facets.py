@@ -0,0 +1,69 @@
+"""Facet counts on the columnar (NumPy) and SQL paths."""
+
+import pytest
+
+import app as backend
+
+
+def facets(client, query=""):
+    response = client.get(f"/api/v1/recipes/facets?{query}")
+    assert response.status_code == 200
+    data = response.get_json()
+    return data["total"], {
+        field: {item.get("value", item.get("max")): item["count"] for item in items}
+        for field, items in data["facets"].items()
+    }
+
+
+@pytest.fixture(params=["columnar", "sql"])
+def path(request, monkeypatch):
+    if request.param == "sql":
+        monkeypatch.setattr(backend, "np", None)
+    elif backend.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    make_recipe("Carbonara", cuisine="Italian", difficulty="easy", time=20, tools=["pot", "pan"], taste=["savory"])
+    make_recipe("Lasagna", cuisine="Italian", difficulty="hard", time=90, tools=["oven"], taste=["savory"])
+    make_recipe("Pad Thai", cuisine="Thai", difficulty="easy", time=30, tools=["wok"], taste=["sweet", "sour"])
+
+
+def test_counts_per_option(client, path, catalog):
+    total, counts = facets(client)
+    assert total == 3
+    assert counts["cuisine"] == {"italian": 2, "thai": 1}
+    assert counts["difficulty"] == {"easy": 2, "hard": 1}
+    assert counts["tools"] == {"pot": 1, "pan": 1, "oven": 1, "wok": 1}
+    assert counts["taste"] == {"savory": 2, "sweet": 1, "sour": 1}
+    assert counts["time"][30] == 2
+    assert counts["time"][120] == 3
+
+
+def test_counts_follow_filters(client, path, catalog):
+    total, counts = facets(client, "cuisine=italian&time=60")
+    assert total == 1
+    assert counts["difficulty"] == {"easy": 1}
+    assert counts["tools"] == {"pot": 1, "pan": 1}
+
+
+def test_counts_follow_writes(client, path, catalog, make_recipe):
+    facets(client)  # Snapshot built
+    make_recipe("Tiramisu", cuisine="Italian", difficulty="easy", time=30, taste=["sweet"])
+    assert client.delete("/api/v1/recipes/Lasagna").status_code == 200
+
+    total, counts = facets(client)
+    assert total == 3
+    assert counts["cuisine"] == {"italian": 2, "thai": 1}
+    assert counts["taste"] == {"savory": 1, "sweet": 2, "sour": 1}
+
+
+def test_counts_follow_writes_from_other_process(client, path, catalog, other_worker):
+    facets(client)  # Snapshot built
+    other_worker(("POST", "/api/v1/recipes", {"name": "Pho", "cuisine": "Vietnamese", "time": 60}))
+
+    total, counts = facets(client)
+    assert total == 4
+    assert counts["cuisine"]["vietnamese"] == 1
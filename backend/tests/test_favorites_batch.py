@@ -0,0 +1,58 @@
+"""Batch favorite endpoints and the popularity counts they maintain."""
+
+import pytest
+
+import app as backend
+
+
+def favorite_ids(client, headers):
+    return sorted(r["id"] for r in client.get("/api/v1/favorites", headers=headers).get_json()["favorites"])
+
+
+def popularity(recipe_ids):
+    rows = backend.db.session.execute(
+        backend.select(backend.RecipePopularity.recipe_id, backend.RecipePopularity.favorite_count)
+        .where(backend.RecipePopularity.recipe_id.in_(recipe_ids))
+    )
+    return dict(rows.all())
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    return [make_recipe(f"Salad {i}") for i in range(4)]
+
+
+def test_add_reports_added_and_skipped_in_request_order(client, auth_headers, catalog):
+    client.post("/api/v1/favorites", json={"recipe_id": catalog[0]}, headers=auth_headers)
+    response = client.post("/api/v1/favorites/batch",
+                           json={"recipe_ids": [catalog[2], 999, catalog[0], catalog[1], catalog[2]]},
+                           headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json() == {"added": [catalog[2], catalog[1]], "skipped": [999, catalog[0]]}
+    assert favorite_ids(client, auth_headers) == catalog[:3]
+    assert popularity(catalog) == {catalog[0]: 1, catalog[1]: 1, catalog[2]: 1}
+
+
+def test_remove_reports_removed_and_skipped(client, auth_headers, catalog):
+    client.post("/api/v1/favorites/batch", json={"recipe_ids": catalog[:2]}, headers=auth_headers)
+    response = client.delete("/api/v1/favorites/batch",
+                             json={"recipe_ids": [catalog[1], catalog[3]]}, headers=auth_headers)
+    assert response.get_json() == {"removed": [catalog[1]], "skipped": [catalog[3]]}
+    assert favorite_ids(client, auth_headers) == [catalog[0]]
+    assert popularity(catalog).get(catalog[1], 0) == 0
+
+
+@pytest.mark.parametrize("body", [{}, {"recipe_ids": "1,2"}, {"recipe_ids": [1, "2"]}, {"recipe_ids": [True]}])
+def test_invalid_recipe_ids_are_rejected(client, auth_headers, body):
+    assert client.post("/api/v1/favorites/batch", json=body, headers=auth_headers).status_code == 400
+
+
+def test_batch_size_is_limited(client, auth_headers, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "FAVORITES_BATCH_MAX", 3)
+    response = client.post("/api/v1/favorites/batch", json={"recipe_ids": [1, 2, 3, 4]}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_batch_requires_authentication(client, catalog):
+    assert client.post("/api/v1/favorites/batch", json={"recipe_ids": catalog}).status_code == 401
+    assert client.delete("/api/v1/favorites/batch", json={"recipe_ids": catalog}).status_code == 401
@@ -0,0 +1,86 @@
+"""In-memory filter layer (FILTER_PUSHDOWN_DISABLED) on the columnar and indexed engines."""
+
+import pytest
+
+import app as backend
+
+ALL_FILTERS = set(backend.FilterEngine.STRATEGIES)
+
+
+@pytest.fixture(params=["columnar", "indexed"])
+def engine(request, monkeypatch):
+    """Keep every filter in memory, evaluated by the columnar (NumPy) or the inverted index engine."""
+    if request.param == "indexed":
+        monkeypatch.setattr(backend, "np", None)
+    elif backend.np is None:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setitem(backend.app.config, "FILTER_PUSHDOWN_DISABLED", ALL_FILTERS)
+    return request.param
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    make_recipe("Roast Chicken", cuisine="French", difficulty="Medium", time=90,
+                tools=["Oven"], ingredients=["Chicken Breast", "garlic"], taste=["savory"])
+    make_recipe("Chicken Stir Fry", cuisine="Chinese", difficulty="easy", time=20,
+                tools=["wok", "knife"], ingredients=["chicken thigh", "soy sauce"], taste=["savory", "salty"])
+    make_recipe("Fruit Salad", cuisine="French", difficulty="easy", time=10,
+                tools=["knife"], ingredients=["apple", "pineapple"], taste=["sweet"])
+    make_recipe("Pad Thai", cuisine="Thai", difficulty="medium", time=30,
+                tools=["wok"], ingredients=["rice noodles", "peanut"], taste=["sweet", "sour"])
+
+
+def names(client, query):
+    response = client.get(f"/api/v1/recipes/filter?{query}&limit=100")
+    assert response.status_code == 200
+    return sorted(recipe["name"] for recipe in response.get_json()["recipes"])
+
+
+def pushed_down(client, query, monkeypatch):
+    with monkeypatch.context() as patch:
+        patch.setitem(backend.app.config, "FILTER_PUSHDOWN_DISABLED", set())
+        return names(client, query)
+
+
+@pytest.mark.parametrize("query", [
+    "tools=wok",
+    "tools=OVEN,knife",
+    "taste=sweet",
+    "taste=salty,sour",
+    "ingredients=chick",
+    "ingredients=apple,soy",
+    "cuisine=fren&difficulty=EASY",
+    "time=30&tools=wok",
+    "ingredients=chicken&taste=savory&time=60",
+    "tools=spoon",
+])
+def test_in_memory_results_match_sql(client, catalog, engine, monkeypatch, query):
+    expected = pushed_down(client, query, monkeypatch)
+    assert names(client, query) == expected
+
+
+def test_plan_reports_engine(client, catalog, engine):
+    plan = client.get("/api/v1/recipes/filter?tools=wok&time=30&explain=1").get_json()["plan"]
+    assert plan["pushdown"] == []
+    assert plan["engine"] == engine
+    assert {step["filter"] for step in plan["in_memory"]} == {"tools", "time"}
+
+
+def test_in_memory_results_follow_writes(client, catalog, engine, make_recipe, monkeypatch):
+    assert names(client, "tools=wok") == ["Chicken Stir Fry", "Pad Thai"]  # Snapshot / index built
+    make_recipe("Fried Rice", tools=["Wok"], ingredients=["rice"])
+    assert client.put("/api/v1/recipes/Pad Thai", json={"tools": ["pan"]}).status_code == 200
+    assert client.delete("/api/v1/recipes/Chicken Stir Fry").status_code == 200
+
+    assert names(client, "tools=wok") == ["Fried Rice"]
+    assert names(client, "tools=wok") == pushed_down(client, "tools=wok", monkeypatch)
+
+
+def test_pages_are_refilled(client, catalog, engine, make_recipe):
+    for i in range(5):
+        make_recipe(f"Stew {i}", tools=["pot"])
+    first = client.get("/api/v1/recipes/filter?tools=wok,knife&limit=2").get_json()
+    second = client.get(f"/api/v1/recipes/filter?tools=wok,knife&limit=2&cursor={first['next_cursor']}").get_json()
+    assert [r["name"] for r in first["recipes"]] == ["Chicken Stir Fry", "Fruit Salad"]
+    assert [r["name"] for r in second["recipes"]] == ["Pad Thai"]
+    assert second["has_more"] is False
@@ -0,0 +1,42 @@
+"""Filter plans: pushdown, residual ranking and selectivity estimates."""
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    make_recipe("Roast Chicken", tools=["oven"], ingredients=["chicken", "garlic"], taste=["savory"], time=90)
+    make_recipe("Chicken Stir Fry", tools=["wok"], ingredients=["chicken thigh"], taste=["savory"], time=20)
+    make_recipe("Fruit Salad", tools=["knife"], ingredients=["apple"], taste=["sweet"], time=10)
+
+
+def test_pushed_down_filters_are_never_ranked(app_context, catalog, monkeypatch):
+    backend.recipe_index.ensure_built()
+
+    def fail(strategy):
+        raise AssertionError(f"{strategy.name} was ranked")
+
+    monkeypatch.setattr(backend.FilterEngine, "rank", staticmethod(fail))
+    plan = backend.FilterPlan({"time": "30", "tools": "oven", "ingredients": "chick"})
+    assert [strategy.name for strategy, _ in plan.pushdown] == ["time", "tools", "ingredients"]
+    assert plan.residual.strategies == []
+
+
+def test_selectivity_estimated_from_posting_list_lengths(app_context, catalog, monkeypatch):
+    backend.recipe_index.ensure_built()
+    monkeypatch.setattr(backend.RecipeTermIndex, "lookup_partial", None)  # No unions
+
+    ingredients = backend.IngredientFilterStrategy("chick")
+    assert ingredients.estimate_selectivity() == pytest.approx(2 / 3)
+    assert backend.TasteFilterStrategy("sweet,savory").estimate_selectivity() == 1.0
+    assert backend.ToolsFilterStrategy("wok,none").estimate_selectivity() == pytest.approx(1 / 3)
+
+
+def test_residual_is_ranked_on_first_use(client, catalog, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "FILTER_PUSHDOWN_DISABLED", {"tools", "taste"})
+    backend.recipe_index.ensure_built()
+    data = client.get("/api/v1/recipes/filter?tools=oven,wok,knife&taste=savory&explain=1").get_json()
+    assert [r["name"] for r in data["recipes"]] == ["Roast Chicken", "Chicken Stir Fry"]
+    assert [step["filter"] for step in data["plan"]["in_memory"]] == ["taste", "tools"]
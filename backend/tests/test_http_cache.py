@@ -0,0 +1,59 @@
+"""Cache-Control and Vary of conditional GET responses (Flask and the ASGI mirror)."""
+
+import pytest
+
+
+@pytest.fixture(params=["flask", "asgi"])
+def get(request, client):
+    """GET through the Flask app or the ASGI mirror."""
+    if request.param == "flask":
+        return client.get
+    pytest.importorskip("aiosqlite")
+    asgi = pytest.importorskip("asgi")
+    from starlette.testclient import TestClient
+    asgi_client = TestClient(asgi.application).__enter__()
+    request.addfinalizer(lambda: asgi_client.__exit__(None, None, None))
+    return asgi_client.get
+
+
+def vary(response):
+    return {value.strip() for value in response.headers.get("Vary", "").split(",") if value.strip()}
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    make_recipe("Carbonara", time=20)
+    make_recipe("Lasagna", time=90)
+
+
+@pytest.mark.parametrize("authenticated", [True, False])
+def test_per_caller_responses_are_private(get, catalog, auth_headers, authenticated):
+    headers = auth_headers if authenticated else {}
+    first = get("/api/v1/recipes", headers=headers)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"].startswith("private,")
+    assert "public" not in first.headers["Cache-Control"]
+    assert "Authorization" in vary(first)
+
+    revalidated = get("/api/v1/recipes", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Cache-Control"].startswith("private,")
+    assert "Authorization" in vary(revalidated)
+
+
+def test_per_caller_etags_differ(get, catalog, auth_headers):
+    anonymous = get("/api/v1/recipes").headers["ETag"]
+    assert get("/api/v1/recipes", headers=auth_headers).headers["ETag"] != anonymous
+    assert get("/api/v1/recipes", headers={"If-None-Match": anonymous, **auth_headers}).status_code == 200
+
+
+@pytest.mark.parametrize("path", ["/api/v1/recipes/filter?time=30", "/api/v1/recipes/search?query=carbonara"])
+def test_shared_responses_are_public(get, catalog, auth_headers, path):
+    first = get(path, headers=auth_headers)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"].startswith("public,")
+    assert "Authorization" not in vary(first)
+
+    revalidated = get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Cache-Control"].startswith("public,")
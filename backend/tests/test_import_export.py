@@ -0,0 +1,81 @@
+"""Streaming bulk import and catalog export."""
+
+import csv
+import io
+import json
+
+import app as backend
+
+
+def import_lines(client, body, **params):
+    response = client.post("/api/v1/admin/recipes/import", data=body, query_string=params)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def search(client, query):
+    response = client.get("/api/v1/recipes/search", query_string={"query": query})
+    return [recipe["name"] for recipe in response.get_json()["recipes"]]
+
+
+def test_ndjson_import_reports_rows_and_batches(client):
+    body = "\n".join([
+        json.dumps({"name": "Pho", "ingredients": ["noodles", "beef"], "cuisine": "Vietnamese"}),
+        "{not json",
+        json.dumps({"description": "no name"}),
+        json.dumps({"name": "Banh Mi", "ingredients": ["baguette", "pork"]}),
+        json.dumps({"name": "Goi Cuon", "ingredients": ["shrimp"]}),
+    ])
+    lines = import_lines(client, body, batch_size=2)
+    assert [line["row"] for line in lines if "row" in line] == [2, 3]
+    assert [line["inserted"] for line in lines if "batch" in line] == [2, 1]
+    assert lines[-1] == {"summary": {"inserted": 3, "failed": 2, "batches": 2}}
+    assert search(client, "noodles") == ["Pho"]
+
+
+def test_json_array_import(client):
+    body = json.dumps([{"name": "Pho"}, {"name": "Banh Mi"}])
+    assert import_lines(client, body)[-1]["summary"]["inserted"] == 2
+
+
+def test_import_batch_size_is_capped(client, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "IMPORT_BATCH_MAX", 2)
+    body = "\n".join(json.dumps({"name": name}) for name in ("Pho", "Banh Mi", "Goi Cuon"))
+    lines = import_lines(client, body, batch_size=1000000)
+    assert [line["inserted"] for line in lines if "batch" in line] == [2, 1]
+
+
+def test_import_rejects_invalid_batch_size(client):
+    for batch_size in ("0", "-5"):
+        response = client.post("/api/v1/admin/recipes/import", data="[]", query_string={"batch_size": batch_size})
+        assert response.status_code == 400
+
+
+def test_import_cut_short_keeps_committed_batches_searchable(client):
+    assert search(client, "pho") == []  # Index built before the import
+    records = enumerate([{"name": "Pho Bo"}, {"name": "Pho Ga"}, {"name": "Pho Chay"}], 1)
+    progress = backend.import_recipes(records, batch_size=2)
+    assert next(progress)["batch"] == 1
+    progress.close()  # As when the client disconnects mid-stream
+
+    assert sorted(search(client, "pho")) == ["Pho Bo", "Pho Ga"]
+
+
+def test_export_ndjson_and_csv_with_filters(client, auth_headers, make_recipe):
+    quick = make_recipe("Omelette", time=10, tools=["pan"], ingredients=["egg"])
+    make_recipe("Roast", time=120, tools=["oven"], ingredients=["beef"])
+    client.post("/api/v1/favorites", json={"recipe_id": quick}, headers=auth_headers)
+
+    response = client.get("/api/v1/admin/recipes/export?time=30&favorites=1")
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(row["name"], row["favorite_count"]) for row in rows] == [("Omelette", 1)]
+
+    response = client.get("/api/v1/admin/recipes/export?format=csv")
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["name"] for row in rows] == ["Omelette", "Roast"]
+    assert json.loads(rows[1]["tools"]) == ["oven"]
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/api/v1/admin/recipes/export?format=xml").status_code == 400
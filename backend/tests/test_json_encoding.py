@@ -0,0 +1,45 @@
+"""Recipe pages joined from cached fragments versus jsonify."""
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import app as backend
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def provider(request, app_context, monkeypatch):
+    if request.param == "orjson":
+        if backend.orjson is None:
+            pytest.skip("orjson is not installed")
+        monkeypatch.setattr(backend.app, "json", backend.OrjsonJSONProvider(backend.app))
+    else:
+        monkeypatch.setattr(backend.app, "json", DefaultJSONProvider(backend.app))
+    backend.recipe_cache.clear()
+    yield request.param
+    backend.recipe_cache.clear()
+
+
+@pytest.fixture
+def rows(make_recipe):
+    make_recipe("Crème Brûlée", ingredients=["cream", "sugar"], time=45)
+    make_recipe("Toast", tools=["toaster"])
+    return backend.load_recipe_records(backend.select_recipe_records().order_by(backend.Recipe.id))
+
+
+def test_page_matches_compact_jsonify(provider, rows):
+    with backend.app.test_request_context():
+        expected = backend.jsonify({
+            "recipes": [backend.Recipe.cached_dict(row) for row in rows], "next_cursor": None, "has_more": False,
+        }).get_data()
+        assert backend.encode_recipe_page("recipes", rows, next_cursor=None, has_more=False) == expected
+
+
+def test_orjson_differs_from_stdlib_outside_ascii():
+    if backend.orjson is None:
+        pytest.skip("orjson is not installed")
+    orjson_provider = backend.OrjsonJSONProvider(backend.app)
+    stdlib_provider = DefaultJSONProvider(backend.app)
+    assert orjson_provider.dumps({"name": "Crème"}) == '{"name":"Crème"}'
+    assert stdlib_provider.dumps({"name": "Crème"}) == '{"name": "Cr\\u00e8me"}'
+    assert orjson_provider.dumps(1e16) == "1e16"
+    assert orjson_provider.dumps(float("nan")) == "null"
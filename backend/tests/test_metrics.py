@@ -0,0 +1,91 @@
+"""Prometheus request, database and filter-layer metrics scraped from /metrics."""
+
+import pytest
+
+import app as backend
+
+prometheus_client = pytest.importorskip("prometheus_client")
+from prometheus_client.parser import text_string_to_metric_families  # noqa: E402
+
+
+def scrape(client):
+    """Samples of the /metrics exposition, keyed by (name, sorted labels)."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.get_data(as_text=True))
+        for sample in family.samples
+    }
+
+
+def sample(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0.0)
+
+
+ROUTE = {"method": "GET", "route": "/api/v1/recipes/<int:recipe_id>"}
+
+
+def test_request_and_query_series(client, make_recipe):
+    recipe_id = make_recipe("Carbonara")
+    before = scrape(client)
+    assert client.get(f"/api/v1/recipes/{recipe_id}").status_code == 200
+    assert client.get("/api/v1/recipes/999999").status_code == 404
+    after = scrape(client)
+
+    def delta(name, **labels):
+        return sample(after, name, **labels) - sample(before, name, **labels)
+
+    assert delta("http_requests_total", status="200", **ROUTE) == 1
+    assert delta("http_requests_total", status="404", **ROUTE) == 1
+    assert delta("http_request_duration_seconds_count", **ROUTE) == 2
+    assert delta("http_request_db_queries_count", **ROUTE) == 2
+    assert delta("http_request_db_queries_sum", **ROUTE) >= 2
+    assert delta("http_request_db_seconds_count", **ROUTE) == 2
+    assert sample(after, "http_requests_in_flight", **ROUTE) == 0
+
+
+def test_unmatched_routes_share_one_series(client):
+    before = scrape(client)
+    client.get("/api/v1/no-such-route/1")
+    client.get("/api/v1/no-such-route/2")
+    after = scrape(client)
+    labels = {"method": "GET", "route": backend.RequestMetrics.UNMATCHED_ROUTE, "status": "404"}
+    assert sample(after, "http_requests_total", **labels) - sample(before, "http_requests_total", **labels) == 2
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    for i in range(5):
+        make_recipe(f"Stir Fry {i}", tools=["wok"] if i % 2 else ["pan"], time=20)
+
+
+def filter_rows_delta(before, after):
+    return tuple(sample(after, "filter_rows_total", layer=layer) - sample(before, "filter_rows_total", layer=layer)
+                 for layer in ("sql", "strategy"))
+
+
+def test_filter_rows_pushed_down(client, catalog):
+    before = scrape(client)
+    assert len(client.get("/api/v1/recipes/filter?tools=wok").get_json()["recipes"]) == 2
+    assert filter_rows_delta(before, scrape(client)) == (2, 2)
+
+
+def test_filter_rows_kept_in_memory(client, catalog, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "FILTER_PUSHDOWN_DISABLED", {"tools"})
+    before = scrape(client)
+    assert len(client.get("/api/v1/recipes/filter?tools=wok&time=30").get_json()["recipes"]) == 2
+    assert filter_rows_delta(before, scrape(client)) == (5, 2)
+
+
+@pytest.mark.parametrize("disabled, expected", [(set(), (2, 2)), ({"tools"}, (5, 2))])
+def test_asgi_filter_records_rows(client, catalog, monkeypatch, disabled, expected):
+    pytest.importorskip("aiosqlite")
+    asgi = pytest.importorskip("asgi")
+    from starlette.testclient import TestClient
+
+    monkeypatch.setitem(backend.app.config, "FILTER_PUSHDOWN_DISABLED", disabled)
+    before = scrape(client)
+    with TestClient(asgi.application) as asgi_client:
+        assert len(asgi_client.get("/api/v1/recipes/filter?tools=wok&time=30").json()["recipes"]) == 2
+    assert filter_rows_delta(before, scrape(client)) == expected
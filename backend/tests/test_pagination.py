@@ -0,0 +1,103 @@
+"""Keyset cursors and the default page size of the list endpoints."""
+
+import pytest
+
+import app as backend
+
+
+def names(response):
+    return [recipe["name"] for recipe in response.get_json()["recipes"]]
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    return [make_recipe(f"Soup {i:02d}", ingredients=["water", "salt"], time=10 + i) for i in range(30)]
+
+
+def test_cursor_walks_every_recipe_once(client, catalog):
+    seen, cursor = [], None
+    while True:
+        query = "/api/v1/recipes?limit=7" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(query).get_json()
+        seen.extend(recipe["id"] for recipe in data["recipes"])
+        assert data["has_more"] == (data["next_cursor"] is not None)
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == catalog
+
+
+def test_recipes_default_to_one_page(client, catalog):
+    data = client.get("/api/v1/recipes").get_json()
+    assert len(data["recipes"]) == 20
+    assert data["has_more"] is True
+
+
+def test_filter_cursor_skips_rejected_rows(client, catalog):
+    first = client.get("/api/v1/recipes/filter?time=30&limit=5").get_json()
+    second = client.get(f"/api/v1/recipes/filter?time=30&limit=5&cursor={first['next_cursor']}").get_json()
+    rest = client.get(f"/api/v1/recipes/filter?time=30&limit=50&cursor={second['next_cursor']}").get_json()
+    ids = [r["id"] for page in (first, second, rest) for r in page["recipes"]]
+    assert ids == catalog[:21]
+    assert rest["has_more"] is False
+
+
+def test_invalid_cursor_is_rejected(client, catalog):
+    assert client.get("/api/v1/recipes?cursor=not-a-cursor").status_code == 400
+
+
+def test_filter_search_and_favorites_page_by_default(client, auth_headers, catalog):
+    filtered = client.get("/api/v1/recipes/filter?ingredients=salt").get_json()
+    assert len(filtered["recipes"]) == 20
+    assert filtered["has_more"] is True
+
+    searched = client.get("/api/v1/recipes/search?query=soup").get_json()
+    assert len(searched["recipes"]) == 20
+    assert searched["has_more"] is True
+
+    client.post("/api/v1/favorites/batch", json={"recipe_ids": catalog}, headers=auth_headers)
+    favorites = client.get("/api/v1/favorites", headers=auth_headers).get_json()
+    assert len(favorites["favorites"]) == 20
+    assert favorites["has_more"] is True
+
+
+def test_limit_is_capped(client, catalog, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "PAGE_SIZE_MAX", 7)
+    assert len(client.get("/api/v1/recipes/filter?ingredients=salt&limit=100").get_json()["recipes"]) == 7
+
+
+@pytest.mark.parametrize("path, values", [
+    ("/api/v1/recipes/filter?ingredients=salt", ["x"]),
+    ("/api/v1/recipes/filter?ingredients=salt", [1.5]),
+    ("/api/v1/recipes/filter?ingredients=salt", [1, 2]),
+    ("/api/v1/recipes/search?query=soup", ["a", "b"]),
+    ("/api/v1/recipes/search?query=soup", [1.0, "2"]),
+    ("/api/v1/recipes/search?query=soup", [3]),
+    ("/api/v1/favorites", [True]),
+])
+def test_mistyped_cursor_is_rejected(client, auth_headers, catalog, path, values):
+    cursor = backend.encode_cursor(values)
+    response = client.get(f"{path}{'&' if '?' in path else '?'}cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_search_pages_follow_rank_order(client, catalog):
+    first = client.get("/api/v1/recipes/search?query=soup&limit=12").get_json()
+    second = client.get(f"/api/v1/recipes/search?query=soup&limit=30&cursor={first['next_cursor']}").get_json()
+    everything = names(client.get("/api/v1/recipes/search?query=soup&limit=30"))
+    assert [r["name"] for r in first["recipes"] + second["recipes"]] == everything
+    assert second["next_cursor"] is None
+
+
+def test_favorites_pages_cover_every_favorite(client, auth_headers, catalog):
+    response = client.post("/api/v1/favorites/batch", json={"recipe_ids": catalog}, headers=auth_headers)
+    assert response.status_code == 200
+    seen, cursor = [], None
+    while True:
+        query = "/api/v1/favorites?limit=8" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(query, headers=auth_headers).get_json()
+        seen.extend(r["id"] for r in data["favorites"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == catalog
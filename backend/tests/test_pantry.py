@@ -0,0 +1,77 @@
+"""Pantry coverage ranking ("cook with what I have")."""
+
+import pytest
+
+import app as backend
+
+
+def pantry(client, query):
+    response = client.get(f"/api/v1/recipes/pantry?{query}")
+    assert response.status_code == 200
+    return response.get_json()["recipes"]
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    make_recipe("Garlic Chicken", ingredients=["Chicken Breast", "garlic", "Garlic", "butter"])
+    make_recipe("Omelette", ingredients=["egg", "butter"])
+    make_recipe("Carbonara", ingredients=["pasta", "egg", "bacon", "parmesan", "pepper"])
+    make_recipe("Fruit Salad", ingredients=["apple", "banana"])
+
+
+def test_sort_by_coverage(client, catalog):
+    recipes = pantry(client, "ingredients=egg,butter,pasta")
+    assert [(r["name"], r["coverage"], r["missing_count"]) for r in recipes] == [
+        ("Omelette", 1.0, 0),
+        ("Carbonara", 0.4, 3),
+        ("Garlic Chicken", 0.3333, 2),
+    ]
+    assert all(r["name"] != "Fruit Salad" for r in recipes)  # Nothing in common, never scored
+
+
+def test_sort_by_missing(client, catalog):
+    recipes = pantry(client, "ingredients=egg,butter,pasta&sort=missing")
+    assert [(r["name"], r["missing_count"]) for r in recipes] == [
+        ("Omelette", 0), ("Garlic Chicken", 2), ("Carbonara", 3),
+    ]
+
+
+def test_partial_matches_cover_ingredients(client, catalog):
+    [recipe] = pantry(client, "ingredients=chick,GARLIC")
+    assert recipe["name"] == "Garlic Chicken"
+    assert recipe["missing_ingredients"] == ["butter"]
+    assert recipe["missing_count"] == 1
+    assert recipe["coverage"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_missing_ingredients_are_distinct_and_counted(client, catalog):
+    [recipe] = pantry(client, "ingredients=butter&sort=missing&limit=1")
+    assert recipe["name"] == "Omelette"
+    [recipe] = [r for r in pantry(client, "ingredients=butter") if r["name"] == "Garlic Chicken"]
+    assert recipe["missing_ingredients"] == ["chicken breast", "garlic"]
+    assert recipe["missing_count"] == len(recipe["missing_ingredients"])
+
+
+def test_limit(client, catalog):
+    assert len(pantry(client, "ingredients=egg,butter&limit=2")) == 2
+    assert [r["name"] for r in pantry(client, "ingredients=egg,butter&limit=1")] == ["Omelette"]
+
+
+def test_limit_is_capped(client, make_recipe, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "PAGE_SIZE_MAX", 3)
+    for i in range(5):
+        make_recipe(f"Rice {i}", ingredients=["rice"])
+    assert len(pantry(client, "ingredients=rice&limit=100")) == 3
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "ingredients=",
+    "ingredients=%20,%20",
+    "ingredients=egg&sort=popular",
+    "ingredients=egg&limit=0",
+    "ingredients=egg&limit=many",
+])
+def test_invalid_requests(client, catalog, query):
+    response = client.get(f"/api/v1/recipes/pantry?{query}")
+    assert response.status_code == 400
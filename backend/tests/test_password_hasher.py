@@ -0,0 +1,88 @@
+"""Password hashing pool: back-pressure, rehash on login and broken pools."""
+
+import os
+
+import pytest
+
+import app as backend
+
+CREDENTIALS = {"username": "cook", "password": "pw-123456"}
+
+
+@pytest.fixture
+def register(client):
+    def run():
+        return client.post("/api/v1/auth/register", json={**CREDENTIALS, "email": "cook@example.com"})
+    return run
+
+
+@pytest.fixture
+def pooled_hasher(monkeypatch):
+    """A real one-process pool in place of the inline hasher of the tests."""
+    hasher = backend.PasswordHasher(backend.app.config["PASSWORD_HASH_METHOD"], 16, workers=1, queue_max=4)
+    monkeypatch.setattr(backend, "password_hasher", hasher)
+    yield hasher
+    hasher.shutdown()
+
+
+def stored_hash():
+    return backend.User.query.filter_by(username=CREDENTIALS["username"]).one().password_hash
+
+
+def test_full_queue_answers_503_with_retry_after(client, register, monkeypatch):
+    hasher = backend.PasswordHasher("pbkdf2:sha256:1000", 16, workers=1, queue_max=0, retry_after=7)
+    monkeypatch.setattr(backend, "password_hasher", hasher)
+
+    response = register()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_outdated_hash_is_upgraded_on_login(client, register, monkeypatch):
+    assert register().status_code == 201
+    assert stored_hash().startswith("pbkdf2:sha256:1000$")
+
+    hasher = backend.PasswordHasher("pbkdf2:sha256:2000", 16, workers=0, queue_max=1)
+    monkeypatch.setattr(backend, "password_hasher", hasher)
+    assert hasher.needs_rehash(stored_hash())
+
+    assert client.post("/api/v1/auth/login", json=CREDENTIALS).status_code == 200
+    backend.db.session.expire_all()
+    assert stored_hash().startswith("pbkdf2:sha256:2000$")
+    assert not hasher.needs_rehash(stored_hash())
+    assert client.post("/api/v1/auth/login", json=CREDENTIALS).status_code == 200
+
+
+def test_wrong_password_keeps_hash(client, register, monkeypatch):
+    register()
+    before = stored_hash()
+    monkeypatch.setattr(backend, "password_hasher",
+                        backend.PasswordHasher("pbkdf2:sha256:2000", 16, workers=0, queue_max=1))
+    assert client.post("/api/v1/auth/login", json={**CREDENTIALS, "password": "wrong"}).status_code == 401
+    assert stored_hash() == before
+
+
+def test_pool_does_not_fork_worker_threads(pooled_hasher):
+    assert pooled_hasher.verify(pooled_hasher.hash("secret"), "secret")
+    assert pooled_hasher._pool._mp_context.get_start_method() in ("forkserver", "spawn")
+
+
+def test_dead_pool_process_is_replaced(client, register, pooled_hasher):
+    pooled_hasher.hash("warm-up")
+    pool = pooled_hasher._pool
+    for process in list(pool._processes.values()):
+        os.kill(process.pid, 9)  # As an OOM kill would
+        process.join()
+
+    assert register().status_code == 201
+    assert pooled_hasher._pool is not pool
+    assert pooled_hasher.stats()["broken"] >= 1
+    assert client.post("/api/v1/auth/login", json=CREDENTIALS).status_code == 200
+
+
+def test_pool_breaking_twice_answers_503(pooled_hasher):
+    with pytest.raises(backend.ServiceUnavailable):
+        pooled_hasher._run(os._exit, 1)  # Every attempt kills its pool process
+    assert pooled_hasher.stats() == {**pooled_hasher.stats(), "broken": 2, "pending": 0}
+    assert pooled_hasher.verify(pooled_hasher.hash("secret"), "secret")  # Usable again
@@ -0,0 +1,44 @@
+"""Decoded recipe cache keys and optimistic concurrency on recipe writes."""
+
+from sqlalchemy.orm.exc import StaleDataError
+
+import app as backend
+
+
+def test_versions_change_on_update(client, make_recipe):
+    recipe_id = make_recipe("Tomato Soup", ingredients=["tomato"])
+    before = backend.db.session.get(backend.Recipe, recipe_id).version
+
+    assert client.put("/api/v1/recipes/Tomato Soup", json={"ingredients": ["tomato", "basil"]}).status_code == 200
+    backend.db.session.expire_all()
+    after = backend.db.session.get(backend.Recipe, recipe_id).version
+
+    assert after != before
+    assert client.get(f"/api/v1/recipes/{recipe_id}").get_json()["ingredients"] == ["tomato", "basil"]
+
+
+def test_reused_id_is_not_served_from_cache(client, make_recipe):
+    recipe_id = make_recipe("Old Recipe", ingredients=["egg"])
+    assert client.get(f"/api/v1/recipes/{recipe_id}").status_code == 200  # Cached now
+
+    assert client.delete("/api/v1/recipes/Old Recipe").status_code == 200
+    new_id = make_recipe("New Recipe", ingredients=["rice"])
+    assert new_id == recipe_id  # SQLite reuses the highest id
+
+    data = client.get(f"/api/v1/recipes/{new_id}").get_json()
+    assert data["name"] == "New Recipe"
+    assert data["ingredients"] == ["rice"]
+
+
+def test_concurrent_update_returns_409(client, make_recipe, monkeypatch):
+    make_recipe("Pancakes")
+
+    def stale_commit():
+        raise StaleDataError("UPDATE statement on table 'recipes' expected to update 1 row(s); 0 were matched.")
+
+    monkeypatch.setattr(backend.db.session, "commit", stale_commit)
+    response = client.put("/api/v1/recipes/Pancakes", json={"time": 20})
+    assert response.status_code == 409
+
+    response = client.delete("/api/v1/recipes/Pancakes")
+    assert response.status_code == 409
@@ -0,0 +1,132 @@
+"""Offline recommendation build and the recommended catalog order."""
+
+import pytest
+
+import app as backend
+
+
+def rebuild(client):
+    response = client.post("/api/v1/admin/recommendations/rebuild")
+    assert response.status_code == 202
+    backend.recommendations_job.join(30)
+    return client.get("/api/v1/admin/recommendations/rebuild").get_json()
+
+
+def neighbors(recipe_id):
+    stmt = (backend.select(backend.RecipeNeighbor.neighbor_id)
+            .where(backend.RecipeNeighbor.recipe_id == recipe_id)
+            .order_by(backend.RecipeNeighbor.score.desc()))
+    return backend.db.session.scalars(stmt).all()
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    return {
+        "carbonara": make_recipe("Carbonara", ingredients=["pasta", "egg", "bacon"], cuisine="Italian"),
+        "amatriciana": make_recipe("Amatriciana", ingredients=["pasta", "bacon", "tomato"], cuisine="Italian"),
+        "curry": make_recipe("Curry", ingredients=["chicken", "coconut milk"], cuisine="Indian"),
+        "korma": make_recipe("Korma", ingredients=["chicken", "cream"], cuisine="Indian"),
+    }
+
+
+def test_rebuild_runs_in_background(client, catalog):
+    status = rebuild(client)
+    assert status["status"] == "succeeded"
+    assert status["result"]["recipes"] == 4
+    assert neighbors(catalog["carbonara"])[0] == catalog["amatriciana"]
+    assert neighbors(catalog["curry"])[0] == catalog["korma"]
+    assert backend.db.session.query(backend.RecipeNeighborStaging).count() == 0
+
+
+def test_rebuild_already_running_is_rejected(client, catalog, monkeypatch):
+    release = backend.threading.Event()
+    monkeypatch.setattr(backend.recommendations_job, "fn", lambda: release.wait(10) and {})
+    assert client.post("/api/v1/admin/recommendations/rebuild").status_code == 202
+    try:
+        assert client.post("/api/v1/admin/recommendations/rebuild").status_code == 409
+        assert client.get("/api/v1/admin/recommendations/rebuild").get_json()["status"] == "running"
+    finally:
+        release.set()
+        backend.recommendations_job.join(10)
+
+
+def test_failed_rebuild_keeps_previous_neighbors(client, catalog, monkeypatch):
+    rebuild(client)
+    before = neighbors(catalog["carbonara"])
+
+    real_insert = backend.insert
+
+    def failing_insert(table):
+        if table is backend.RecipeNeighbor:
+            raise RuntimeError("disk full")
+        return real_insert(table)
+
+    monkeypatch.setattr(backend, "insert", failing_insert)
+    status = rebuild(client)
+    assert status["status"] == "failed"
+    assert "disk full" in status["error"]
+    assert neighbors(catalog["carbonara"]) == before
+    assert backend.db.session.query(backend.RecipeNeighborStaging).count() == 0
+
+
+def test_common_features_contribute_bounded_candidates(client, make_recipe, monkeypatch):
+    monkeypatch.setitem(backend.app.config, "RECOMMENDATION_CANDIDATES_PER_FEATURE", 5)
+    ids = [make_recipe(f"Stock {i}", ingredients=["water", "salt"]) for i in range(20)]
+    pair = [make_recipe(f"Saffron Rice {i}", ingredients=["water", "salt", "saffron"]) for i in range(2)]
+
+    assert rebuild(client)["status"] == "succeeded"
+    assert neighbors(pair[0])[0] == pair[1]  # The rare shared feature is always a candidate
+    assert all(len(neighbors(recipe_id)) <= 5 + 2 for recipe_id in ids)
+
+
+def test_co_favorited_recipes_are_candidates(client, auth_headers, catalog):
+    favorites = [catalog["carbonara"], catalog["curry"]]
+    assert client.post("/api/v1/favorites/batch", json={"recipe_ids": favorites}, headers=auth_headers).status_code == 200
+    rebuild(client)
+    assert catalog["curry"] in neighbors(catalog["carbonara"])
+
+
+@pytest.fixture(params=["flask", "asgi"])
+def list_recipes(request, client):
+    """GET /api/v1/recipes through the Flask app or the ASGI mirror; returns every page's ids."""
+    if request.param == "flask":
+        get = client.get
+    else:
+        pytest.importorskip("aiosqlite")
+        asgi = pytest.importorskip("asgi")
+        from starlette.testclient import TestClient
+        asgi_client = TestClient(asgi.application).__enter__()
+        request.addfinalizer(lambda: asgi_client.__exit__(None, None, None))
+
+        def get(path, headers=None):
+            response = asgi_client.get(path, headers=headers)
+            response.get_json = response.json
+            return response
+
+    def list_all(headers=None, limit=2):
+        ids, cursor = [], None
+        while True:
+            data = get(f"/api/v1/recipes?limit={limit}" + (f"&cursor={cursor}" if cursor else ""),
+                       headers=headers).get_json()
+            ids.extend(recipe["id"] for recipe in data["recipes"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return ids
+    return list_all
+
+
+def test_favorites_are_never_listed(client, auth_headers, catalog, make_recipe, list_recipes):
+    extra = [make_recipe(f"Stew {i}", ingredients=["beef"]) for i in range(3)]
+    favorites = [catalog["carbonara"], extra[1]]
+    client.post("/api/v1/favorites/batch", json={"recipe_ids": favorites}, headers=auth_headers)
+    rebuild(client)
+
+    listed = list_recipes(auth_headers)
+    assert set(listed[:3]) == {catalog["amatriciana"], extra[0], extra[2]}  # Neighbors first
+    assert sorted(listed) == sorted((set(catalog.values()) | set(extra)) - set(favorites))
+    assert sorted(list_recipes()) == sorted(set(catalog.values()) | set(extra))  # Anonymous
+
+
+def test_popular_recipes_lead_for_anonymous_users(client, auth_headers, catalog, list_recipes):
+    client.post("/api/v1/favorites/batch", json={"recipe_ids": [catalog["korma"]]}, headers=auth_headers)
+    assert list_recipes()[0] == catalog["korma"]
@@ -0,0 +1,84 @@
+"""Ranked search with prefix matching and typo-tolerant fallback."""
+
+import pytest
+
+import app as backend
+
+
+def search(client, query, **params):
+    response = client.get("/api/v1/recipes/search", query_string={"query": query, **params})
+    assert response.status_code == 200
+    return [recipe["name"] for recipe in response.get_json()["recipes"]]
+
+
+@pytest.fixture
+def catalog(make_recipe):
+    make_recipe("Spaghetti Carbonara", ingredients=["pasta", "egg", "bacon"], cuisine="Italian")
+    make_recipe("Pasta Primavera", ingredients=["pasta", "zucchini"], cuisine="Italian")
+    make_recipe("Chicken Curry", ingredients=["chicken", "curry paste", "coconut milk"], cuisine="Indian")
+    make_recipe("Mango Sticky Rice", ingredients=["mango", "rice"], cuisine="Thai")
+
+
+def test_exact_and_prefix_matches(client, catalog):
+    assert search(client, "carbonara") == ["Spaghetti Carbonara"]
+    assert search(client, "carb") == ["Spaghetti Carbonara"]
+    assert search(client, "pasta")[:2] == ["Pasta Primavera", "Spaghetti Carbonara"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("carbonra", "Spaghetti Carbonara"),  # Deletion
+    ("psata", "Pasta Primavera"),  # Transposition
+    ("crury", "Chicken Curry"),  # Transposition
+    ("chiken curyy", "Chicken Curry"),
+])
+def test_misspellings_fall_back_to_fuzzy_matches(client, catalog, query, expected):
+    assert expected in search(client, query)
+
+
+def test_fuzzy_candidates_include_transpositions(app_context, catalog):
+    backend.recipe_search_index.ensure_built()
+    assert "pasta" in dict(backend.recipe_search_index._fuzzy("psata"))
+    assert "curry" in dict(backend.recipe_search_index._fuzzy("crury"))
+
+
+def test_numbers_and_short_words_are_not_corrected(client, catalog):
+    assert search(client, "ic") == []
+    assert search(client, "12345") == []
+
+
+def test_edit_distance_counts_transposition_once():
+    assert backend._edit_distance("psata", "pasta", 2) == 1
+    assert backend._edit_distance("kitten", "sitting", 5) == 3
+    assert backend._edit_distance("kitten", "sitting", 1) == 2  # Clamped at limit + 1
+
+
+def test_writes_update_search_results(client, catalog, make_recipe):
+    make_recipe("Pad Thai", ingredients=["rice noodles", "peanut"], cuisine="Thai")
+    assert search(client, "peanut") == ["Pad Thai"]
+    assert client.delete("/api/v1/recipes/Pad Thai").status_code == 200
+    assert search(client, "peanut") == []
+
+
+def test_vocabulary_stays_sorted(client, catalog, make_recipe):
+    index = backend.recipe_search_index
+    index.reset()
+    index.ensure_built()  # Sorted once at the end of the build
+    assert index.vocabulary == sorted(index.postings)
+
+    make_recipe("Aioli", ingredients=["garlic", "oil"])  # Inserted in place
+    client.put("/api/v1/recipes/Mango Sticky Rice", json={"ingredients": ["rice"]})
+    assert search(client, "aioli") == ["Aioli"]  # Writes replayed
+    assert index.vocabulary == sorted(index.postings)
+    assert search(client, "zuc") == ["Pasta Primavera"]
+
+
+def test_writes_from_other_process_update_search_results(client, catalog, other_worker):
+    assert search(client, "mango") == ["Mango Sticky Rice"]  # Index built
+
+    other_worker(
+        ("POST", "/api/v1/recipes", {"name": "Mango Lassi", "ingredients": ["mango", "yogurt"]}),
+        ("PUT", "/api/v1/recipes/Mango Sticky Rice", {"name": "Coconut Sticky Rice", "ingredients": ["rice"]}),
+    )
+
+    assert search(client, "mango") == ["Mango Lassi"]
+    assert search(client, "coconut sticky")[0] == "Coconut Sticky Rice"
@@ -0,0 +1,70 @@
+"""Slow-query log: parameter redaction, plans and the admin endpoint."""
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def log_everything(client, monkeypatch):
+    """Treat every statement as slow and serve the admin endpoint."""
+    monkeypatch.setattr(backend.slow_query_log, "threshold", 0)
+    monkeypatch.setitem(backend.app.config, "SLOW_QUERY_ENDPOINT", True)
+    backend.slow_query_log.clear()
+    yield backend.slow_query_log
+    backend.slow_query_log.clear()
+
+
+def user_lookups(client):
+    entries = client.get("/api/v1/admin/slow-queries").get_json()["entries"]
+    return [entry for entry in entries if "FROM users" in entry["statement"]]
+
+
+def test_parameters_are_redacted_by_default(client, log_everything):
+    client.post("/api/v1/auth/login", json={"username": "alice@example.com", "password": "hunter2"})
+    lookups = user_lookups(client)
+    assert lookups
+    assert "alice@example.com" not in repr(lookups)
+    assert all(value == "?" for entry in lookups for value in entry["parameters"])
+
+
+def test_parameters_are_logged_when_enabled(client, log_everything, monkeypatch):
+    monkeypatch.setattr(log_everything, "log_parameters", True)
+    client.post("/api/v1/auth/login", json={"username": "alice@example.com", "password": "hunter2"})
+    assert "alice@example.com" in repr(user_lookups(client))
+
+
+def test_plans_are_not_analyzed(client, log_everything):
+    client.get("/api/v1/recipes/1")
+    entry = next(e for e in log_everything.entries() if e["statement"].lstrip().startswith("SELECT"))
+    assert entry["plan"]
+
+    class Cursor:
+        executed = []
+
+        def execute(self, sql, parameters=None):
+            self.executed.append(sql)
+
+        def fetchall(self):
+            return [("Seq Scan on recipes",)]
+
+        def close(self):
+            pass
+
+    class Connection:
+        class dialect:
+            name = "postgresql"
+
+        class connection:
+            cursor = Cursor
+
+    log_everything.clear()
+    assert log_everything._plan(Connection, "SELECT * FROM recipes", ()) == ["Seq Scan on recipes"]
+    assert "EXPLAIN SELECT * FROM recipes" in Cursor.executed
+    assert not any("ANALYZE" in sql for sql in Cursor.executed)
+
+
+def test_endpoint_is_disabled_by_default(client):
+    assert backend.app.config["SLOW_QUERY_ENDPOINT"] is False
+    assert client.get("/api/v1/admin/slow-queries").status_code == 404
+    assert client.delete("/api/v1/admin/slow-queries").status_code == 404
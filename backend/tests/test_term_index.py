@@ -0,0 +1,70 @@
+"""Inverted term index lookups, checked against the SQL predicates of the same filters."""
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def index(app_context, make_recipe):
+    make_recipe("Roast Chicken", tools=["Oven", "knife"], ingredients=["Chicken Breast", "garlic"], taste=["savory"])
+    make_recipe("Chicken Stir Fry", tools=["wok", "knife"], ingredients=["chicken thigh", "soy sauce"],
+                taste=["savory", "salty"])
+    make_recipe("Fruit Salad", tools=["knife"], ingredients=["apple", "pineapple"], taste=["sweet"])
+    make_recipe("Pad Thai", tools=["wok"], ingredients=["rice noodles", "peanut"], taste=["Sweet", "sour"])
+    make_recipe("Toast", ingredients=["bread"])
+    backend.recipe_index.reset()
+    backend.recipe_index.ensure_built()
+    return backend.recipe_index
+
+
+def sql_ids(strategy):
+    return set(backend.db.session.scalars(backend.select(backend.Recipe.id).where(strategy.sql_clause())))
+
+
+def name_ids(*names):
+    return set(backend.db.session.scalars(
+        backend.select(backend.Recipe.id).where(backend.Recipe.name.in_(names))))
+
+
+@pytest.mark.parametrize("field, value", [
+    ("tools", "wok"),
+    ("tools", "OVEN,wok"),
+    ("tools", "spoon"),
+    ("taste", "sweet"),
+    ("taste", "salty,sour"),
+    ("taste", "umami"),
+])
+def test_lookup_matches_sql(index, field, value):
+    strategy = backend.FilterEngine.STRATEGIES[field](value)
+    assert strategy.matching_ids(index) == sql_ids(strategy)
+
+
+@pytest.mark.parametrize("value", ["chick", "chicken breast", "apple", "ap", "soy,noodle", "e", "saffron"])
+def test_lookup_partial_matches_sql(index, value):
+    strategy = backend.IngredientFilterStrategy(value)
+    assert index.lookup_partial(strategy.ingredients) == sql_ids(strategy)
+
+
+def test_lookup_is_exact_and_case_folded(index):
+    assert index.lookup("tools", ["oven"]) == name_ids("Roast Chicken")
+    assert index.lookup("tools", ["ove"]) == set()
+    assert index.lookup("taste", ["sweet"]) == name_ids("Fruit Salad", "Pad Thai")
+    assert index.lookup_partial(["chick"]) == name_ids("Roast Chicken", "Chicken Stir Fry")
+    assert index.lookup_partial(["pple"]) == name_ids("Fruit Salad")
+
+
+def test_index_follows_writes(client, index, make_recipe):
+    fried_rice = make_recipe("Fried Rice", tools=["wok"], ingredients=["rice", "chickpeas"])
+    assert client.put("/api/v1/recipes/Pad Thai", json={"tools": ["pan"], "ingredients": ["tofu"]}).status_code == 200
+    assert client.delete("/api/v1/recipes/Chicken Stir Fry").status_code == 200
+    backend.sync_catalog()
+
+    assert index.lookup("tools", ["wok"]) == {fried_rice}
+    assert index.lookup_partial(["chick"]) == name_ids("Roast Chicken") | {fried_rice}
+    assert index.lookup_partial(["noodle"]) == set()
+    for value in ("wok", "pan", "knife"):
+        assert index.lookup("tools", [value]) == sql_ids(backend.ToolsFilterStrategy(value))
+    for value in ("chick", "tofu", "rice"):
+        strategy = backend.IngredientFilterStrategy(value)
+        assert index.lookup_partial(strategy.ingredients) == sql_ids(strategy)
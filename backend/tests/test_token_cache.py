@@ -0,0 +1,104 @@
+"""Verified token cache and the per-request identity memo."""
+
+import time
+
+import pytest
+
+import app as backend
+
+
+@pytest.fixture
+def token_cache(monkeypatch):
+    cache = backend.VerifiedTokenCache(100)
+    monkeypatch.setattr(backend, "token_cache", cache)
+    return cache
+
+
+def register(client, username):
+    client.post("/api/v1/auth/register",
+                json={"username": username, "email": f"{username}@example.com", "password": "pw-123456"})
+    response = client.post("/api/v1/auth/login", json={"username": username, "password": "pw-123456"})
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+def test_cache_hit_skips_verification(app_context, token_cache, monkeypatch):
+    token = backend.create_access_token(7)
+    assert backend.decode_token(token)["user_id"] == 7
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached token was decoded again")
+
+    monkeypatch.setattr(backend.jwt, "decode", fail)
+    assert backend.decode_token(token)["user_id"] == 7
+    assert token_cache.stats()["hits"] == 1
+
+
+def test_invalid_tokens_are_not_cached(app_context, token_cache):
+    forged = backend.jwt.encode({"user_id": 7, "exp": time.time() + 60}, "not-the-secret", algorithm="HS256")
+    assert backend.decode_token(forged) is None
+    assert backend.decode_token(forged) is None
+    assert token_cache.stats()["size"] == 0
+
+
+def test_expired_tokens_are_rejected_while_cached(client, token_cache):
+    exp = int(time.time()) + 1
+    token = backend.jwt.encode({"user_id": 1, "exp": exp}, backend.app.config["JWT_SECRET_KEY"], algorithm="HS256")
+    assert backend.decode_token(token)["user_id"] == 1
+    assert token_cache.stats()["size"] == 1
+
+    time.sleep(max(exp - time.time(), 0) + 0.05)
+    assert backend.decode_token(token) is None
+    assert client.get("/api/v1/favorites", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    assert token_cache.stats()["expirations"] == 1
+
+
+def test_cache_is_bounded_lru():
+    cache = backend.VerifiedTokenCache(2)
+    exp = time.time() + 60
+    cache.put("a", {"user_id": 1, "exp": exp})
+    cache.put("b", {"user_id": 2, "exp": exp})
+    assert cache.get("a")["user_id"] == 1  # "b" is now least recently used
+    cache.put("c", {"user_id": 3, "exp": exp})
+
+    assert cache.get("b") is None
+    assert cache.get("a")["user_id"] == 1
+    assert cache.get("c")["user_id"] == 3
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_tokens_without_exp_or_zero_size_are_not_cached():
+    cache = backend.VerifiedTokenCache(2)
+    cache.put("a", {"user_id": 1})
+    assert cache.get("a") is None
+    disabled = backend.VerifiedTokenCache(0)
+    disabled.put("a", {"user_id": 1, "exp": time.time() + 60})
+    assert disabled.get("a") is None
+
+
+def test_identity_memo_follows_authorization_header(client, token_cache):
+    # The test client reuses the fixture's app context, so flask.g outlives each request
+    cook = register(client, "cook")
+    baker = register(client, "baker")
+    recipe_id = client.post("/api/v1/recipes", json={"name": "Bread"}).get_json()["recipe"]["id"]
+    assert client.post("/api/v1/favorites", json={"recipe_id": recipe_id}, headers=cook).status_code in (200, 201)
+
+    assert len(client.get("/api/v1/favorites", headers=cook).get_json()["favorites"]) == 1
+    assert client.get("/api/v1/favorites", headers=baker).get_json()["favorites"] == []
+    assert client.get("/api/v1/favorites").status_code == 401
+    assert len(client.get("/api/v1/favorites", headers=cook).get_json()["favorites"]) == 1
+
+
+def test_identity_is_memoized_within_a_request(app_context, token_cache, monkeypatch):
+    headers = {"Authorization": f"Bearer {backend.create_access_token(7)}"}
+    calls = []
+    decode = backend.decode_token
+    monkeypatch.setattr(backend, "decode_token", lambda token: calls.append(token) or decode(token))
+
+    with backend.app.test_request_context(headers=headers):
+        assert backend.get_jwt_identity() == 7
+        assert backend.get_jwt_identity() == 7
+    assert len(calls) == 1
+    with backend.app.test_request_context(headers={"Authorization": "Bearer garbage"}):
+        assert backend.get_jwt_identity() is None
+    assert len(calls) == 2